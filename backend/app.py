@@ -1,30 +1,51 @@
+import base64
 import json
 import logging
 import os
+import shutil
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from config import Config
 from content_analyzer import PharmacyContentAnalyzer
-from database import get_database
-from database_models import Document, Question, StudySession, UserAttempt
+from database import Database, get_database
+from database_models import (
+    Document, Question, SessionQuestion, StudySession, UserAttempt,
+    add_review_document_column, attempt_session_index, create_question_search, create_question_versions,
+    question_bucket_index, question_listing_index, review_accuracy_index, review_due_index, session_history_index
+)
+from extraction_cache import ExtractionCache, hash_file, save_and_hash
 from flask import Flask, Response, jsonify, request, send_file
 from flask_cors import CORS
+from job_runner import get_job_runner
+from llm_cache import get_llm_cache
+from llm_client import using_fake_backend
 from llm_formatter import ClaudeFormatter
 from pdf_extractor import PDFExtractor
-from sqlalchemy import func
+from question_sampler import get_question_sampler
+from question_search import search_questions
+from rate_limiter import get_rate_limiter
+from review_queue import (
+    REVIEW_SESSION_TYPE, answer_quality, count_due, due_cards, parse_quality, plan_review, record_review, review_today
+)
+from sqlalchemy import and_, bindparam, case, func, insert, select, tuple_, update
+from sqlalchemy.orm import aliased
+from sqlalchemy.schema import CreateIndex
 from text_processor import TextProcessor
-from timezone_utils import now_in_timezone, format_datetime, to_iso_string
+from timezone_utils import clear_timezone_cache, format_datetime, now_in_timezone, set_timezone_database, to_iso_string
 from werkzeug.utils import secure_filename
 
 # Create necessary directories first
-os.makedirs('logs', exist_ok=True)
+os.makedirs(Config.LOG_FOLDER, exist_ok=True)
 
 # Configure logging
 logging.basicConfig(
     level=logging.DEBUG,
     format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
     handlers=[
-        logging.FileHandler('logs/backend.log'),
+        logging.FileHandler(os.path.join(Config.LOG_FOLDER, 'backend.log')),
         logging.StreamHandler()
     ]
 )
@@ -36,10 +57,44 @@ CORS(app)
 os.makedirs(Config.UPLOAD_FOLDER, exist_ok=True)
 os.makedirs(Config.OUTPUT_FOLDER, exist_ok=True)
 
-processing_status = {}
+def migrate_database(database: Database) -> None:
+    """
+    Bring an existing database up to the current schema (no-op once migrated).
+
+    Existing databases predate the session question plan table, the composite
+    indexes, search, question versions and the review queue.
+
+    Args:
+        database: Database to migrate
+    """
+    with database.engine.begin() as conn:
+        SessionQuestion.__table__.create(conn, checkfirst=True)
+        # Superseded by session_questions; briefly created by earlier versions
+        conn.exec_driver_sql('DROP TABLE IF EXISTS session_state')
+        add_review_document_column(conn)
+        for index in (
+            question_listing_index, question_bucket_index, attempt_session_index, session_history_index,
+            review_due_index
+        ):
+            index.create(conn, checkfirst=True)
+        # checkfirst can't see expression indexes (SQLAlchemy skips reflecting them)
+        conn.execute(CreateIndex(review_accuracy_index, if_not_exists=True))
+        create_question_search(conn)
+        create_question_versions(conn)
 
 # Initialize database connection
 db = get_database(Config.DATABASE_PATH)
+set_timezone_database(db)
+migrate_database(db)
+
+# Processed documents keyed by PDF content hash
+extraction_cache = ExtractionCache()
+
+# Document processing runs on background workers, decoupled from the request
+job_runner = get_job_runner()
+
+# Session question sampling without ORDER BY random() over the question bank
+question_sampler = get_question_sampler()
 
 def parse_options(options_json: str) -> dict:
     """
@@ -70,6 +125,93 @@ def parse_options(options_json: str) -> dict:
         logger.error(f"Error parsing options: {e}")
         return {}
 
+# Fields of GET /api/questions/<file_id>: the columns each one reads and how it is serialized
+QUESTION_FIELDS = {
+    'id': ((Question.id,), lambda q: q.id),
+    'topic_id': ((Question.topic_id,), lambda q: q.topic_id),
+    'topic_name': ((Question.topic_name,), lambda q: q.topic_name),
+    'question_type': ((Question.question_type,), lambda q: q.question_type),
+    'difficulty': ((Question.difficulty,), lambda q: q.difficulty),
+    'question_text': ((Question.question_text,), lambda q: q.question_text),
+    'options': ((Question.options_json,), lambda q: parse_options(q.options_json)),
+    'correct_answer': ((Question.correct_answer,), lambda q: q.correct_answer),
+    'explanation': ((Question.explanation,), lambda q: q.explanation),
+    'key_terms': ((Question.key_terms_json,), lambda q: json.loads(q.key_terms_json) if q.key_terms_json else []),
+    'regulatory_context': ((Question.regulatory_context,), lambda q: q.regulatory_context),
+    'pages': ((Question.pages,), lambda q: q.pages),
+    'times_seen': ((Question.times_seen,), lambda q: q.times_seen),
+    'times_correct': ((Question.times_correct,), lambda q: q.times_correct),
+    'accuracy_rate': (
+        (Question.times_seen, Question.times_correct),
+        lambda q: round((q.times_correct / q.times_seen * 100) if q.times_seen > 0 else 0, 1)
+    )
+}
+
+def encode_question_cursor(topic_id: int, question_id: int) -> str:
+    """Opaque pagination cursor pointing after the given question."""
+    return base64.urlsafe_b64encode(f"{topic_id}:{question_id}".encode()).decode()
+
+def decode_question_cursor(cursor: str) -> Tuple[int, int]:
+    """
+    Decode a cursor from encode_question_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        topic_id, question_id = base64.urlsafe_b64decode(cursor.encode()).decode().split(':')
+        return int(topic_id), int(question_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+# Statements of POST /api/sessions/<id>/answer, built once and bound per request
+_graded = aliased(SessionQuestion)
+_upcoming = aliased(SessionQuestion)
+NEXT_PAYLOAD_QUERY = (
+    select(_upcoming.payload_json)
+    .select_from(_graded)
+    .outerjoin(_upcoming, and_(
+        _upcoming.session_id == _graded.session_id,
+        _upcoming.position == _graded.position + 1
+    ))
+    .where(_graded.session_id == bindparam('session_id'), _graded.question_id == bindparam('question_id'))
+)
+_answered_correctly = Question.correct_answer == bindparam('selected_answer')
+GRADE_ANSWER_STATEMENT = (
+    update(Question.__table__)
+    .where(Question.id == bindparam('question_id'))
+    .values(
+        times_seen=Question.times_seen + 1,
+        times_correct=Question.times_correct + case((_answered_correctly, 1), else_=0)
+    )
+    .returning(
+        _answered_correctly.label('is_correct'),
+        Question.document_id,
+        Question.correct_answer,
+        Question.explanation,
+        Question.key_terms_json
+    )
+)
+COUNT_CORRECT_STATEMENT = (
+    update(StudySession.__table__)
+    .where(StudySession.id == bindparam('session_id'))
+    .values(correct_answers=StudySession.correct_answers + bindparam('correct_increment'))
+    .returning(StudySession.id, StudySession.session_type)
+)
+RECORD_ATTEMPT_STATEMENT = insert(UserAttempt.__table__)
+
+def serialize_session_question(question: Question, question_number: int) -> dict:
+    """A question as served during a session (no answer or explanation)."""
+    return {
+        'id': question.id,
+        'question_number': question_number,
+        'topic_name': question.topic_name,
+        'question_type': question.question_type,
+        'difficulty': question.difficulty,
+        'question_text': question.question_text,
+        'options': parse_options(question.options_json)
+    }
+
 def create_session_logger(file_id: str) -> logging.Logger:
     """Create a file-specific logger for tracing individual processing sessions."""
     # Create logger with unique name
@@ -83,7 +225,7 @@ def create_session_logger(file_id: str) -> logging.Logger:
     session_logger.handlers.clear()
 
     # Create file handler for this session
-    log_file = os.path.join('logs', f'{file_id}.log')
+    log_file = os.path.join(Config.LOG_FOLDER, f'{file_id}.log')
     file_handler = logging.FileHandler(log_file)
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(logging.Formatter('%(asctime)s [%(levelname)s] %(message)s'))
@@ -98,11 +240,67 @@ def create_session_logger(file_id: str) -> logging.Logger:
 
     return session_logger
 
+def write_raw_page(page: Dict, pages_dir: str) -> None:
+    """Write an extracted page as markdown, before any cleaning."""
+    page_num = page.get('page', 1)
+    page_file = os.path.join(pages_dir, f"page_{page_num:03d}.md")
+    with open(page_file, 'w', encoding='utf-8') as f:
+        f.write(f"# Page {page_num}\n\n")
+        for header in page.get('headers', []):
+            f.write(f"### {header}\n\n")
+        # Use the content structure from PDFExtractor
+        for content_item in page.get('content', []):
+            if isinstance(content_item, dict):
+                f.write(f"{content_item.get('text', '')}\n\n")
+            else:
+                f.write(f"{content_item}\n\n")
+
+def write_cleaned_page(page: Dict, pages_dir: str, processor: TextProcessor) -> None:
+    """Write a page as markdown after repeated elements were removed, cleaning each line."""
+    page_num = page.get('page', 1)
+    page_file = os.path.join(pages_dir, f"page_{page_num:03d}.md")
+    with open(page_file, 'w', encoding='utf-8') as f:
+        f.write(f"# Page {page_num}\n\n")
+        for header in page.get('headers', []):
+            f.write(f"### {header}\n\n")
+        # Apply text cleaning to each content item
+        for content_item in page.get('content', []):
+            if isinstance(content_item, dict):
+                text = content_item.get('text', '')
+                if text:
+                    cleaned_text = processor.clean_text(text)
+                    f.write(f"{cleaned_text}\n\n")
+
+def write_markdown_header(md_path: str) -> None:
+    """Start the formatted study guide file."""
+    with open(md_path, 'w', encoding='utf-8') as f:
+        f.write("# Pharmacy Law Study Guide\n\n")
+        f.write(f"Generated: {now_in_timezone().strftime('%Y-%m-%d %H:%M:%S')}\n\n---\n\n")
+
+def write_analysis_json(json_path: str, file_id: str, analyses: List[Dict]) -> None:
+    """Write the per-topic analysis file consumed by QuestionGenerator."""
+    with open(json_path, 'w') as f:
+        json.dump({
+            "metadata": {
+                "generated": to_iso_string(),
+                "total_topics": len(analyses),
+                "file_id": file_id
+            },
+            "topics": analyses
+        }, f, indent=2)
+
+def tee_pages(pages: Iterable[Dict], write: Callable[[Dict], None]) -> Iterator[Dict]:
+    """Pass pages through unchanged, writing each one as it goes by."""
+    for page in pages:
+        write(page)
+        yield page
+
 logger.info("="*80)
 logger.info("Pharmacy Exam Prep Application Starting")
 logger.info(f"Upload folder: {Config.UPLOAD_FOLDER}")
 logger.info(f"Output folder: {Config.OUTPUT_FOLDER}")
 logger.info(f"Anthropic API Key configured: {bool(Config.ANTHROPIC_API_KEY)}")
+logger.info(f"LLM backend: {Config.LLM_BACKEND}")
 logger.info("="*80)
 
 @app.route('/')
@@ -116,6 +314,7 @@ def health():
     health_data = {
         "status": "healthy",
         "claude_configured": bool(Config.ANTHROPIC_API_KEY),
+        "llm_backend": Config.LLM_BACKEND,
         "timestamp": to_iso_string()
     }
     logger.info(f"Health check: {health_data}")
@@ -142,9 +341,10 @@ def upload_file():
     filepath = os.path.join(Config.UPLOAD_FOLDER, f"{file_id}_{filename}")
 
     logger.info(f"Saving file to: {filepath}")
-    file.save(filepath)
+    content_hash = save_and_hash(file.stream, filepath)
     file_size = os.path.getsize(filepath)
-    logger.info(f"File saved successfully. Size: {file_size} bytes")
+    cached = extraction_cache.contains(content_hash)
+    logger.info(f"File saved successfully. Size: {file_size} bytes, SHA-256: {content_hash} (cached: {cached})")
 
     try:
         logger.info("Extracting PDF metadata...")
@@ -156,50 +356,110 @@ def upload_file():
         logger.error(f"Failed to read PDF: {str(e)}", exc_info=True)
         return jsonify({"error": f"Invalid PDF: {str(e)}"}), 400
 
+    job_runner.register_upload(file_id, filepath, content_hash)
+
     response_data = {
         "file_id": file_id,
         "filename": filename,
         "size": file_size,
-        "total_pages": total_pages
+        "total_pages": total_pages,
+        "content_hash": content_hash,
+        "cached": cached
     }
     logger.info(f"Upload successful: {response_data}")
     logger.info("="*80)
     return jsonify(response_data)
 
-@app.route('/api/process/<file_id>', methods=['POST'])
-def process_file(file_id):
-    logger.info("="*80)
-    logger.info(f"Processing request for file_id: {file_id}")
+def run_processing(file_id: str, filepath: str, content_hash: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Process an uploaded PDF end to end, yielding progress events.
 
-    files = [f for f in os.listdir(Config.UPLOAD_FOLDER) if f.startswith(file_id)]
-    if not files:
-        logger.error(f"File not found for file_id: {file_id}")
-        return jsonify({"error": "File not found"}), 404
+    Runs on a JobRunner worker thread, not in the request: events are persisted to
+    the job row and tailed by the /api/process and /api/jobs endpoints.
 
-    filepath = os.path.join(Config.UPLOAD_FOLDER, files[0])
-    logger.info(f"Processing file: {filepath}")
+    Args:
+        file_id: Uploaded file identifier
+        filepath: Path of the uploaded PDF
+        content_hash: SHA-256 of the PDF (hashed here if not given)
 
-    def generate():
-        # Create session-specific logger
-        session_logger = create_session_logger(file_id)
-        session_logger.info("="*80)
-        session_logger.info(f"Starting processing session for file_id: {file_id}")
-        session_logger.info(f"File path: {filepath}")
-        session_logger.info("="*80)
+    Yields:
+        Dictionaries with progress, message and stage keys; the last one also has
+        output_file, analysis_file and cached
+    """
+    # Create session-specific logger
+    session_logger = create_session_logger(file_id)
+    session_logger.info("="*80)
+    session_logger.info(f"Starting processing session for file_id: {file_id}")
+    session_logger.info(f"File path: {filepath}")
+    session_logger.info("="*80)
 
-        try:
-            # Create output directory structure
-            output_dir = os.path.join(Config.OUTPUT_FOLDER, file_id)
-            pages_raw_dir = os.path.join(output_dir, 'pages', 'raw')
-            pages_cleaned_dir = os.path.join(output_dir, 'pages', 'cleaned')
-            os.makedirs(pages_raw_dir, exist_ok=True)
-            os.makedirs(pages_cleaned_dir, exist_ok=True)
-
-            session_logger.info("Starting PDF extraction...")
-            yield f"data: {json.dumps({'progress': 10, 'message': 'Extracting PDF...'})}\n\n"
-
-            extractor = PDFExtractor(filepath)
-            total_pages = extractor.total_pages
+    try:
+        # Create output directory structure
+        output_dir = os.path.join(Config.OUTPUT_FOLDER, file_id)
+        pages_raw_dir = os.path.join(output_dir, 'pages', 'raw')
+        pages_cleaned_dir = os.path.join(output_dir, 'pages', 'cleaned')
+        os.makedirs(pages_raw_dir, exist_ok=True)
+        os.makedirs(pages_cleaned_dir, exist_ok=True)
+
+        md_file = f"{file_id}_formatted.md"
+        json_file = f"{file_id}_analysis.json"
+        md_path = os.path.join(output_dir, md_file)
+        json_path = os.path.join(output_dir, json_file)
+
+        # Same bytes as an earlier upload: reuse its pages, topics and analyses
+        content_hash = content_hash or hash_file(filepath)
+        cached = extraction_cache.get(content_hash)
+        if cached:
+            session_logger.info(f"Extraction cache hit for {content_hash} ({len(cached['analyses'])} topics)")
+            yield {'progress': 50, 'message': 'Found previously processed copy of this document...', 'stage': 'cache'}
+
+            shutil.copytree(cached['pages_dir'], os.path.join(output_dir, 'pages'), dirs_exist_ok=True)
+            write_markdown_header(md_path)
+            with open(md_path, 'a', encoding='utf-8') as f:
+                for formatted in cached['formatted']:
+                    f.write(formatted + "\n\n---\n\n")
+            write_analysis_json(json_path, file_id, cached['analyses'])
+
+            session_logger.info(f"Processing complete for file_id: {file_id} (from cache)")
+            session_logger.info("="*80)
+            yield {
+                'progress': 100, 'message': 'Complete!',
+                'output_file': md_file, 'analysis_file': json_file, 'cached': True
+            }
+            return
+
+        session_logger.info("Starting PDF extraction...")
+        yield {'progress': 10, 'message': 'Extracting PDF...', 'stage': 'extraction'}
+
+        extractor = PDFExtractor(filepath)
+        total_pages = extractor.total_pages
+        processor = TextProcessor(logger=session_logger)
+
+        if Config.STREAMING_PIPELINE:
+            # Pages flow extractor -> raw writer -> cleaner -> cleaned writer -> chunker,
+            # so topic identification starts before extraction has finished
+            session_logger.info(f"Streaming {total_pages} pages through extraction and topic identification...")
+            pages = tee_pages(extractor.iter_pages(), lambda page: write_raw_page(page, pages_raw_dir))
+            cleaned_pages = tee_pages(
+                processor.iter_cleaned_pages(pages),
+                lambda page: write_cleaned_page(page, pages_cleaned_dir, processor)
+            )
+
+            topics = []
+            try:
+                for topic in processor.iter_topics_with_llm(cleaned_pages):
+                    topics.append(topic)
+                    last_page = min(topic.get('end_page', 0), total_pages)
+                    progress = 10 + int((last_page / max(total_pages, 1)) * 40)
+                    yield {
+                        'progress': progress,
+                        'message': f'Identified {len(topics)} topics (page {last_page}/{total_pages})...',
+                        'stage': 'topics'
+                    }
+            finally:
+                extractor.close()
+            session_logger.info(f"Identified {len(topics)} topics")
+        else:
             session_logger.info(f"Extracting {total_pages} pages...")
             pages_data = extractor.extract_all()
             extractor.close()
@@ -208,128 +468,194 @@ def process_file(file_id):
             # Save raw pages immediately
             session_logger.info("Saving raw pages...")
             for page in pages_data:
-                page_num = page.get('page', 1)  # Fixed: use 'page' key instead of 'page_num'
-                page_file = os.path.join(pages_raw_dir, f"page_{page_num:03d}.md")
-                with open(page_file, 'w', encoding='utf-8') as f:
-                    f.write(f"# Page {page_num}\n\n")
-                    for header in page.get('headers', []):
-                        f.write(f"### {header}\n\n")
-                    # Use the content structure from PDFExtractor
-                    for content_item in page.get('content', []):
-                        if isinstance(content_item, dict):
-                            f.write(f"{content_item.get('text', '')}\n\n")
-                        else:
-                            f.write(f"{content_item}\n\n")
-
-            yield f"data: {json.dumps({'progress': 30, 'message': 'Processing text...'})}\n\n"
+                write_raw_page(page, pages_raw_dir)
+
+            yield {'progress': 30, 'message': 'Processing text...', 'stage': 'topics'}
             session_logger.info("Processing text...")
 
-            processor = TextProcessor(logger=session_logger)
             topics = processor.process(pages_data)
             session_logger.info(f"Identified {len(topics)} topics")
 
             # Save cleaned pages immediately
             session_logger.info("Saving cleaned pages...")
             for page in pages_data:
-                page_num = page.get('page', 1)  # Fixed: use 'page' key instead of 'page_num'
-                page_file = os.path.join(pages_cleaned_dir, f"page_{page_num:03d}.md")
-                with open(page_file, 'w', encoding='utf-8') as f:
-                    f.write(f"# Page {page_num}\n\n")
-                    for header in page.get('headers', []):
-                        f.write(f"### {header}\n\n")
-                    # Apply text cleaning to each content item
-                    for content_item in page.get('content', []):
-                        if isinstance(content_item, dict):
-                            text = content_item.get('text', '')
-                            if text:
-                                cleaned_text = processor.clean_text(text)
-                                f.write(f"{cleaned_text}\n\n")
-
-            yield f"data: {json.dumps({'progress': 50, 'message': f'Analyzing {len(topics)} topics...'})}\n\n"
-
-            # Initialize output files for incremental writing
-            md_file = f"{file_id}_formatted.md"
-            json_file = f"{file_id}_analysis.json"
-            md_path = os.path.join(output_dir, md_file)
-            json_path = os.path.join(output_dir, json_file)
-
-            # Write markdown header
-            with open(md_path, 'w', encoding='utf-8') as f:
-                f.write("# Pharmacy Law Study Guide\n\n")
-                f.write(f"Generated: {now_in_timezone().strftime('%Y-%m-%d %H:%M:%S')}\n\n---\n\n")
-
-            analyzer = PharmacyContentAnalyzer(logger=session_logger)
-            formatter = ClaudeFormatter(logger=session_logger)
-
-            analyses = []
-
+                write_cleaned_page(page, pages_cleaned_dir, processor)
+
+        yield {'progress': 50, 'message': f'Analyzing {len(topics)} topics...', 'stage': 'analysis'}
+
+        # Write markdown header; topics are appended incrementally below
+        write_markdown_header(md_path)
+
+        analyzer = PharmacyContentAnalyzer(logger=session_logger)
+        formatter = ClaudeFormatter(logger=session_logger)
+
+        def analyze_and_format(idx: int, topic: Dict) -> Tuple[Dict, str]:
+            topic_name = topic.get('topic', 'Unknown')
+            session_logger.debug(f"Analyzing topic {idx+1}: {topic_name}")
+            analysis = analyzer.analyze_topic(topic)
+            session_logger.debug(f"Formatting topic {idx+1}: {topic_name}")
+            formatted = formatter.format_topic(topic, analysis)
+            return analysis, formatted
+
+        # Topics run concurrently (each formatted as soon as its analysis lands), but
+        # the markdown file is only appended to in topic order
+        analyses: List[Optional[Dict]] = [None] * len(topics)
+        formatted_topics: List[Optional[str]] = [None] * len(topics)
+        next_to_write = 0
+        completed = 0
+
+        session_logger.info(f"Processing {len(topics)} topics with up to {Config.TOPIC_CONCURRENCY} in flight")
+        pool = ThreadPoolExecutor(max_workers=max(1, Config.TOPIC_CONCURRENCY))
+        futures: Dict[Future, int] = {}
+        try:
             for idx, topic in enumerate(topics):
-                progress = 50 + int((idx / len(topics)) * 45)
-                topic_name = topic.get('topic', 'Unknown')
-                session_logger.info(f"Processing topic {idx+1}/{len(topics)}: {topic_name}")
-                yield f"data: {json.dumps({'progress': progress, 'message': f'Processing {idx+1}/{len(topics)}: {topic_name[:30]}...'})}\n\n"
+                futures[pool.submit(analyze_and_format, idx, topic)] = idx
+            for future in as_completed(futures):
+                idx = futures[future]
+                analyses[idx], formatted_topics[idx] = future.result()
+                completed += 1
+                topic_name = topics[idx].get('topic', 'Unknown')
+                session_logger.info(f"Topic {idx+1}/{len(topics)} complete: {topic_name}")
 
-                session_logger.debug(f"Analyzing topic: {topic_name}")
-                analysis = analyzer.analyze_topic(topic)
-                session_logger.debug(f"Analysis complete for: {topic_name}")
+                with open(md_path, 'a', encoding='utf-8') as f:
+                    while next_to_write < len(topics) and formatted_topics[next_to_write] is not None:
+                        f.write(formatted_topics[next_to_write] + "\n\n---\n\n")
+                        next_to_write += 1
+
+                progress = 50 + int((completed / len(topics)) * 45)
+                yield {'progress': progress, 'message': f'Processed {completed}/{len(topics)}: {topic_name[:30]}...'}
+        finally:
+            # Don't leave queued LLM calls running if a topic failed
+            # (not via cancel_futures: that needs Python 3.9)
+            for future in futures:
+                future.cancel()
+            pool.shutdown(wait=False)
+
+        session_logger.info(f"{next_to_write} topics written to {md_path}")
+
+        yield {'progress': 95, 'message': 'Finalizing files...', 'stage': 'finalize'}
+        session_logger.info("Writing final analysis JSON...")
+
+        # Write final JSON analysis
+        write_analysis_json(json_path, file_id, analyses)
+
+        # Only cache complete results: a topic that fell back after an API error (or
+        # every topic, without an API key) would otherwise be served for this PDF
+        # forever. Fake-backend output must not be served to real runs either.
+        degraded = processor.fallback_chunks + analyzer.fallback_topics + formatter.fallback_topics
+        if degraded:
+            session_logger.warning(
+                f"Not caching processed document: {len(degraded)} fallback results ({', '.join(sorted(set(degraded)))})"
+            )
+        elif Config.ANTHROPIC_API_KEY and not using_fake_backend():
+            try:
+                extraction_cache.put(
+                    content_hash, os.path.join(output_dir, 'pages'), topics, analyses, formatted_topics,
+                    filename=os.path.basename(filepath)
+                )
+            except Exception as e:
+                session_logger.warning(f"Failed to cache processed document: {e}")
 
-                session_logger.debug(f"Formatting topic: {topic_name}")
-                formatted = formatter.format_topic(topic, analysis)
-                session_logger.debug(f"Formatting complete for: {topic_name}")
+        session_logger.info(f"LLM cache: {get_llm_cache().stats()}")
+        session_logger.info(f"Rate limiter: {get_rate_limiter().stats()}")
+        session_logger.info(f"Processing complete for file_id: {file_id}")
+        session_logger.info("="*80)
+        yield {'progress': 100, 'message': 'Complete!', 'output_file': md_file, 'analysis_file': json_file}
 
-                # Write this topic immediately to markdown file
-                with open(md_path, 'a', encoding='utf-8') as f:
-                    f.write(formatted + "\n\n---\n\n")
-                session_logger.info(f"Topic {idx+1} written to {md_path}")
-
-                analyses.append(analysis)
-
-            yield f"data: {json.dumps({'progress': 95, 'message': 'Finalizing files...'})}\n\n"
-            session_logger.info("Writing final analysis JSON...")
-
-            # Write final JSON analysis
-            with open(json_path, 'w') as f:
-                json.dump({
-                    "metadata": {
-                        "generated": to_iso_string(),
-                        "total_topics": len(analyses),
-                        "file_id": file_id
-                    },
-                    "topics": analyses
-                }, f, indent=2)
-
-            processing_status[file_id] = {
-                "status": "complete",
-                "output_file": md_file,
-                "analysis_file": json_file
-            }
+    except Exception as e:
+        session_logger.error(f"Error during processing: {str(e)}", exc_info=True)
+        raise
+
+def job_event_stream(file_id: str) -> Iterator[str]:
+    """SSE stream of a job's progress; the job keeps running if the client disconnects."""
+    for state in job_runner.tail(file_id):
+        if state['status'] == 'failed':
+            yield f"data: {json.dumps({'error': state['error'] or 'Processing failed'})}\n\n"
+            return
+
+        event = {
+            'progress': state['progress'],
+            'message': state['message'],
+            'status': state['status'],
+            'stage': state['stage']
+        }
+        if state['progress'] == 100:
+            event.update(output_file=state['output_file'], cached=state['cached'])
+        yield f"data: {json.dumps(event)}\n\n"
 
-            session_logger.info(f"Processing complete for file_id: {file_id}")
-            session_logger.info("="*80)
-            yield f"data: {json.dumps({'progress': 100, 'message': 'Complete!', 'output_file': md_file})}\n\n"
+@app.route('/api/process/<file_id>', methods=['POST'])
+def process_file(file_id):
+    """
+    Submit a document for background processing.
 
-        except Exception as e:
-            session_logger.error(f"Error during processing: {str(e)}", exc_info=True)
-            yield f"data: {json.dumps({'error': str(e)})}\n\n"
+    Returns an SSE stream tailing the job's progress (the job carries on if the
+    client disconnects), or with ?stream=false the job state as JSON (202).
+    """
+    logger.info("="*80)
+    logger.info(f"Processing request for file_id: {file_id}")
 
-    return Response(generate(), mimetype='text/event-stream')
+    files = [f for f in os.listdir(Config.UPLOAD_FOLDER) if f.startswith(file_id)]
+    if not files:
+        logger.error(f"File not found for file_id: {file_id}")
+        return jsonify({"error": "File not found"}), 404
+
+    filepath = os.path.join(Config.UPLOAD_FOLDER, files[0])
+    logger.info(f"Processing file: {filepath}")
+
+    content_hash = (job_runner.get(file_id) or {}).get('content_hash')
+    job = job_runner.submit(
+        file_id, filepath, lambda: run_processing(file_id, filepath, content_hash), content_hash=content_hash
+    )
+
+    if request.args.get('stream', 'true').lower() == 'false':
+        return jsonify(job), 202
+    return Response(job_event_stream(file_id), mimetype='text/event-stream')
+
+@app.route('/api/jobs', methods=['GET'])
+def list_jobs():
+    """List recent processing jobs, newest first."""
+    try:
+        limit = request.args.get('limit', 50, type=int)
+        return jsonify({'jobs': job_runner.list_jobs(limit=limit)})
+    except Exception as e:
+        logger.error(f"Error listing jobs: {e}", exc_info=True)
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/jobs/<file_id>', methods=['GET'])
+def get_job(file_id):
+    """Poll a processing job's state, progress and stage timings."""
+    try:
+        job = job_runner.get(file_id)
+        if job is None:
+            return jsonify({"error": "Job not found"}), 404
+        return jsonify(job)
+    except Exception as e:
+        logger.error(f"Error getting job {file_id}: {e}", exc_info=True)
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/jobs/<file_id>/events', methods=['GET'])
+def stream_job_events(file_id):
+    """Re-attach to a processing job's SSE progress stream (e.g. after a page reload)."""
+    if job_runner.get(file_id) is None:
+        return jsonify({"error": "Job not found"}), 404
+    return Response(job_event_stream(file_id), mimetype='text/event-stream')
 
 @app.route('/api/download/<file_id>/<file_type>', methods=['GET'])
 def download_file(file_id, file_type):
     logger.info(f"Download request: file_id={file_id}, type={file_type}")
 
-    if file_id not in processing_status:
-        logger.error(f"File not found in processing status: {file_id}")
+    job = job_runner.get(file_id)
+    if job is None:
+        logger.error(f"No processing job for file: {file_id}")
         return jsonify({"error": "File not found"}), 404
 
-    status = processing_status[file_id]
-    output_file = status.get("output_file" if file_type == "markdown" else "analysis_file")
+    output_file = job.get("output_file" if file_type == "markdown" else "analysis_file")
 
-    if not output_file:
+    if job['status'] != 'complete' or not output_file:
         logger.error(f"Output file not ready for {file_id}")
         return jsonify({"error": "File not ready"}), 400
 
-    filepath = os.path.join(Config.OUTPUT_FOLDER, output_file)
+    filepath = os.path.join(Config.OUTPUT_FOLDER, file_id, output_file)
     logger.info(f"Sending file: {filepath}")
 
     if not os.path.exists(filepath):
@@ -342,75 +668,142 @@ def download_file(file_id, file_type):
 # QUESTION ENDPOINTS
 # ============================================================================
 
+@app.route('/api/questions/search', methods=['GET'])
+def search_question_bank():
+    """
+    Full-text search over question wording, explanations, key terms and citations.
+
+    Accents and case are ignored; the last word also matches as a prefix.
+
+    Query params:
+    - q: Search text (required)
+    - file_id: Only search this document's questions
+    - topic: Only search this topic
+    - limit: Number of results (default Config.SEARCH_DEFAULT_LIMIT, max Config.SEARCH_MAX_LIMIT)
+    """
+    logger.info("GET /api/questions/search")
+
+    try:
+        query = request.args.get('q', '').strip()
+        if not query:
+            return jsonify({"error": "Missing search text (q)"}), 400
+        try:
+            limit = int(request.args.get('limit', Config.SEARCH_DEFAULT_LIMIT))
+        except ValueError:
+            return jsonify({"error": "limit must be an integer"}), 400
+        limit = max(1, min(limit, Config.SEARCH_MAX_LIMIT))
+        file_id = request.args.get('file_id')
+
+        start = time.perf_counter()
+        with db.session() as session:
+            document_id = None
+            if file_id:
+                document = session.query(Document.id).filter_by(file_id=file_id).first()
+                if not document:
+                    return jsonify({"error": "Document not found"}), 404
+                document_id = document.id
+
+            results = search_questions(
+                session, query, document_id=document_id, topic=request.args.get('topic'), limit=limit
+            )
+
+        return jsonify({
+            'query': query,
+            'results': results,
+            'elapsed_ms': round((time.perf_counter() - start) * 1000, 1)
+        })
+
+    except Exception as e:
+        logger.error(f"Error searching questions: {e}", exc_info=True)
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/api/questions/<file_id>', methods=['GET'])
 def get_questions(file_id):
     """
     Retrieve questions for a document with optional filtering.
 
+    Questions are ordered by (topic_id, id). Pass the response's next_cursor as
+    cursor to fetch the following page; unlike offset, its cost doesn't grow
+    with the page depth.
+
     Query params:
     - topic: Filter by topic name
     - difficulty: Filter by difficulty (basic/intermediate/advanced)
     - type: Filter by question type (single_answer/choose_all)
-    - limit: Number of results (default 50)
-    - offset: Pagination offset (default 0)
+    - fields: Comma-separated fields to return (default all; id is always included)
+    - limit: Number of results (default Config.QUESTION_PAGE_DEFAULT_LIMIT, max Config.QUESTION_PAGE_MAX_LIMIT)
+    - cursor: Keyset pagination cursor from a previous page's next_cursor
+    - offset: Pagination offset (default 0; ignored when cursor is given)
     """
     logger.info(f"GET /api/questions/{file_id}")
 
     try:
+        fields = [f.strip() for f in request.args.get('fields', '').split(',') if f.strip()] or list(QUESTION_FIELDS)
+        unknown = [f for f in fields if f not in QUESTION_FIELDS]
+        if unknown:
+            return jsonify({"error": f"Unknown fields: {', '.join(unknown)}"}), 400
+        if 'id' not in fields:
+            fields.insert(0, 'id')
+
+        cursor = request.args.get('cursor')
+        try:
+            after = decode_question_cursor(cursor) if cursor else None
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        # Pagination
+        try:
+            limit = int(request.args.get('limit', Config.QUESTION_PAGE_DEFAULT_LIMIT))
+            offset = 0 if cursor else int(request.args.get('offset', 0))
+        except ValueError:
+            return jsonify({"error": "limit and offset must be integers"}), 400
+        limit = max(1, min(limit, Config.QUESTION_PAGE_MAX_LIMIT))
+        offset = max(0, offset)
+
         with db.session() as session:
             # Get document
             document = session.query(Document).filter_by(file_id=file_id).first()
             if not document:
                 return jsonify({"error": "Document not found"}), 404
 
-            # Build query with filters
-            query = session.query(Question).filter_by(document_id=document.id)
+            # Only the requested columns (plus the cursor key)
+            columns = {Question.id: None, Question.topic_id: None}
+            for field in fields:
+                columns.update(dict.fromkeys(QUESTION_FIELDS[field][0]))
+            query = session.query(*columns).filter(Question.document_id == document.id)
 
             topic = request.args.get('topic')
             if topic:
-                query = query.filter_by(topic_name=topic)
+                query = query.filter(Question.topic_name == topic)
 
             difficulty = request.args.get('difficulty')
             if difficulty:
-                query = query.filter_by(difficulty=difficulty)
+                query = query.filter(Question.difficulty == difficulty)
 
             question_type = request.args.get('type')
             if question_type:
-                query = query.filter_by(question_type=question_type)
-
-            # Pagination
-            limit = int(request.args.get('limit', 50))
-            offset = int(request.args.get('offset', 0))
-
-            total = query.count()
-            questions = query.offset(offset).limit(limit).all()
-
-            # Serialize questions
-            questions_data = []
-            for q in questions:
-                questions_data.append({
-                    'id': q.id,
-                    'topic_id': q.topic_id,
-                    'topic_name': q.topic_name,
-                    'question_type': q.question_type,
-                    'difficulty': q.difficulty,
-                    'question_text': q.question_text,
-                    'options': parse_options(q.options_json),
-                    'correct_answer': q.correct_answer,
-                    'explanation': q.explanation,
-                    'key_terms': json.loads(q.key_terms_json) if q.key_terms_json else [],
-                    'regulatory_context': q.regulatory_context,
-                    'pages': q.pages,
-                    'times_seen': q.times_seen,
-                    'times_correct': q.times_correct,
-                    'accuracy_rate': round((q.times_correct / q.times_seen * 100) if q.times_seen > 0 else 0, 1)
-                })
+                query = query.filter(Question.question_type == question_type)
+
+            if after:
+                query = query.filter(tuple_(Question.topic_id, Question.id) > after)
+
+            # One extra row tells whether there is a next page
+            rows = query.order_by(Question.topic_id, Question.id).offset(offset).limit(limit + 1).all()
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+
+            # Served from the sampler's cached per-document buckets, not COUNT(*)
+            total = question_sampler.count(
+                session, document.id,
+                topics=[topic] if topic else None, difficulty=difficulty, question_type=question_type
+            )
 
             return jsonify({
                 'total': total,
                 'limit': limit,
-                'offset': offset,
-                'questions': questions_data
+                'offset': None if cursor else offset,
+                'next_cursor': encode_question_cursor(rows[-1].topic_id, rows[-1].id) if has_more else None,
+                'questions': [{field: QUESTION_FIELDS[field][1](row) for field in fields} for row in rows]
             })
 
     except Exception as e:
@@ -419,7 +812,13 @@ def get_questions(file_id):
 
 @app.route('/api/questions/<file_id>/stats', methods=['GET'])
 def get_question_stats(file_id):
-    """Get statistics about questions for a document."""
+    """
+    Get statistics about questions for a document.
+
+    Served from the question sampler's cached buckets and tagged with an ETag
+    derived from the document's question version in the database; send it back
+    as If-None-Match to get a 304 while the questions are unchanged.
+    """
     logger.info(f"GET /api/questions/{file_id}/stats")
 
     try:
@@ -429,33 +828,12 @@ def get_question_stats(file_id):
             if not document:
                 return jsonify({"error": "Document not found"}), 404
 
-            # Total questions
-            total = session.query(Question).filter_by(document_id=document.id).count()
-
-            # By topic
-            by_topic = session.query(
-                Question.topic_name,
-                func.count(Question.id).label('count')
-            ).filter_by(document_id=document.id).group_by(Question.topic_name).all()
-
-            # By difficulty
-            by_difficulty = session.query(
-                Question.difficulty,
-                func.count(Question.id).label('count')
-            ).filter_by(document_id=document.id).group_by(Question.difficulty).all()
+            stats, etag = question_sampler.stats(session, document.id)
 
-            # By type
-            by_type = session.query(
-                Question.question_type,
-                func.count(Question.id).label('count')
-            ).filter_by(document_id=document.id).group_by(Question.question_type).all()
-
-            return jsonify({
-                'total': total,
-                'by_topic': [{'topic': t[0], 'count': t[1]} for t in by_topic],
-                'by_difficulty': [{'difficulty': d[0], 'count': d[1]} for d in by_difficulty],
-                'by_type': [{'type': t[0], 'count': t[1]} for t in by_type]
-            })
+        response = jsonify(stats)
+        response.set_etag(etag)
+        response.cache_control.no_cache = True  # Always revalidate; 304s are cheap
+        return response.make_conditional(request)
 
     except Exception as e:
         logger.error(f"Error getting question stats: {e}", exc_info=True)
@@ -506,13 +884,17 @@ def start_session():
     Request body:
     {
         "file_id": "20251016_113156",
-        "session_type": "study|practice|mock",
+        "session_type": "study|practice|mock|review",
         "num_questions": 10,
         "topics": ["Topic 1", "Topic 2"] (optional, null = all topics),
         "difficulty": "basic|intermediate|advanced" (optional, null = all difficulties),
         "include_review": false (optional, prioritize questions with low accuracy)
     }
 
+    A "review" session is planned by the spaced-repetition queue instead: due
+    cards first, then questions never reviewed (topics, difficulty and
+    include_review don't apply), and its answers update each card's SM-2 state.
+
     Response:
     {
         "session_id": 123,
@@ -538,26 +920,17 @@ def start_session():
             if not document:
                 return jsonify({"error": "Document not found"}), 404
 
-            # Build question query
-            query = session.query(Question).filter_by(document_id=document.id)
-
-            if topics:
-                query = query.filter(Question.topic_name.in_(topics))
-
-            if difficulty:
-                query = query.filter_by(difficulty=difficulty)
-
-            # If include_review, prioritize questions with low accuracy
-            if include_review:
-                query = query.order_by(
-                    (Question.times_correct * 1.0 / Question.times_seen).asc(),
-                    func.random()
-                )
+            if session_type == REVIEW_SESSION_TYPE:
+                # Due cards (most overdue first), topped up with never-reviewed questions
+                question_ids = plan_review(session, document.id, num_questions, review_today())
+                by_id = {q.id: q for q in session.query(Question).filter(Question.id.in_(question_ids))}
+                questions = [by_id[question_id] for question_id in question_ids]
             else:
-                query = query.order_by(func.random())
-
-            # Get questions
-            questions = query.limit(num_questions).all()
+                # Random sample; with include_review, missed questions come first (lowest accuracy first)
+                questions = question_sampler.sample(
+                    session, document.id, num_questions,
+                    topics=topics, difficulty=difficulty, include_review=include_review
+                )
 
             if not questions:
                 return jsonify({"error": "No questions found matching criteria"}), 404
@@ -577,32 +950,27 @@ def start_session():
 
             session_id = new_session.id
 
-            # Store question IDs in session (we'll track them in memory for now)
-            # In production, you might want to store this in a separate table
-            processing_status[f'session_{session_id}'] = {
-                'question_ids': [q.id for q in questions],
-                'current_index': 0,
-                'answers': {}
-            }
+            # Persist the question plan in one bulk insert, each question already
+            # serialized the way submit_answer will serve it
+            payloads = [serialize_session_question(q, position + 1) for position, q in enumerate(questions)]
+            session.execute(insert(SessionQuestion), [
+                {
+                    'session_id': session_id,
+                    'position': position,
+                    'question_id': q.id,
+                    'payload_json': json.dumps(payload, ensure_ascii=False)
+                }
+                for position, (q, payload) in enumerate(zip(questions, payloads))
+            ])
 
             session.commit()
 
-            # Return first question
-            first_q = questions[0]
             return jsonify({
                 'session_id': session_id,
                 'total_questions': len(questions),
                 'session_type': session_type,
                 'pass_threshold': pass_threshold,
-                'first_question': {
-                    'id': first_q.id,
-                    'question_number': 1,
-                    'topic_name': first_q.topic_name,
-                    'question_type': first_q.question_type,
-                    'difficulty': first_q.difficulty,
-                    'question_text': first_q.question_text,
-                    'options': parse_options(first_q.options_json)
-                }
+                'first_question': payloads[0]
             })
 
     except Exception as e:
@@ -618,7 +986,8 @@ def submit_answer(session_id):
     {
         "question_id": 123,
         "selected_answer": "A" or "A,B,C",
-        "time_spent_seconds": 45
+        "time_spent_seconds": 45,
+        "quality": 0-5 (optional, review sessions only: SM-2 recall quality; default from correctness)
     }
 
     Response:
@@ -627,7 +996,8 @@ def submit_answer(session_id):
         "correct_answer": "B",
         "explanation": "...",
         "key_terms": [...],
-        "next_question": {...} or null if session complete
+        "next_question": {...} or null if session complete,
+        "next_review_date": "2025-10-23", "interval_days": 6 (review sessions only)
     }
     """
     logger.info(f"POST /api/sessions/{session_id}/answer")
@@ -637,77 +1007,68 @@ def submit_answer(session_id):
         question_id = data.get('question_id')
         selected_answer = data.get('selected_answer')
         time_spent = data.get('time_spent_seconds', 0)
+        try:
+            quality = parse_quality(data.get('quality'))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
 
         with db.session() as db_session:
-            # Get question
-            question = db_session.query(Question).filter_by(id=question_id).first()
-            if not question:
+            # Next planned question's payload (read before the writes, so the
+            # write lock is only held for the three statements below)
+            plan_row = db_session.execute(
+                NEXT_PAYLOAD_QUERY, {'session_id': session_id, 'question_id': question_id}
+            ).first()
+            next_payload = plan_row[0] if plan_row else None
+
+            # Grade and count in the database: increments are atomic under concurrent
+            # submissions, and RETURNING hands back what the response needs
+            graded_question = db_session.execute(GRADE_ANSWER_STATEMENT, {
+                'question_id': question_id, 'selected_answer': selected_answer
+            }).first()
+            if not graded_question:
                 return jsonify({"error": "Question not found"}), 404
+            is_correct = bool(graded_question.is_correct)
 
-            # Check answer
-            is_correct = (selected_answer == question.correct_answer)
+            updated_session = db_session.execute(COUNT_CORRECT_STATEMENT, {
+                'session_id': session_id, 'correct_increment': 1 if is_correct else 0
+            }).first()
+            if not updated_session:
+                db_session.rollback()
+                return jsonify({"error": "Session not found"}), 404
 
-            # Record attempt
-            attempt = UserAttempt(
-                question_id=question_id,
-                session_id=session_id,
-                selected_answer=selected_answer,
-                is_correct=is_correct,
-                attempt_date=now_in_timezone(),
-                time_spent_seconds=time_spent
-            )
-            db_session.add(attempt)
-
-            # Update question statistics
-            question.times_seen += 1
-            if is_correct:
-                question.times_correct += 1
-
-            # Update session
-            study_session = db_session.query(StudySession).filter_by(id=session_id).first()
-            if is_correct:
-                study_session.correct_answers += 1
-
-            db_session.commit()
-
-            # Get next question
-            session_data = processing_status.get(f'session_{session_id}')
-            if session_data:
-                session_data['current_index'] += 1
-                session_data['answers'][question_id] = {
-                    'selected': selected_answer,
-                    'correct': is_correct
-                }
+            card = None
+            if updated_session.session_type == REVIEW_SESSION_TYPE:
+                card = record_review(
+                    db_session, question_id, graded_question.document_id,
+                    answer_quality(is_correct) if quality is None else quality, review_today()
+                )
 
-                question_ids = session_data['question_ids']
-                current_index = session_data['current_index']
-
-                next_question = None
-                if current_index < len(question_ids):
-                    next_q = db_session.query(Question).filter_by(
-                        id=question_ids[current_index]
-                    ).first()
-                    if next_q:
-                        next_question = {
-                            'id': next_q.id,
-                            'question_number': current_index + 1,
-                            'topic_name': next_q.topic_name,
-                            'question_type': next_q.question_type,
-                            'difficulty': next_q.difficulty,
-                            'question_text': next_q.question_text,
-                            'options': parse_options(next_q.options_json)
-                        }
-            else:
-                next_question = None
+            if plan_row is None:
+                # Not part of this session's plan (e.g. a session started before plans were stored)
+                logger.warning(f"Question {question_id} is not in the plan for session {session_id}")
 
-            return jsonify({
+            # Record attempt
+            db_session.execute(RECORD_ATTEMPT_STATEMENT, {
+                'question_id': question_id,
+                'session_id': session_id,
+                'selected_answer': selected_answer,
                 'is_correct': is_correct,
-                'correct_answer': question.correct_answer,
-                'explanation': question.explanation,
-                'key_terms': json.loads(question.key_terms_json) if question.key_terms_json else [],
-                'next_question': next_question
+                'attempt_date': to_iso_string(),
+                'time_spent_seconds': time_spent
             })
 
+            response = {
+                'is_correct': is_correct,
+                'correct_answer': graded_question.correct_answer,
+                'explanation': graded_question.explanation,
+                'key_terms': json.loads(graded_question.key_terms_json) if graded_question.key_terms_json else [],
+                'next_question': json.loads(next_payload) if next_payload else None
+            }
+            if card is not None:
+                response['next_review_date'] = card.next_review_date.isoformat()
+                response['interval_days'] = card.interval_days
+            return jsonify(response)
+
     except Exception as e:
         logger.error(f"Error submitting answer: {e}", exc_info=True)
         return jsonify({"error": str(e)}), 500
@@ -733,35 +1094,55 @@ def get_session_results(session_id):
                 )
                 session.commit()
 
-            # Get all attempts for this session
-            attempts = session.query(UserAttempt).filter_by(session_id=session_id).all()
-
-            # Get questions with attempts
-            attempts_data = []
-            topic_breakdown = {}
-
-            for attempt in attempts:
-                question = session.query(Question).filter_by(id=attempt.question_id).first()
-                if question:
-                    attempts_data.append({
-                        'question_id': question.id,
-                        'topic_name': question.topic_name,
-                        'difficulty': question.difficulty,
-                        'question_text': question.question_text,
-                        'options': parse_options(question.options_json),
-                        'selected_answer': attempt.selected_answer,
-                        'correct_answer': question.correct_answer,
-                        'is_correct': attempt.is_correct,
-                        'explanation': question.explanation,
-                        'time_spent_seconds': attempt.time_spent_seconds
-                    })
-
-                    # Topic breakdown
-                    if question.topic_name not in topic_breakdown:
-                        topic_breakdown[question.topic_name] = {'correct': 0, 'total': 0}
-                    topic_breakdown[question.topic_name]['total'] += 1
-                    if attempt.is_correct:
-                        topic_breakdown[question.topic_name]['correct'] += 1
+            # Attempts joined with their questions in one query, streamed in batches
+            attempt_rows = (
+                session.query(
+                    Question.id,
+                    Question.topic_name,
+                    Question.difficulty,
+                    Question.question_text,
+                    Question.options_json,
+                    Question.correct_answer,
+                    Question.explanation,
+                    UserAttempt.selected_answer,
+                    UserAttempt.is_correct,
+                    UserAttempt.time_spent_seconds
+                )
+                .join(Question, Question.id == UserAttempt.question_id)
+                .filter(UserAttempt.session_id == session_id)
+                .order_by(UserAttempt.id)
+                .yield_per(500)
+            )
+
+            attempts_data = [
+                {
+                    'question_id': row.id,
+                    'topic_name': row.topic_name,
+                    'difficulty': row.difficulty,
+                    'question_text': row.question_text,
+                    'options': parse_options(row.options_json),
+                    'selected_answer': row.selected_answer,
+                    'correct_answer': row.correct_answer,
+                    'is_correct': row.is_correct,
+                    'explanation': row.explanation,
+                    'time_spent_seconds': row.time_spent_seconds
+                }
+                for row in attempt_rows
+            ]
+
+            # Topic breakdown aggregated in SQL, in order of each topic's first attempt
+            topic_breakdown = (
+                session.query(
+                    Question.topic_name,
+                    func.count(UserAttempt.id).label('total'),
+                    func.coalesce(func.sum(case((UserAttempt.is_correct, 1), else_=0)), 0).label('correct')
+                )
+                .join(Question, Question.id == UserAttempt.question_id)
+                .filter(UserAttempt.session_id == session_id)
+                .group_by(Question.topic_name)
+                .order_by(func.min(UserAttempt.id))
+                .all()
+            )
 
             # Calculate timing and format dates
             duration_seconds = 0
@@ -794,11 +1175,11 @@ def get_session_results(session_id):
                 'topic_breakdown': [
                     {
                         'topic': topic,
-                        'correct': stats['correct'],
-                        'total': stats['total'],
-                        'percentage': round((stats['correct'] / stats['total'] * 100) if stats['total'] > 0 else 0, 1)
+                        'correct': correct,
+                        'total': total,
+                        'percentage': round((correct / total * 100) if total > 0 else 0, 1)
                     }
-                    for topic, stats in topic_breakdown.items()
+                    for topic, total, correct in topic_breakdown
                 ],
                 'attempts': attempts_data
             })
@@ -857,6 +1238,64 @@ def get_session_history():
         logger.error(f"Error getting session history: {e}", exc_info=True)
         return jsonify({"error": str(e)}), 500
 
+# ============================================================================
+# REVIEW ENDPOINTS
+# ============================================================================
+
+@app.route('/api/review/due', methods=['GET'])
+def get_due_reviews():
+    """
+    Next spaced-repetition cards due for review, most overdue first.
+
+    Read from the (document_id, next_review_date) index with a LIMIT, so the
+    cost doesn't depend on how many cards exist.
+
+    Query params:
+    - file_id: Only this document's cards (default: all documents)
+    - limit: Number of cards (default Config.REVIEW_DUE_DEFAULT_LIMIT, max Config.REVIEW_DUE_MAX_LIMIT)
+
+    Response:
+    {
+        "today": "2025-10-20",
+        "total_due": 134,
+        "cards": [{"question_id": 12, "next_review_date": "2025-10-18", "days_overdue": 2, ...}],
+        "elapsed_ms": 0.8
+    }
+    """
+    logger.info("GET /api/review/due")
+
+    try:
+        try:
+            limit = int(request.args.get('limit', Config.REVIEW_DUE_DEFAULT_LIMIT))
+        except ValueError:
+            return jsonify({"error": "limit must be an integer"}), 400
+        limit = max(1, min(limit, Config.REVIEW_DUE_MAX_LIMIT))
+        file_id = request.args.get('file_id')
+        today = review_today()
+
+        start = time.perf_counter()
+        with db.session() as session:
+            document_id = None
+            if file_id:
+                document = session.query(Document.id).filter_by(file_id=file_id).first()
+                if not document:
+                    return jsonify({"error": "Document not found"}), 404
+                document_id = document.id
+
+            cards = due_cards(session, today, document_id=document_id, limit=limit)
+            total_due = count_due(session, today, document_id=document_id)
+
+        return jsonify({
+            'today': today.isoformat(),
+            'total_due': total_due,
+            'cards': cards,
+            'elapsed_ms': round((time.perf_counter() - start) * 1000, 1)
+        })
+
+    except Exception as e:
+        logger.error(f"Error getting due reviews: {e}", exc_info=True)
+        return jsonify({"error": str(e)}), 500
+
 # ============================================================================
 # SETTINGS ENDPOINTS
 # ============================================================================
@@ -889,7 +1328,6 @@ def save_timezone_setting():
 
     try:
         from database_models import AppSettings
-        from timezone_utils import clear_timezone_cache
 
         data = request.get_json()
         timezone = data.get('timezone')
@@ -981,6 +1419,8 @@ def get_database_info():
             'exists': db_exists,
             'size_bytes': db_size,
             'size_mb': round(db_size / (1024 * 1024), 2),
+            'profile': db.profile,
+            'pragmas': db.pragmas(),
             'tables': tables_info,
             'record_counts': counts
         })
@@ -989,6 +1429,49 @@ def get_database_info():
         logger.error(f"Error getting database info: {e}", exc_info=True)
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/maintenance/llm-cache', methods=['GET'])
+def get_llm_cache_stats():
+    """Get LLM response cache hit/miss counters and size."""
+    logger.info("GET /api/maintenance/llm-cache")
+
+    try:
+        return jsonify(get_llm_cache().stats())
+
+    except Exception as e:
+        logger.error(f"Error getting LLM cache stats: {e}", exc_info=True)
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/maintenance/rate-limiter', methods=['GET'])
+def get_rate_limiter_stats():
+    """Get API rate limiter queue-wait and throttling metrics."""
+    logger.info("GET /api/maintenance/rate-limiter")
+
+    try:
+        return jsonify(get_rate_limiter().stats())
+
+    except Exception as e:
+        logger.error(f"Error getting rate limiter stats: {e}", exc_info=True)
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/maintenance/llm-cache/clear', methods=['POST'])
+def clear_llm_cache():
+    """Delete all cached LLM responses."""
+    logger.info("POST /api/maintenance/llm-cache/clear")
+
+    try:
+        data = request.get_json() or {}
+        if not data.get('confirm', False):
+            return jsonify({"error": "Confirmation required. Send {\"confirm\": true}"}), 400
+
+        get_llm_cache().clear()
+        logger.info("✅ LLM response cache cleared")
+
+        return jsonify({'success': True, 'message': 'LLM response cache cleared'})
+
+    except Exception as e:
+        logger.error(f"Error clearing LLM cache: {e}", exc_info=True)
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/api/maintenance/db-reset', methods=['POST'])
 def reset_database():
     """Reset the database (WARNING: Destroys all data!)."""
@@ -1005,6 +1488,8 @@ def reset_database():
 
         # Reset database
         db.reset_database()
+        question_sampler.invalidate()
+        clear_timezone_cache()
 
         logger.info("✅ Database reset complete")
 
@@ -1111,44 +1596,55 @@ def fix_database_schema():
 
 @app.route('/api/maintenance/clear-user-data', methods=['POST'])
 def clear_user_data():
-    """Clear user attempts and sessions while preserving documents and questions."""
+    """
+    Clear user attempts, sessions and review cards while preserving documents and questions.
+
+    Body:
+    - confirm: Must be true
+    - file_id: Only clear this document's data (optional; default all documents)
+    """
     logger.info("POST /api/maintenance/clear-user-data")
 
     try:
         data = request.get_json() or {}
         confirm = data.get('confirm', False)
+        file_id = data.get('file_id')
 
         if not confirm:
             return jsonify({"error": "Confirmation required. Send {\"confirm\": true}"}), 400
 
-        logger.warning("🗑️ CLEARING USER DATA - Deleting attempts and sessions")
-
-        with db.session() as session:
-            # Get counts before deletion
-            attempts_count = session.query(UserAttempt).count()
-            sessions_count = session.query(StudySession).count()
-
-            # Delete user attempts and sessions
-            session.query(UserAttempt).delete()
-            session.query(StudySession).delete()
+        document_id = None
+        if file_id:
+            with db.session() as session:
+                document = session.query(Document.id).filter_by(file_id=file_id).first()
+                if not document:
+                    return jsonify({"error": "Document not found"}), 404
+                document_id = document.id
 
-            # Reset question statistics
-            questions = session.query(Question).all()
-            for q in questions:
-                q.times_seen = 0
-                q.times_correct = 0
+        scope = f"document {file_id}" if file_id else "all documents"
+        logger.warning(f"🗑️ CLEARING USER DATA ({scope}) - Deleting attempts and sessions")
 
-            session.commit()
+        start = time.perf_counter()
+        counts = db.clear_user_data(document_id)
+        elapsed_ms = round((time.perf_counter() - start) * 1000, 1)
 
-        logger.info(f"✅ Cleared {attempts_count} attempts and {sessions_count} sessions")
+        logger.info(
+            f"✅ Cleared {counts['attempts']} attempts and {counts['sessions']} sessions, "
+            f"reset {counts['questions_reset']} questions ({scope}) in {elapsed_ms} ms"
+        )
 
         return jsonify({
             'success': True,
             'message': 'User data cleared successfully',
+            'scope': file_id or 'all',
             'deleted': {
-                'attempts': attempts_count,
-                'sessions': sessions_count
+                'attempts': counts['attempts'],
+                'session_questions': counts['session_questions'],
+                'sessions': counts['sessions'],
+                'review_cards': counts['review_cards']
             },
+            'questions_reset': counts['questions_reset'],
+            'elapsed_ms': elapsed_ms,
             'preserved': 'Documents and questions remain intact'
         })
 
@@ -0,0 +1,76 @@
+"""
+Shared setup for tests that call the Flask app against a throwaway database.
+
+Importing app opens and migrates Config.DATABASE_PATH, so app_database()
+imports it with that path pointing at a temporary file: tests that use it
+never touch pharma_exam.db.
+
+Usage:
+    from app_testing import app_database
+
+    with app_database('listing.db') as (app_module, db):
+        seed(db)
+        client = app_module.app.test_client()
+"""
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+from contextlib import contextmanager
+from types import ModuleType
+from typing import Generator, Tuple
+
+from config import Config
+from database import Database, init_database
+from database_models import Base
+from timezone_utils import set_timezone_database
+
+
+def _import_app() -> ModuleType:
+    """Import app, opening an empty temporary database instead of Config.DATABASE_PATH."""
+    if 'app' not in sys.modules:
+        import_dir = tempfile.mkdtemp(prefix='pharma_exam_test_')
+        atexit.register(shutil.rmtree, import_dir, ignore_errors=True)
+        database_path = Config.DATABASE_PATH
+        Config.DATABASE_PATH = os.path.join(import_dir, 'pharma_exam.db')
+        try:
+            init_database(Config.DATABASE_PATH)
+            import app  # noqa: F401
+        finally:
+            Config.DATABASE_PATH = database_path
+    return sys.modules['app']
+
+
+@contextmanager
+def app_database(filename: str) -> Generator[Tuple[ModuleType, Database], None, None]:
+    """
+    Serve the app from a new database in a temporary directory.
+
+    Creates and migrates the schema, points app.db and the timezone setting at
+    it and clears the question sampler cache; all restored on exit, when the
+    database is closed and deleted.
+
+    Args:
+        filename: Database file name (shows up in the test's log output)
+
+    Yields:
+        (app module, Database)
+    """
+    app_module = _import_app()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = Database(os.path.join(tmp_dir, filename))
+        Base.metadata.create_all(bind=db.engine)
+        app_module.migrate_database(db)
+
+        original_db = app_module.db
+        app_module.db = db
+        set_timezone_database(db)
+        app_module.question_sampler.invalidate()
+        try:
+            yield app_module, db
+        finally:
+            app_module.db = original_db
+            set_timezone_database(original_db)
+            app_module.question_sampler.invalidate()
+            db.close()
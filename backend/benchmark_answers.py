@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Benchmark POST /api/sessions/<id>/answer throughput under concurrent clients.
+
+Seeds a throwaway database with one document and one open session per thread,
+then has each thread answer its session's questions through the Flask test
+client as fast as it can. Reports answers per second, latency percentiles,
+and whether any counter increments were lost. The app's own database, uploads,
+caches and logs are pointed at the same temporary directory, so nothing in the
+repository is written.
+
+Usage:
+    python benchmark_answers.py                        # 1, 4 and 8 threads, 300 answers each
+    python benchmark_answers.py --threads 16 --answers 1000 --profile default
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+from config import Config
+from database import PERFORMANCE_PROFILES, Database, init_database
+from database_models import Base, Document, Question, SessionQuestion, StudySession
+from sqlalchemy import func, insert
+
+
+def configure(tmp_dir: str) -> None:
+    """Point every data path at tmp_dir (before app is imported, which opens and migrates the database)."""
+    Config.UPLOAD_FOLDER = os.path.join(tmp_dir, 'uploads')
+    Config.OUTPUT_FOLDER = os.path.join(tmp_dir, 'outputs')
+    Config.EXTRACTION_CACHE_FOLDER = os.path.join(tmp_dir, 'cache')
+    Config.LLM_CACHE_PATH = os.path.join(tmp_dir, 'llm_cache.db')
+    Config.LOG_FOLDER = os.path.join(tmp_dir, 'logs')
+    Config.DATABASE_PATH = os.path.join(tmp_dir, 'pharma_exam.db')
+    init_database(Config.DATABASE_PATH)
+
+
+def seed(db: Database, num_questions: int, num_sessions: int) -> tuple:
+    """One document with num_questions questions; returns (question IDs, IDs of num_sessions sessions planning all of them)."""
+    with db.session() as session:
+        doc = Document(file_id='answers', filename='answers.pdf', total_topics=10,
+                       total_pages=100, analysis_path='unused')
+        session.add(doc)
+        session.flush()
+        document_id = doc.id
+
+    db.insert_questions(
+        {
+            'document_id': document_id,
+            'topic_id': i % 10,
+            'topic_name': f'Tema {i % 10}',
+            'question_type': 'single_answer',
+            'difficulty': 'intermediate',
+            'question_text': f'Pregunta {i}',
+            'options_json': '["A. Uno", "B. Dos", "C. Tres", "D. Cuatro"]',
+            'correct_answer': 'A',
+            'explanation': 'Ley 247 ' * 20,
+            'key_terms_json': '["receta"]'
+        }
+        for i in range(num_questions)
+    )
+
+    session_ids = []
+    with db.session() as session:
+        question_ids = [row[0] for row in session.query(Question.id).order_by(Question.id)]
+        for _ in range(num_sessions):
+            study_session = StudySession(document_id=document_id, session_type='practice',
+                                         start_time='2025-01-01T00:00:00', total_questions=num_questions,
+                                         correct_answers=0)
+            session.add(study_session)
+            session.flush()
+            session.execute(insert(SessionQuestion), [
+                {'session_id': study_session.id, 'position': i, 'question_id': question_id,
+                 'payload_json': f'{{"id": {question_id}}}'}
+                for i, question_id in enumerate(question_ids)
+            ])
+            session_ids.append(study_session.id)
+    return question_ids, session_ids
+
+
+def run(app_module, db: Database, threads: int, answers: int, num_questions: int) -> dict:
+    """Answer concurrently from `threads` clients; returns throughput, latencies and lost updates."""
+    question_ids, session_ids = seed(db, num_questions, threads)
+    latencies = [[] for _ in range(threads)]
+    errors = []
+    barrier = threading.Barrier(threads + 1)
+
+    def answer(idx: int):
+        client = app_module.app.test_client()
+        rng = random.Random(idx)
+        barrier.wait()
+        for i in range(answers):
+            start = time.perf_counter()
+            response = client.post(f'/api/sessions/{session_ids[idx]}/answer', json={
+                'question_id': question_ids[rng.randrange(len(question_ids))],
+                'selected_answer': 'A' if rng.random() < 0.6 else 'B',
+                'time_spent_seconds': 20
+            })
+            latencies[idx].append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors.append(response.get_data(as_text=True))
+
+    workers = [threading.Thread(target=answer, args=(i,)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    with db.session() as session:
+        times_seen = session.query(func.sum(Question.times_seen)).scalar() or 0
+
+    all_latencies = [latency for per_thread in latencies for latency in per_thread]
+    quantiles = statistics.quantiles(all_latencies, n=100)
+    return {
+        'threads': threads,
+        'answers': len(all_latencies),
+        'per_sec': len(all_latencies) / elapsed,
+        'p50_ms': quantiles[49] * 1000,
+        'p95_ms': quantiles[94] * 1000,
+        'errors': len(errors),
+        'lost_updates': len(all_latencies) - len(errors) - times_seen
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the answer submission endpoint')
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 4, 8], help='Concurrent clients (default: 1 4 8)')
+    parser.add_argument('--answers', type=int, default=300, help='Answers per client (default: 300)')
+    parser.add_argument('--questions', type=int, default=200, help='Questions per session (default: 200)')
+    parser.add_argument('--profile', default=None, choices=list(PERFORMANCE_PROFILES),
+                        help='Database profile (default: Config.DATABASE_PROFILE)')
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        configure(tmp_dir)
+        import app as app_module
+
+        for threads in args.threads:
+            db = Database(os.path.join(tmp_dir, f'answers_{threads}.db'), profile=args.profile)
+            Base.metadata.create_all(bind=db.engine)
+            app_module.migrate_database(db)
+            app_module.db = db
+            results.append(run(app_module, db, threads, args.answers, args.questions))
+            db.engine.dispose()
+
+    print("=" * 70)
+    print(f"{'threads':>7} {'answers':>8} {'answers/s':>10} {'p50':>9} {'p95':>9} {'errors':>7} {'lost':>6}")
+    for r in results:
+        print(f"{r['threads']:>7} {r['answers']:>8} {r['per_sec']:>10.0f} {r['p50_ms']:>7.1f}ms "
+              f"{r['p95_ms']:>7.1f}ms {r['errors']:>7} {r['lost_updates']:>6}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Benchmark concurrent read/write throughput under each SQLite performance profile.
+
+For every profile in database.PERFORMANCE_PROFILES, seeds a fresh throwaway
+database and runs reader and writer threads against it for a fixed time:
+
+- Readers do what browsing does: load a random question, then a page of the
+  document's questions.
+- Writers do what answering does: one transaction that records a UserAttempt
+  and bumps the question's and the session's counters.
+
+Reports operations per second, read/write latency percentiles and how many
+operations failed with "database is locked".
+
+Usage:
+    python benchmark_database.py                       # All profiles, 4 readers + 4 writers, 5 s each
+    python benchmark_database.py --profiles default wal --readers 8 --writers 2 --seconds 10
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List
+
+from database import PERFORMANCE_PROFILES, Database
+from database_models import Base, Document, Question, StudySession, UserAttempt
+from sqlalchemy import insert
+from sqlalchemy.exc import OperationalError
+
+TOPICS = [f'Tema {i}' for i in range(20)]
+
+
+def seed(db: Database, num_questions: int, num_sessions: int) -> None:
+    """One document with num_questions questions and num_sessions open sessions."""
+    with db.session() as session:
+        doc = Document(file_id='bench', filename='bench.pdf', total_topics=len(TOPICS),
+                       total_pages=100, analysis_path='unused')
+        session.add(doc)
+        session.flush()
+
+        session.execute(insert(Question), [
+            {
+                'document_id': doc.id,
+                'topic_id': i % len(TOPICS),
+                'topic_name': TOPICS[i % len(TOPICS)],
+                'question_type': 'single_answer',
+                'difficulty': 'intermediate',
+                'question_text': f'Pregunta {i} ' + 'texto ' * 40,
+                'options_json': '["A. Uno", "B. Dos", "C. Tres", "D. Cuatro"]',
+                'correct_answer': 'A',
+                'explanation': 'Ley 247 ' * 20,
+                'times_seen': 0,
+                'times_correct': 0,
+                'created_at': '2025-01-01T00:00:00'
+            }
+            for i in range(num_questions)
+        ])
+        session.execute(insert(StudySession), [
+            {'document_id': doc.id, 'session_type': 'practice', 'start_time': '2025-01-01T00:00:00',
+             'total_questions': 1_000_000, 'correct_answers': 0, 'incorrect_answers': 0}
+            for _ in range(num_sessions)
+        ])
+
+
+def reader(db: Database, num_questions: int, stop: threading.Event, latencies: List[float], errors: List[str]):
+    rng = random.Random()
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            with db.session() as session:
+                session.get(Question, rng.randint(1, num_questions))
+                offset = rng.randint(0, max(0, num_questions - 50))
+                session.query(Question).filter_by(document_id=1).order_by(Question.id).offset(offset).limit(50).all()
+        except OperationalError as e:
+            errors.append(str(e.orig))
+            continue
+        latencies.append(time.perf_counter() - start)
+
+
+def writer(db: Database, num_questions: int, num_sessions: int, stop: threading.Event,
+           latencies: List[float], errors: List[str]):
+    rng = random.Random()
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            with db.session() as session:
+                question = session.get(Question, rng.randint(1, num_questions))
+                study_session = session.get(StudySession, rng.randint(1, num_sessions))
+                is_correct = rng.random() < 0.6
+                session.add(UserAttempt(question_id=question.id, session_id=study_session.id,
+                                        selected_answer='A' if is_correct else 'B', is_correct=is_correct,
+                                        time_spent_seconds=30))
+                question.times_seen += 1
+                if is_correct:
+                    question.times_correct += 1
+                    study_session.correct_answers += 1
+                else:
+                    study_session.incorrect_answers += 1
+        except OperationalError as e:
+            errors.append(str(e.orig))
+            continue
+        latencies.append(time.perf_counter() - start)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """pct-th percentile in milliseconds (0 if no samples)."""
+    if not values:
+        return 0.0
+    if len(values) == 1:
+        return values[0] * 1000
+    return statistics.quantiles(values, n=100)[int(pct) - 1] * 1000
+
+
+def run_profile(profile: str, args, tmp_dir: str) -> Dict:
+    """Seed a fresh database with the profile and run the mixed workload on it."""
+    db = Database(os.path.join(tmp_dir, f'{profile}.db'), profile=profile)
+    Base.metadata.create_all(bind=db.engine)
+    seed(db, args.questions, args.sessions)
+
+    stop = threading.Event()
+    read_latencies: List[float] = []
+    write_latencies: List[float] = []
+    errors: List[str] = []
+    threads = [
+        threading.Thread(target=reader, args=(db, args.questions, stop, read_latencies, errors))
+        for _ in range(args.readers)
+    ] + [
+        threading.Thread(target=writer, args=(db, args.questions, args.sessions, stop, write_latencies, errors))
+        for _ in range(args.writers)
+    ]
+
+    for thread in threads:
+        thread.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    pragmas = db.pragmas()
+    db.engine.dispose()
+    return {
+        'profile': profile,
+        'journal_mode': pragmas['journal_mode'],
+        'synchronous': pragmas['synchronous'],
+        'reads_per_sec': len(read_latencies) / args.seconds,
+        'writes_per_sec': len(write_latencies) / args.seconds,
+        'read_p95_ms': percentile(read_latencies, 95),
+        'write_p50_ms': percentile(write_latencies, 50),
+        'write_p95_ms': percentile(write_latencies, 95),
+        'errors': len(errors)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark SQLite performance profiles under concurrent load')
+    parser.add_argument('--profiles', nargs='+', default=list(PERFORMANCE_PROFILES),
+                        choices=list(PERFORMANCE_PROFILES), help='Profiles to compare (default: all)')
+    parser.add_argument('--readers', type=int, default=4, help='Reader threads (default: 4)')
+    parser.add_argument('--writers', type=int, default=4, help='Writer threads (default: 4)')
+    parser.add_argument('--seconds', type=float, default=5, help='Run time per profile (default: 5)')
+    parser.add_argument('--questions', type=int, default=20_000, help='Seeded questions (default: 20000)')
+    parser.add_argument('--sessions', type=int, default=50, help='Seeded study sessions (default: 50)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        results = [run_profile(profile, args, tmp_dir) for profile in args.profiles]
+
+    print("=" * 86)
+    print(f"{args.readers} readers + {args.writers} writers, {args.seconds:.0f} s per profile, "
+          f"{args.questions} questions")
+    print("=" * 86)
+    print(f"{'profile':<12} {'journal':>7} {'sync':>4} {'reads/s':>9} {'read p95':>9} "
+          f"{'writes/s':>9} {'write p50':>10} {'write p95':>10} {'locked':>7}")
+    for r in results:
+        print(f"{r['profile']:<12} {r['journal_mode']:>7} {r['synchronous']:>4} {r['reads_per_sec']:>9.0f} "
+              f"{r['read_p95_ms']:>8.1f}ms {r['writes_per_sec']:>9.0f} {r['write_p50_ms']:>8.1f}ms "
+              f"{r['write_p95_ms']:>8.1f}ms {r['errors']:>7}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
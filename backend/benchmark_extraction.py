@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Benchmark PDF page extraction throughput (pages/sec).
+
+Compares the legacy two-pass extraction (page.get_text("dict") followed by
+page.get_text()) against the current single-pass PDFExtractor.extract_page.
+
+The sample document in outputs/20251016_113156 is only kept as extracted
+markdown, so by default its raw pages are rendered back into a PDF first.
+
+Usage:
+    python benchmark_extraction.py                     # Sample document, 5 rounds
+    python benchmark_extraction.py --pdf path/to.pdf   # Benchmark a real PDF
+    python benchmark_extraction.py --rounds 10
+"""
+import argparse
+import glob
+import os
+import sys
+import tempfile
+import time
+from typing import Callable, Dict
+
+import fitz
+from config import Config
+from pdf_extractor import PDFExtractor
+
+SAMPLE_FILE_ID = '20251016_113156'
+
+
+def build_sample_pdf(output_path: str) -> str:
+    """Render the sample document's raw page markdown into a PDF (one page per file)."""
+    pages_dir = os.path.join(Config.OUTPUT_FOLDER, SAMPLE_FILE_ID, 'pages', 'raw')
+    page_files = sorted(glob.glob(os.path.join(pages_dir, 'page_*.md')))
+    if not page_files:
+        raise FileNotFoundError(f"No sample pages found in {pages_dir}")
+
+    doc = fitz.open()
+    for page_file in page_files:
+        page = doc.new_page()
+        y = 50
+        with open(page_file, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                # Headers become large text so they exercise the header detection path
+                size = 16 if line.startswith('#') else 10
+                page.insert_text((40, y), line.lstrip('# ')[:90], fontsize=size)
+                y += size + 4
+                if y > 780:
+                    break
+    doc.save(output_path)
+    doc.close()
+    return output_path
+
+
+def extract_page_two_pass(extractor: PDFExtractor, page_num: int) -> Dict:
+    """The original extract_page: one layout for the dict, a second for full_text."""
+    page = extractor.doc[page_num]
+    blocks = page.get_text("dict")["blocks"]
+
+    text_content = []
+    headers = []
+
+    for block in blocks:
+        if block.get("type") == 0:
+            for line in block.get("lines", []):
+                line_text = ""
+                max_size = 0
+
+                for span in line.get("spans", []):
+                    line_text += span.get("text", "")
+                    max_size = max(max_size, span.get("size", 0))
+
+                line_text = line_text.strip()
+                if line_text:
+                    is_header = max_size > 14 or (line_text.isupper() and len(line_text) > 3)
+                    if is_header:
+                        headers.append(line_text)
+                    text_content.append({
+                        "text": line_text,
+                        "size": max_size,
+                        "is_header": is_header
+                    })
+
+    return {
+        "page": page_num + 1,
+        "content": text_content,
+        "headers": headers,
+        "full_text": page.get_text()
+    }
+
+
+def measure(extractor: PDFExtractor, extract: Callable[[PDFExtractor, int], Dict], rounds: int) -> float:
+    """Return pages/sec for the given extraction function."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for page_num in range(extractor.total_pages):
+            extract(extractor, page_num)
+    elapsed = time.perf_counter() - start
+    return (extractor.total_pages * rounds) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark PDF page extraction throughput')
+    parser.add_argument('--pdf', help='PDF to benchmark (default: rebuilt sample document)')
+    parser.add_argument('--rounds', type=int, default=5, help='Passes over the document (default: 5)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pdf_path = args.pdf or build_sample_pdf(os.path.join(tmp_dir, f'{SAMPLE_FILE_ID}.pdf'))
+        extractor = PDFExtractor(pdf_path)
+
+        try:
+            # Both paths must produce identical page dicts before timing means anything
+            for page_num in range(extractor.total_pages):
+                if extract_page_two_pass(extractor, page_num) != extractor.extract_page(page_num):
+                    print(f"❌ Output mismatch on page {page_num + 1}")
+                    return 1
+
+            # Warm-up pass so font/resource loading isn't billed to the first run
+            measure(extractor, PDFExtractor.extract_page, 1)
+
+            before = measure(extractor, extract_page_two_pass, args.rounds)
+            after = measure(extractor, PDFExtractor.extract_page, args.rounds)
+        finally:
+            extractor.close()
+
+    print("=" * 60)
+    print(f"Document: {args.pdf or SAMPLE_FILE_ID} ({extractor.total_pages} pages, {args.rounds} rounds)")
+    print("=" * 60)
+    print(f"Before (two-pass):     {before:8.1f} pages/sec")
+    print(f"After  (single-pass):  {after:8.1f} pages/sec")
+    print(f"Speedup:               {after / before:8.2f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
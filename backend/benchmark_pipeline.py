@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark end-to-end pipeline throughput against the offline fake LLM backend.
+
+Runs /api/process (extraction, cleaning, topic identification, concurrent
+analysis + formatting) and then question generation for the processed document,
+with every LLM call answered by llm_client.FakeLLMClient. No network access or
+API key is needed, so the numbers measure orchestration only: how well the
+pipeline overlaps simulated API latency, not how fast the model is.
+
+All uploads, outputs, caches, logs and the question database go to a
+temporary directory; the real ones are never touched.
+
+Usage:
+    python benchmark_pipeline.py                              # Sample document, defaults
+    python benchmark_pipeline.py --pdf path/to.pdf
+    python benchmark_pipeline.py --concurrency 1 4 8          # Compare worker counts
+    python benchmark_pipeline.py --latency-ms 1500 --overload-rate 0.05 --malformed-rate 0.02
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from benchmark_extraction import SAMPLE_FILE_ID, build_sample_pdf
+from config import Config
+from database import init_database
+
+
+def configure(tmp_dir: str, args) -> None:
+    """Point every path at tmp_dir and switch to the fake backend (before app is imported)."""
+    Config.LLM_BACKEND = 'fake'
+    Config.FAKE_LLM_LATENCY_MS = args.latency_ms
+    Config.FAKE_LLM_LATENCY_JITTER_MS = args.jitter_ms
+    Config.FAKE_LLM_MS_PER_OUTPUT_TOKEN = args.ms_per_token
+    Config.FAKE_LLM_OVERLOAD_RATE = args.overload_rate
+    Config.FAKE_LLM_MALFORMED_RATE = args.malformed_rate
+    Config.FAKE_LLM_SEED = str(args.seed)
+
+    Config.ANTHROPIC_REQUESTS_PER_MINUTE = args.rpm
+    Config.ANTHROPIC_TOKENS_PER_MINUTE = args.tpm
+    Config.RETRY_DELAY = 0
+    Config.JOB_POLL_INTERVAL = 0.05
+
+    Config.UPLOAD_FOLDER = os.path.join(tmp_dir, 'uploads')
+    Config.OUTPUT_FOLDER = os.path.join(tmp_dir, 'outputs')
+    Config.EXTRACTION_CACHE_FOLDER = os.path.join(tmp_dir, 'cache')
+    Config.LLM_CACHE_PATH = os.path.join(tmp_dir, 'llm_cache.db')
+    Config.DATABASE_PATH = os.path.join(tmp_dir, 'pharma_exam.db')
+    Config.LOG_FOLDER = os.path.join(tmp_dir, 'logs')
+    os.makedirs(Config.UPLOAD_FOLDER, exist_ok=True)
+    os.makedirs(Config.OUTPUT_FOLDER, exist_ok=True)
+    init_database(Config.DATABASE_PATH)
+
+
+def run_process(client, pdf_path: str, file_id: str) -> float:
+    """Run /api/process for one copy of the PDF; return elapsed seconds."""
+    shutil.copy(pdf_path, os.path.join(Config.UPLOAD_FOLDER, f"{file_id}_benchmark.pdf"))
+
+    start = time.perf_counter()
+    response = client.post(f'/api/process/{file_id}')
+    events = [
+        json.loads(line[len('data: '):])
+        for line in response.get_data(as_text=True).splitlines()
+        if line.startswith('data: ')
+    ]
+    elapsed = time.perf_counter() - start
+
+    if not events or events[-1].get('progress') != 100:
+        raise RuntimeError(f"Processing failed: {events[-1] if events else 'no events'}")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark pipeline orchestration with a fake LLM backend')
+    parser.add_argument('--pdf', help='PDF to process (default: rebuilt sample document)')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4],
+                        help='Topic / question worker counts to compare (default: 1 4)')
+    parser.add_argument('--questions', type=int, default=5, help='Questions per topic (default: 5)')
+    parser.add_argument('--latency-ms', type=float, default=200, help='Mean fake call latency (default: 200)')
+    parser.add_argument('--jitter-ms', type=float, default=50, help='Latency standard deviation (default: 50)')
+    parser.add_argument('--ms-per-token', type=float, default=0, help='Extra latency per output token (default: 0)')
+    parser.add_argument('--overload-rate', type=float, default=0.0, help='Fraction of calls failing with 429/529')
+    parser.add_argument('--malformed-rate', type=float, default=0.0, help='Fraction of JSON responses truncated')
+    parser.add_argument('--rpm', type=int, default=100_000, help='Rate limiter requests/minute (default: unthrottled)')
+    parser.add_argument('--tpm', type=int, default=100_000_000, help='Rate limiter tokens/minute (default: unthrottled)')
+    parser.add_argument('--seed', type=int, default=42, help='Seed for fake latencies, failures and question plans')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Built before configure() moves OUTPUT_FOLDER away from the sample pages
+        pdf_path = args.pdf or build_sample_pdf(os.path.join(tmp_dir, f'{SAMPLE_FILE_ID}.pdf'))
+        configure(tmp_dir, args)
+
+        # Imported after configure() so module-level caches pick up the temp paths
+        from app import app
+        from question_generator import QuestionGenerator
+        from rate_limiter import get_rate_limiter
+
+        client = app.test_client()
+        generator = QuestionGenerator()
+        results = []
+
+        for run, concurrency in enumerate(args.concurrency):
+            Config.TOPIC_CONCURRENCY = concurrency
+            file_id = f"bench_{run:02d}"
+
+            calls_before = get_rate_limiter().acquired
+            process_seconds = run_process(client, pdf_path, file_id)
+            process_calls = get_rate_limiter().acquired - calls_before
+
+            with open(os.path.join(Config.OUTPUT_FOLDER, file_id, f"{file_id}_analysis.json"), encoding='utf-8') as f:
+                total_topics = len(json.load(f)['topics'])
+
+            calls_before = get_rate_limiter().acquired
+            start = time.perf_counter()
+            stats = generator.generate_all_questions(
+                file_id, questions_per_topic=args.questions, concurrency=concurrency, seed=args.seed
+            )
+            question_seconds = time.perf_counter() - start
+            question_calls = get_rate_limiter().acquired - calls_before
+
+            results.append((concurrency, total_topics, process_seconds, process_calls,
+                            stats.get('total_questions_generated', 0), question_seconds, question_calls))
+
+        limiter_stats = get_rate_limiter().stats()
+
+    print("=" * 78)
+    print(f"Document: {args.pdf or SAMPLE_FILE_ID}  |  fake latency {args.latency_ms:.0f}±{args.jitter_ms:.0f} ms, "
+          f"overload {args.overload_rate:.0%}, malformed {args.malformed_rate:.0%}")
+    print("=" * 78)
+    print(f"{'workers':>7} {'topics':>6} {'process s':>10} {'topics/s':>9} {'calls':>6} "
+          f"{'questions':>9} {'gen s':>7} {'q/s':>7} {'calls':>6}")
+    for concurrency, topics, p_sec, p_calls, questions, q_sec, q_calls in results:
+        print(f"{concurrency:>7} {topics:>6} {p_sec:>10.2f} {topics / p_sec:>9.2f} {p_calls:>6} "
+              f"{questions:>9} {q_sec:>7.2f} {questions / q_sec if q_sec else 0:>7.2f} {q_calls:>6}")
+    print("-" * 78)
+    print(f"Rate limiter: {limiter_stats['throttled_responses']} throttled responses retried, "
+          f"avg queue wait {limiter_stats['avg_wait_seconds']:.3f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
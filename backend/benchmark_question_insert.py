@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark persisting generated questions.
+
+Compares the previous path (session.add per Question, one commit) with
+Database.insert_questions (executemany INSERT ... RETURNING per batch) on a
+throwaway database, for several question counts.
+
+Usage:
+    python benchmark_question_insert.py                    # 1k, 10k, 50k questions
+    python benchmark_question_insert.py --sizes 100000 --batch-size 10000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+from database import Database
+from database_models import Base, Document, Question
+
+DIFFICULTIES = ('basic', 'intermediate', 'advanced')
+
+
+def make_questions(document_id: int, count: int) -> List[Question]:
+    """Transient questions shaped like QuestionGenerator output."""
+    return [
+        Question(
+            document_id=document_id,
+            topic_id=i % 30 + 1,
+            topic_name=f'Tema {i % 30 + 1}',
+            question_type='single_answer' if i % 10 < 7 else 'choose_all',
+            difficulty=DIFFICULTIES[i % 3],
+            question_text=f'¿Pregunta {i}? ' + 'texto de la pregunta ' * 10,
+            options_json='["A. Uno", "B. Dos", "C. Tres", "D. Cuatro"]',
+            correct_answer='A',
+            explanation='Según la Ley 247, ' + 'explicación ' * 30,
+            key_terms_json='["receta", "farmacéutico"]',
+            regulatory_context='Ley 247 de 2004',
+            pages='10-12',
+            times_seen=0,
+            times_correct=0
+        )
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark bulk question inserts')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 50_000],
+                        help='Questions to insert (default: 1000 10000 50000)')
+    parser.add_argument('--batch-size', type=int, default=None,
+                        help='Rows per transaction (default: Config.QUESTION_INSERT_BATCH_SIZE)')
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = Database(os.path.join(tmp_dir, 'insert.db'))
+        Base.metadata.create_all(bind=db.engine)
+        with db.session() as session:
+            doc = Document(file_id='insert', filename='insert.pdf', total_topics=30,
+                           total_pages=100, analysis_path='unused')
+            session.add(doc)
+            session.flush()
+            document_id = doc.id
+
+        for size in args.sizes:
+            questions = make_questions(document_id, size)
+            start = time.perf_counter()
+            with db.session() as session:
+                for question in questions:
+                    session.add(question)
+            orm_seconds = time.perf_counter() - start
+
+            questions = make_questions(document_id, size)
+            start = time.perf_counter()
+            ids = db.insert_questions(questions, batch_size=args.batch_size)
+            bulk_seconds = time.perf_counter() - start
+            assert len(ids) == size
+
+            results.append((size, orm_seconds, bulk_seconds))
+        db.close()
+
+    print("=" * 60)
+    print(f"{'questions':>9} {'session.add s':>14} {'bulk s':>9} {'bulk rows/s':>12} {'x':>6}")
+    for size, orm_seconds, bulk_seconds in results:
+        print(f"{size:>9} {orm_seconds:>14.2f} {bulk_seconds:>9.2f} {size / bulk_seconds:>12.0f} "
+              f"{orm_seconds / bulk_seconds:>6.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Benchmark the spaced-repetition due queue with a large card count.
+
+Seeds a throwaway database with questions and one review card each, spread over
+several documents and a range of review dates, then times the queries behind
+GET /api/review/due and review sessions against loading every card and picking
+the due ones in Python, and against the same queries without the
+(document_id, next_review_date) index.
+
+Usage:
+    python benchmark_review_queue.py                   # 200k cards
+    python benchmark_review_queue.py --cards 50000 --documents 5
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+from database import Database
+from database_models import Base, Document, SpacedRepetition, review_due_index
+from review_queue import count_due, due_cards, plan_review, record_review, review_today
+from sqlalchemy import insert
+
+
+def time_ms(fn, repeat: int) -> float:
+    """Median wall time of fn() in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def seed(db: Database, cards: int, documents: int, rng: random.Random) -> None:
+    """Questions with one card each; about a quarter of the cards are due."""
+    today = review_today()
+    per_document = cards // documents
+    for d in range(documents):
+        with db.session() as session:
+            doc = Document(file_id=f'review{d}', filename=f'review{d}.pdf', total_topics=30,
+                           total_pages=100, analysis_path='unused')
+            session.add(doc)
+            session.flush()
+            document_id = doc.id
+        question_ids = db.insert_questions(
+            {
+                'document_id': document_id,
+                'topic_id': i % 30,
+                'topic_name': f'Tema {i % 30}',
+                'question_type': 'single_answer',
+                'difficulty': 'intermediate',
+                'question_text': f'Pregunta {i} del documento {d}',
+                'options_json': '["A. Uno", "B. Dos", "C. Tres", "D. Cuatro"]',
+                'correct_answer': 'A',
+                'explanation': 'Ver reglamento.'
+            }
+            for i in range(per_document)
+        )
+        with db.engine.begin() as conn:
+            conn.execute(insert(SpacedRepetition.__table__), [
+                {
+                    'question_id': question_id,
+                    'document_id': document_id,
+                    'ease_factor': 2.5,
+                    'interval_days': 6,
+                    'repetitions': 2,
+                    'next_review_date': today + timedelta(days=rng.randint(-30, 90)),
+                    'total_reviews': 2,
+                    'correct_reviews': 2
+                }
+                for question_id in question_ids
+            ])
+
+
+def load_all_due(session, today, document_id, limit):
+    """The queue computed by loading every card (what the index avoids)."""
+    cards = session.query(SpacedRepetition).all()
+    due = [c for c in cards if c.document_id == document_id and c.next_review_date <= today]
+    due.sort(key=lambda c: (c.next_review_date, c.id))
+    return due[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the spaced-repetition due queue')
+    parser.add_argument('--cards', type=int, default=200_000, help='Review cards (default: 200000)')
+    parser.add_argument('--documents', type=int, default=10, help='Documents the cards are spread over (default: 10)')
+    parser.add_argument('--limit', type=int, default=20, help='Cards per due request (default: 20)')
+    parser.add_argument('--repeat', type=int, default=50, help='Runs per query (default: 50)')
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    today = review_today()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = Database(os.path.join(tmp_dir, 'review.db'))
+        Base.metadata.create_all(bind=db.engine)
+        seed(db, args.cards, args.documents, rng)
+        with db.engine.connect() as conn:
+            conn.exec_driver_sql('ANALYZE')
+
+        def run_queries(label):
+            with db.session() as session:
+                return [
+                    (label, 'due cards (document)',
+                     time_ms(lambda: due_cards(session, today, document_id=1, limit=args.limit), args.repeat)),
+                    (label, 'due cards (all documents)',
+                     time_ms(lambda: due_cards(session, today, limit=args.limit), args.repeat)),
+                    (label, 'count due (document)',
+                     time_ms(lambda: count_due(session, today, document_id=1), args.repeat)),
+                    (label, 'review session plan',
+                     time_ms(lambda: plan_review(session, 1, args.limit, today), args.repeat))
+                ]
+
+        results = run_queries('indexed')
+        with db.session() as session:
+            total_due = count_due(session, today)
+            results.append(('load all', 'due cards (document)',
+                            time_ms(lambda: load_all_due(session, today, 1, args.limit), max(1, args.repeat // 10))))
+
+        # One review: create-or-load the card, SM-2 update, commit
+        question_ids = iter(range(1, args.cards + 1, 7))
+
+        def review_once():
+            with db.session() as session:
+                record_review(session, next(question_ids), 1, 4, today)
+        review_ms = time_ms(review_once, args.repeat)
+
+        with db.engine.begin() as conn:
+            review_due_index.drop(conn)
+        results += [row for row in run_queries('no composite index') if 'document' in row[1]]
+        db.close()
+
+    print("=" * 66)
+    print(f"{args.cards} cards over {args.documents} documents, {total_due} due; "
+          f"one review + commit {review_ms:.2f} ms")
+    print("=" * 66)
+    print(f"{'variant':<20} {'query':<28} {'median ms':>10}")
+    for label, query, ms in results:
+        print(f"{label:<20} {query:<28} {ms:>10.2f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
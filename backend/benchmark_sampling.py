@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Benchmark session question sampling as the question bank grows.
+
+Seeds a throwaway database with one document per bank size and times picking
+a session's questions with the old ORDER BY random() / ORDER BY accuracy
+queries against question_sampler.QuestionSampler, in random and review mode.
+The sampler's first call per document (loading its ID buckets) is reported
+separately; later calls use the cached buckets.
+
+Usage:
+    python benchmark_sampling.py                           # 1k, 10k, 100k questions
+    python benchmark_sampling.py --sizes 1000 200000 --num-questions 50
+    python benchmark_sampling.py --repeat 50 --topic-filter
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from database import Database
+from database_models import Base, Document, Question
+from question_sampler import QuestionSampler
+from sqlalchemy import func, insert
+
+TOPICS = [f'Tema {i}' for i in range(20)]
+DIFFICULTIES = ('basic', 'intermediate', 'advanced')
+
+
+def seed_document(db: Database, size: int, rng: random.Random) -> int:
+    """Create a document with size questions, about a third of them already answered."""
+    with db.session() as session:
+        doc = Document(
+            file_id=f'sampling_{size}',
+            filename='sampling.pdf',
+            total_topics=len(TOPICS),
+            total_pages=100,
+            analysis_path='unused'
+        )
+        session.add(doc)
+        session.flush()
+
+        rows = []
+        for i in range(size):
+            seen = rng.choice((0, 0, rng.randint(1, 10)))
+            rows.append({
+                'document_id': doc.id,
+                'topic_id': i % len(TOPICS),
+                'topic_name': TOPICS[i % len(TOPICS)],
+                'question_type': 'single_answer',
+                'difficulty': DIFFICULTIES[i % len(DIFFICULTIES)],
+                'question_text': f'Pregunta {i}',
+                'options_json': '["A. Uno", "B. Dos", "C. Tres", "D. Cuatro"]',
+                'correct_answer': 'A',
+                'explanation': 'Ley 247',
+                'times_seen': seen,
+                'times_correct': rng.randint(0, seen),
+                'created_at': '2025-01-01T00:00:00'
+            })
+        session.execute(insert(Question), rows)
+        return doc.id
+
+
+def old_sample(session, document_id: int, count: int, topics, include_review: bool):
+    """The original start_session query."""
+    query = session.query(Question).filter_by(document_id=document_id)
+    if topics:
+        query = query.filter(Question.topic_name.in_(topics))
+    if include_review:
+        query = query.order_by((Question.times_correct * 1.0 / Question.times_seen).asc(), func.random())
+    else:
+        query = query.order_by(func.random())
+    return query.limit(count).all()
+
+
+def time_calls(fn, repeat: int) -> float:
+    """Median milliseconds per call."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark session question sampling')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000],
+                        help='Question bank sizes (default: 1000 10000 100000)')
+    parser.add_argument('--num-questions', type=int, default=20, help='Questions per session (default: 20)')
+    parser.add_argument('--repeat', type=int, default=20, help='Calls per measurement (default: 20)')
+    parser.add_argument('--topic-filter', action='store_true', help='Restrict sessions to 3 topics')
+    parser.add_argument('--seed', type=int, default=42, help='Seed for the generated question bank')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    topics = TOPICS[:3] if args.topic_filter else None
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = Database(os.path.join(tmp_dir, 'sampling.db'))
+        Base.metadata.create_all(bind=db.engine)
+        sampler = QuestionSampler(rng=random.Random(args.seed))
+
+        for size in args.sizes:
+            document_id = seed_document(db, size, rng)
+
+            with db.session() as session:
+                start = time.perf_counter()
+                sampler.sample(session, document_id, args.num_questions, topics=topics)
+                cold_ms = (time.perf_counter() - start) * 1000
+
+                row = [size, cold_ms]
+                for include_review in (False, True):
+                    row.append(time_calls(
+                        lambda: old_sample(session, document_id, args.num_questions, topics, include_review),
+                        args.repeat
+                    ))
+                    row.append(time_calls(
+                        lambda: sampler.sample(session, document_id, args.num_questions,
+                                               topics=topics, include_review=include_review),
+                        args.repeat
+                    ))
+                results.append(row)
+
+        db.close()
+
+    print("=" * 78)
+    print(f"{args.num_questions} questions per session, {'3 topics' if topics else 'all topics'}, "
+          f"median of {args.repeat} calls (ms)")
+    print("=" * 78)
+    print(f"{'questions':>9} {'load':>8} {'random old':>11} {'new':>8} {'x':>6} "
+          f"{'review old':>11} {'new':>8} {'x':>6}")
+    for size, cold, random_old, random_new, review_old, review_new in results:
+        print(f"{size:>9} {cold:>8.2f} {random_old:>11.2f} {random_new:>8.2f} {random_old / random_new:>6.1f} "
+              f"{review_old:>11.2f} {review_new:>8.2f} {review_old / review_new:>6.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Benchmark full-text question search on a large question bank.
+
+Seeds a throwaway database with synthetic Spanish questions, then times
+search_questions (FTS5, ranked, with snippets) against the LIKE '%term%'
+filter it replaces, for a mix of rare, common, accented and multi-word
+queries. Also reports how much keeping the index in sync adds to bulk inserts.
+
+Usage:
+    python benchmark_search.py                      # 100k questions
+    python benchmark_search.py --questions 20000 --repeat 50
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from database import Database
+from database_models import QUESTION_SEARCH_PAUSE_TABLE, QUESTION_SEARCH_TABLE, Base, Document, Question
+from question_search import search_questions
+from sqlalchemy import or_
+
+# Domain words (each in a few percent of the questions) over a Zipf-distributed filler vocabulary
+DOMAIN_WORDS = (
+    'receta médica farmacéutico dispensación medicamento controlado registro sanitario '
+    'etiquetado almacenamiento temperatura inventario regente licencia inspección '
+    'prescripción vencimiento paciente dosis farmacia establecimiento auditoría'
+).split()
+FILLER_WORDS = [f'palabra{i}' for i in range(5000)]
+FILLER_WEIGHTS = [1 / (rank + 1) for rank in range(len(FILLER_WORDS))]
+
+QUERIES = ('estupefacientes', 'receta', 'prescripcion medica', 'ley 247', 'farmaceu', 'almacenamiento temperatura')
+
+
+def make_text(rng: random.Random, words: int) -> str:
+    """Filler text with a couple of domain words mixed in."""
+    tokens = rng.choices(FILLER_WORDS, FILLER_WEIGHTS, k=words) + rng.sample(DOMAIN_WORDS, 2)
+    rng.shuffle(tokens)
+    return ' '.join(tokens)
+
+
+def make_rows(document_id: int, count: int, rng: random.Random):
+    """Synthetic questions; a few mention a rare term and a citation."""
+    for i in range(count):
+        rare = ' estupefacientes' if i % 1000 == 0 else ''
+        yield {
+            'document_id': document_id,
+            'topic_id': i % 30,
+            'topic_name': f'Tema {i % 30}',
+            'question_type': 'single_answer',
+            'difficulty': 'intermediate',
+            'question_text': '¿' + make_text(rng, 16) + rare + '?',
+            'options_json': '["A. Uno", "B. Dos", "C. Tres", "D. Cuatro"]',
+            'correct_answer': 'A',
+            'explanation': make_text(rng, 58),
+            'key_terms_json': '["' + '", "'.join(rng.sample(DOMAIN_WORDS, 3)) + '"]',
+            'regulatory_context': f'Ley {247 if i % 50 == 0 else 100 + i % 90} de 2004'
+        }
+
+
+def time_ms(fn, repeat: int) -> float:
+    """Median wall time of fn() in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark full-text question search')
+    parser.add_argument('--questions', type=int, default=100_000, help='Questions in the bank (default: 100000)')
+    parser.add_argument('--repeat', type=int, default=20, help='Runs per query (default: 20)')
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = Database(os.path.join(tmp_dir, 'search.db'))
+        Base.metadata.create_all(bind=db.engine)
+        with db.session() as session:
+            doc = Document(file_id='search', filename='search.pdf', total_topics=30,
+                           total_pages=100, analysis_path='unused')
+            session.add(doc)
+            session.flush()
+            document_id = doc.id
+
+        rows = list(make_rows(document_id, args.questions, rng))
+        start = time.perf_counter()
+        db.insert_questions(rows)
+        indexed_seconds = time.perf_counter() - start
+
+        # Same insert into a second database without search
+        plain = Database(os.path.join(tmp_dir, 'plain.db'))
+        Base.metadata.create_all(bind=plain.engine)
+        with plain.engine.begin() as conn:
+            for trigger in ('insert', 'delete', 'update'):
+                conn.exec_driver_sql(f'DROP TRIGGER {QUESTION_SEARCH_TABLE}_{trigger}')
+            conn.exec_driver_sql(f'DROP TABLE {QUESTION_SEARCH_TABLE}')
+            conn.exec_driver_sql(f'DROP TABLE {QUESTION_SEARCH_PAUSE_TABLE}')
+        with plain.session() as session:
+            session.add(Document(file_id='plain', filename='plain.pdf', total_topics=30,
+                                 total_pages=100, analysis_path='unused'))
+        start = time.perf_counter()
+        plain.insert_questions(rows)
+        plain_seconds = time.perf_counter() - start
+        plain.close()
+
+        results = []
+        with db.session() as session:
+            for query in QUERIES:
+                hits = len(search_questions(session, query))
+                fts_ms = time_ms(lambda: search_questions(session, query), args.repeat)
+
+                # What a search over the raw text costs without the index (no ranking, no accent folding)
+                like = or_(*(
+                    column.like(f'%{query}%')
+                    for column in (Question.question_text, Question.explanation,
+                                   Question.key_terms_json, Question.regulatory_context)
+                ))
+                like_ms = time_ms(lambda: session.query(Question.id).filter(like).limit(20).all(), max(1, args.repeat // 4))
+                results.append((query, hits, fts_ms, like_ms))
+        db.close()
+
+    print("=" * 66)
+    print(f"{args.questions} questions; bulk insert {plain_seconds:.1f} s without search, "
+          f"{indexed_seconds:.1f} s with")
+    print("=" * 66)
+    print(f"{'query':<28} {'hits':>5} {'fts ms':>8} {'LIKE ms':>9}")
+    for query, hits, fts_ms, like_ms in results:
+        print(f"{query:<28} {hits:>5} {fts_ms:>8.1f} {like_ms:>9.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
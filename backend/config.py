@@ -11,6 +11,23 @@ class Config:
     ANTHROPIC_API_KEY = os.getenv('ANTHROPIC_API_KEY', '')
     ANTHROPIC_MODEL = "claude-3-5-sonnet-20241022"
 
+    # Client-side rate limits shared by every API call in the process
+    ANTHROPIC_REQUESTS_PER_MINUTE = int(os.getenv('ANTHROPIC_REQUESTS_PER_MINUTE', 50))
+    ANTHROPIC_TOKENS_PER_MINUTE = int(os.getenv('ANTHROPIC_TOKENS_PER_MINUTE', 80_000))
+    RATE_LIMIT_MAX_RETRIES = 5  # Retries on 429/529 responses
+    RATE_LIMIT_BACKOFF_BASE = 1.0  # Seconds; doubled per attempt, with jitter
+    RATE_LIMIT_BACKOFF_MAX = 60.0
+
+    # LLM client backend: 'anthropic' (real API) or 'fake' (offline stand-in for
+    # benchmarks and load tests - no network, no spend, responses never cached)
+    LLM_BACKEND = os.getenv('LLM_BACKEND', 'anthropic').lower()
+    FAKE_LLM_LATENCY_MS = float(os.getenv('FAKE_LLM_LATENCY_MS', 800))  # Mean per-call latency
+    FAKE_LLM_LATENCY_JITTER_MS = float(os.getenv('FAKE_LLM_LATENCY_JITTER_MS', 400))  # Std deviation
+    FAKE_LLM_MS_PER_OUTPUT_TOKEN = float(os.getenv('FAKE_LLM_MS_PER_OUTPUT_TOKEN', 0))  # Added per generated token
+    FAKE_LLM_OVERLOAD_RATE = float(os.getenv('FAKE_LLM_OVERLOAD_RATE', 0.0))  # Fraction answered with 429/529
+    FAKE_LLM_MALFORMED_RATE = float(os.getenv('FAKE_LLM_MALFORMED_RATE', 0.0))  # Fraction with unparseable JSON
+    FAKE_LLM_SEED = os.getenv('FAKE_LLM_SEED')  # Set for reproducible latencies/failures
+
     # Model context window and limits
     MODEL_MAX_CONTEXT_TOKENS = 200_000  # Claude 3.5 Sonnet context window
     MAX_CHUNK_TOKENS = 80_000  # Target: 40% of context window for topic identification
@@ -18,11 +35,42 @@ class Config:
 
     UPLOAD_FOLDER = os.path.join(BASE_DIR, 'uploads')
     OUTPUT_FOLDER = os.path.join(BASE_DIR, 'outputs')
+    LOG_FOLDER = os.getenv('LOG_FOLDER', 'logs')  # backend.log and per-session logs (relative to the working directory)
     MAX_FILE_SIZE = 50 * 1024 * 1024
     BATCH_SIZE = 20
 
+    # PDF extraction settings
+    EXTRACTION_WORKERS = int(os.getenv('EXTRACTION_WORKERS', min(4, os.cpu_count() or 1)))  # 1 = single process
+    PARALLEL_EXTRACTION_MIN_PAGES = 40  # Smaller documents aren't worth the process pool startup
+    # Stream pages through cleaning and topic identification as they are extracted
+    STREAMING_PIPELINE = os.getenv('STREAMING_PIPELINE', 'false').lower() == 'true'
+
+    # Topics analyzed + formatted concurrently during /api/process
+    TOPIC_CONCURRENCY = int(os.getenv('TOPIC_CONCURRENCY', 4))
+
+    # Background processing jobs
+    JOB_WORKERS = int(os.getenv('JOB_WORKERS', 2))  # Documents processed at once
+    JOB_POLL_INTERVAL = 0.5  # Seconds between progress checks when tailing a job
+    JOB_STALE_SECONDS = 15 * 60  # Running jobs silent this long are assumed dead on startup
+
+    # Processed-document cache, keyed by PDF content hash
+    EXTRACTION_CACHE_FOLDER = os.path.join(BASE_DIR, 'cache', 'extractions')
+    EXTRACTION_CACHE_MAX_BYTES = int(os.getenv('EXTRACTION_CACHE_MAX_BYTES', 500 * 1024 * 1024))
+
+    # LLM response cache (analysis, formatting and topic identification prompts)
+    LLM_CACHE_ENABLED = os.getenv('LLM_CACHE_ENABLED', 'true').lower() == 'true'
+    LLM_CACHE_PATH = os.path.join(BASE_DIR, 'backend', 'llm_cache.db')
+    LLM_CACHE_TTL_SECONDS = 30 * 24 * 3600  # 30 days
+    LLM_CACHE_MAX_ENTRIES = 20_000
+
     # Database configuration
-    DATABASE_PATH = os.path.join(BASE_DIR, 'backend', 'pharma_exam.db')
+    DATABASE_PATH = os.getenv('DATABASE_PATH', os.path.join(BASE_DIR, 'backend', 'pharma_exam.db'))
+    # See database.PERFORMANCE_PROFILES. 'wal' lets readers run alongside writes but
+    # only fsyncs at checkpoints (a power loss can drop the last commits) and
+    # converts the database file to WAL; 'wal_durable' keeps every commit.
+    DATABASE_PROFILE = os.getenv('DATABASE_PROFILE', 'default')
+    DATABASE_POOL_SIZE = int(os.getenv('DATABASE_POOL_SIZE', 10))  # Pooled connections (request threads + job workers)
+    DATABASE_MAX_OVERFLOW = int(os.getenv('DATABASE_MAX_OVERFLOW', 20))  # Extra connections under bursts
 
     # Question generation settings
     QUESTIONS_PER_TOPIC = 25  # Target number of questions per topic
@@ -32,5 +80,23 @@ class Config:
         'intermediate': 0.50, # 50% intermediate questions
         'advanced': 0.20     # 20% advanced questions
     }
+    QUESTION_GENERATION_CONCURRENCY = int(os.getenv('QUESTION_GENERATION_CONCURRENCY', 4))  # Parallel API calls
+    QUESTION_BATCH_SIZE = int(os.getenv('QUESTION_BATCH_SIZE', 5))  # Questions per API call (1 = one call each)
+    QUESTION_INSERT_BATCH_SIZE = 5000  # Rows per transaction when bulk-inserting questions
     MAX_RETRIES = 3  # Max API call retries on failure
     RETRY_DELAY = 2  # Seconds between retries
+
+    # Question listing (/api/questions/<file_id>)
+    QUESTION_PAGE_DEFAULT_LIMIT = 50
+    QUESTION_PAGE_MAX_LIMIT = 500
+
+    # Question search (/api/questions/search)
+    SEARCH_DEFAULT_LIMIT = 20
+    SEARCH_MAX_LIMIT = 100
+    SEARCH_SNIPPET_TOKENS = 16  # Words of context around the matches in each snippet
+
+    # Spaced-repetition review (/api/review/due and review sessions)
+    REVIEW_DUE_DEFAULT_LIMIT = 20
+    REVIEW_DUE_MAX_LIMIT = 200
+    REVIEW_QUALITY_CORRECT = 4  # SM-2 recall quality of a correct answer ("correct with hesitation")
+    REVIEW_QUALITY_INCORRECT = 1  # ... and of a wrong one ("incorrect but familiar")
@@ -1,17 +1,20 @@
 import json
 import logging
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
-from anthropic import Anthropic
 from config import Config
+from llm_cache import cached_completion
+from llm_client import create_client
 
 
 class PharmacyContentAnalyzer:
     def __init__(self, logger: Optional[logging.Logger] = None):
-        self.client = Anthropic(api_key=Config.ANTHROPIC_API_KEY)
+        self.client = create_client()
         self.model = Config.ANTHROPIC_MODEL
         # Use provided logger or create default
         self.logger = logger or logging.getLogger(__name__)
+        # Topics that got _fallback_analysis instead of a model response
+        self.fallback_topics: List[str] = []
 
     def analyze_topic(self, topic_data: Dict) -> Dict:
         content_text = self._prepare_content(topic_data)
@@ -35,25 +38,27 @@ Return this exact structure:
 }}"""
 
         try:
-            response = self.client.messages.create(
-                model=self.model,
+            analysis_text = cached_completion(
+                self.client, self.model, prompt,
                 max_tokens=2000,
                 temperature=0.1,
-                messages=[{"role": "user", "content": prompt}]
+                validate=self._parse_response
             )
 
-            analysis_text = response.content[0].text
-            if "```json" in analysis_text:
-                analysis_text = analysis_text.split("```json")[1].split("```")[0]
-
-            analysis = json.loads(analysis_text.strip())
+            analysis = self._parse_response(analysis_text)
             analysis["pages"] = f"{topic_data['start_page']}-{topic_data['end_page']}"
             return analysis  # type: ignore
 
         except Exception as e:
             self.logger.error(f"Analysis error: {e}")
+            self.fallback_topics.append(topic_data['topic'])
             return self._fallback_analysis(topic_data)
 
+    def _parse_response(self, analysis_text: str) -> Dict:
+        if "```json" in analysis_text:
+            analysis_text = analysis_text.split("```json")[1].split("```")[0]
+        return json.loads(analysis_text.strip())  # type: ignore
+
     def _prepare_content(self, topic_data: Dict) -> str:
         lines = [f"TOPIC: {topic_data['topic']}", ""]
         for page in topic_data['content']:
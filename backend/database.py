@@ -3,31 +3,105 @@ Database connection and session management for pharmacy exam prep application.
 """
 import os
 from contextlib import contextmanager
-from typing import Generator
+from typing import Dict, Generator, Iterable, List, Mapping, Optional, Union
 
-from database_models import Base
-from sqlalchemy import create_engine
+from config import Config
+from database_models import (
+    Base,
+    Question,
+    SessionQuestion,
+    SpacedRepetition,
+    StudySession,
+    UserAttempt,
+    bulk_search_indexing,
+)
+from sqlalchemy import create_engine, delete, event, func, insert, or_, select, update
 from sqlalchemy.orm import Session, sessionmaker
+from timezone_utils import to_iso_string
+
+# Pragmas the performance profiles may set (reported by Database.pragmas)
+TUNED_PRAGMAS = ('journal_mode', 'synchronous', 'cache_size', 'mmap_size', 'busy_timeout', 'temp_store')
+
+# SQLite performance profiles: PRAGMAs applied to every new connection.
+# Pragmas a profile omits keep SQLite's defaults.
+PERFORMANCE_PROFILES: Dict[str, Dict[str, object]] = {
+    # SQLite defaults: rollback journal, so readers wait for writers to commit
+    'default': {
+        'journal_mode': 'DELETE'
+    },
+    # Readers never block on the writer; commits only fsync at WAL checkpoints
+    # (a power loss can drop the last transactions, but never corrupts the file)
+    'wal': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -64_000,  # Negative = KiB, so 64 MB per connection
+        'mmap_size': 256 * 1024 * 1024,
+        'busy_timeout': 5000,  # ms a writer waits for the lock before "database is locked"
+        'temp_store': 'MEMORY'
+    },
+    # As 'wal', but every commit is fsynced
+    'wal_durable': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'cache_size': -64_000,
+        'mmap_size': 256 * 1024 * 1024,
+        'busy_timeout': 5000,
+        'temp_store': 'MEMORY'
+    }
+}
 
 
 class Database:
     """Database connection manager."""
 
-    def __init__(self, db_path: str = 'pharma_exam.db'):
+    def __init__(self, db_path: str = 'pharma_exam.db', profile: Optional[str] = None):
         """
         Initialize database connection.
 
         Args:
             db_path: Path to SQLite database file
+            profile: Key of PERFORMANCE_PROFILES (default: Config.DATABASE_PROFILE)
+
+        Raises:
+            ValueError: If the profile is unknown
         """
         self.db_path = db_path
+        self.profile = profile or Config.DATABASE_PROFILE
+        if self.profile not in PERFORMANCE_PROFILES:
+            raise ValueError(f"Unknown database profile '{self.profile}' (expected one of {', '.join(PERFORMANCE_PROFILES)})")
+
         self.engine = create_engine(
             f'sqlite:///{db_path}',
             echo=False,  # Set to True for SQL query debugging
-            connect_args={'check_same_thread': False}  # Allow multi-threaded access
+            connect_args={'check_same_thread': False},  # Allow multi-threaded access
+            pool_size=Config.DATABASE_POOL_SIZE,
+            max_overflow=Config.DATABASE_MAX_OVERFLOW
         )
+        event.listen(self.engine, 'connect', self._apply_pragmas)
         self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
 
+    def _apply_pragmas(self, dbapi_connection, connection_record) -> None:
+        """Apply the performance profile to a new SQLite connection."""
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma, value in PERFORMANCE_PROFILES[self.profile].items():
+                cursor.execute(f"PRAGMA {pragma}={value}")
+        finally:
+            cursor.close()
+
+    def pragmas(self) -> Dict[str, object]:
+        """
+        Current values of the profile's pragmas, as seen by a pooled connection.
+
+        Returns:
+            Dictionary of pragma name -> value
+        """
+        with self.engine.connect() as conn:
+            return {
+                pragma: conn.exec_driver_sql(f"PRAGMA {pragma}").scalar()
+                for pragma in TUNED_PRAGMAS
+            }
+
     def create_tables(self) -> None:
         """Create all tables in the database."""
         Base.metadata.create_all(bind=self.engine)
@@ -44,6 +118,47 @@ class Database:
         self.create_tables()
         print(f"🔄 Database reset complete: {self.db_path}")
 
+    def clear_user_data(self, document_id: Optional[int] = None) -> Dict[str, int]:
+        """
+        Delete attempts, study sessions and review cards and zero the question
+        statistics, keeping documents and questions.
+
+        Runs as five set-based statements in one transaction; only questions
+        with non-zero counters are rewritten.
+
+        Args:
+            document_id: Only clear this document's data (default: all documents)
+
+        Returns:
+            Rows affected per table: attempts, session_questions, sessions, review_cards, questions_reset
+        """
+        attempts = delete(UserAttempt)
+        session_questions = delete(SessionQuestion)
+        sessions = delete(StudySession)
+        review_cards = delete(SpacedRepetition)
+        questions = update(Question).where(or_(Question.times_seen != 0, Question.times_correct != 0))
+
+        if document_id is not None:
+            document_questions = select(Question.id).where(Question.document_id == document_id)
+            document_sessions = select(StudySession.id).where(StudySession.document_id == document_id)
+            attempts = attempts.where(or_(
+                UserAttempt.question_id.in_(document_questions),
+                UserAttempt.session_id.in_(document_sessions)
+            ))
+            session_questions = session_questions.where(SessionQuestion.session_id.in_(document_sessions))
+            sessions = sessions.where(StudySession.document_id == document_id)
+            review_cards = review_cards.where(SpacedRepetition.document_id == document_id)
+            questions = questions.where(Question.document_id == document_id)
+
+        with self.engine.begin() as conn:
+            return {
+                'attempts': conn.execute(attempts).rowcount,
+                'session_questions': conn.execute(session_questions).rowcount,
+                'sessions': conn.execute(sessions).rowcount,
+                'review_cards': conn.execute(review_cards).rowcount,
+                'questions_reset': conn.execute(questions.values(times_seen=0, times_correct=0)).rowcount
+            }
+
     @contextmanager
     def session(self) -> Generator[Session, None, None]:
         """
@@ -65,6 +180,63 @@ class Database:
         finally:
             session.close()
 
+    def insert_questions(
+        self,
+        questions: Iterable[Union[Question, Mapping]],
+        batch_size: Optional[int] = None
+    ) -> List[int]:
+        """
+        Bulk-insert questions, one transaction per batch.
+
+        Each batch is a single Core executemany INSERT, with no ORM unit-of-work
+        bookkeeping per row, so tens of thousands of questions take seconds.
+        max(id) is read after the INSERT, in its transaction, which holds
+        SQLite's write lock; so a batch's rowids are consecutive and end at
+        max(id), which is how the IDs are recovered
+        (INSERT ... RETURNING would fall back to one statement per row to keep
+        them in order). Each batch is added to the search index in one
+        statement as well, rather than row by row by the insert trigger.
+
+        Args:
+            questions: Transient Question instances or dicts of Question column values
+                (without id). Unset columns get their model defaults.
+            batch_size: Rows per transaction (default: Config.QUESTION_INSERT_BATCH_SIZE)
+
+        Returns:
+            New question IDs, in input order
+        """
+        batch_size = max(1, batch_size or Config.QUESTION_INSERT_BATCH_SIZE)
+        table = Question.__table__
+        columns = frozenset(column.key for column in table.columns if column.key != 'id')
+        # Every row carries every column, so each batch is one executemany statement
+        defaults = dict.fromkeys(columns)
+        defaults.update(times_seen=0, times_correct=0, created_at=to_iso_string())
+
+        ids: List[int] = []
+        batch: List[Dict] = []
+
+        def flush_batch() -> None:
+            with self.engine.begin() as conn:
+                with bulk_search_indexing(conn):
+                    conn.execute(insert(table), batch)
+                last_id = conn.execute(select(func.max(table.c.id))).scalar()
+            ids.extend(range(last_id - len(batch) + 1, last_id + 1))
+            batch.clear()
+
+        for question in questions:
+            if isinstance(question, Question):
+                # Loaded/assigned attributes only (instrumented getattr is slow per row)
+                question = {
+                    key: value for key, value in question.__dict__.items()
+                    if key in columns and value is not None
+                }
+            batch.append({**defaults, **question})
+            if len(batch) >= batch_size:
+                flush_batch()
+        if batch:
+            flush_batch()
+        return ids
+
     def get_session(self) -> Session:
         """
         Get a new database session. Caller is responsible for closing.
@@ -80,13 +252,13 @@ class Database:
         print(f"🔒 Database connection closed: {self.db_path}")
 
 
-# Global database instance
-_db_instance = None
+# Global database instances by path
+_db_instances: Dict[str, Database] = {}
 
 
 def get_database(db_path: str = 'pharma_exam.db') -> Database:
     """
-    Get or create global database instance.
+    Get or create the global database instance for a path.
 
     Args:
         db_path: Path to SQLite database file
@@ -94,10 +266,9 @@ def get_database(db_path: str = 'pharma_exam.db') -> Database:
     Returns:
         Database instance
     """
-    global _db_instance
-    if _db_instance is None:
-        _db_instance = Database(db_path)
-    return _db_instance
+    if db_path not in _db_instances:
+        _db_instances[db_path] = Database(db_path)
+    return _db_instances[db_path]
 
 
 def init_database(db_path: str = 'pharma_exam.db', reset: bool = False) -> Database:
@@ -8,11 +8,30 @@ Tables:
 - user_attempts: Answer attempts for analytics
 - study_sessions: Exam/study sessions
 - spaced_repetition: SM-2 algorithm data
+- processing_jobs: Uploaded documents and their background processing jobs
+- session_questions: Planned question order of each study session
+- questions_fts: Full-text search index over questions (FTS5, kept in sync by triggers)
 """
-from datetime import datetime
-from typing import Optional
-
-from sqlalchemy import Boolean, Column, Date, Float, ForeignKey, Integer, String, Text, create_engine
+import json
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from typing import Iterator, Optional
+
+from sqlalchemy import (
+    DDL,
+    Boolean,
+    Column,
+    Date,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    create_engine,
+    event,
+    text,
+)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from timezone_utils import to_iso_string
@@ -55,16 +74,68 @@ class Document(Base):
         return f"<Document(id={self.id}, file_id='{self.file_id}', filename='{self.filename}')>"
 
 
+class ProcessingJob(Base):
+    """Uploaded documents and their background processing job (one row per file)."""
+    __tablename__ = 'processing_jobs'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    file_id = Column(String(50), unique=True, nullable=False, index=True)
+    filepath = Column(Text, nullable=False)
+    content_hash = Column(String(64))
+
+    # Progress
+    status = Column(String(50), nullable=False, default='queued', index=True)  # "uploaded", "queued", "running", "complete", "failed"
+    progress = Column(Integer, default=0)  # 0-100
+    message = Column(Text)
+    stage = Column(String(50))  # Current pipeline stage
+    stage_timings_json = Column(Text)  # JSON object: stage -> seconds
+    error = Column(Text)
+
+    # Results
+    output_file = Column(String(255))
+    analysis_file = Column(String(255))
+    cached = Column(Boolean, default=False)
+
+    # Timestamps
+    created_at = Column(String(50), default=lambda: to_iso_string())
+    started_at = Column(String(50))
+    finished_at = Column(String(50))
+    updated_at = Column(String(50), default=lambda: to_iso_string())
+
+    def __repr__(self) -> str:
+        return f"<ProcessingJob(file_id='{self.file_id}', status='{self.status}', progress={self.progress})>"
+
+    def to_dict(self) -> dict:
+        """Job state as returned by the API."""
+        return {
+            'file_id': self.file_id,
+            'content_hash': self.content_hash,
+            'status': self.status,
+            'progress': self.progress,
+            'message': self.message,
+            'stage': self.stage,
+            'stage_timings': json.loads(self.stage_timings_json) if self.stage_timings_json else {},
+            'error': self.error,
+            'output_file': self.output_file,
+            'analysis_file': self.analysis_file,
+            'cached': bool(self.cached),
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'updated_at': self.updated_at
+        }
+
+
 class Question(Base):
     """Generated multiple-choice questions."""
     __tablename__ = 'questions'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     document_id = Column(Integer, ForeignKey('documents.id', ondelete='CASCADE'), nullable=False, index=True)
-    topic_id = Column(Integer, nullable=False, index=True)
+    topic_id = Column(Integer, nullable=False)
     topic_name = Column(Text, nullable=False)
-    question_type = Column(String(50), nullable=False, index=True)  # "single_answer" or "choose_all"
-    difficulty = Column(String(50), nullable=False, index=True)  # "basic", "intermediate", "advanced"
+    question_type = Column(String(50), nullable=False)  # "single_answer" or "choose_all"
+    difficulty = Column(String(50), nullable=False)  # "basic", "intermediate", "advanced"
 
     # Question content
     question_text = Column(Text, nullable=False)
@@ -98,17 +169,213 @@ class Question(Base):
         return (self.times_correct / self.times_seen) * 100
 
 
+# Keyset pagination of a document's questions in (topic_id, id) order; id is the
+# rowid, which SQLite appends to every index entry
+question_listing_index = Index('ix_questions_document_topic', Question.document_id, Question.topic_id)
+
+# Sampler bucket loads read (id, topic_name, difficulty, question_type) of a whole
+# document: covering, so the wide question rows are never touched. Also serves the
+# listing's topic/difficulty/type filters.
+question_bucket_index = Index(
+    'ix_questions_document_bucket',
+    Question.document_id, Question.topic_name, Question.difficulty, Question.question_type
+)
+
+# Review-mode ordering: partial expression index, so "lowest accuracy first" is an
+# index range scan. Queries must use these exact expressions for SQLite to match it.
+ACCURACY_EXPRESSION = 'times_correct * 1.0 / times_seen'
+SEEN_CONDITION = 'times_seen > 0'
+
+review_accuracy_index = Index(
+    'ix_questions_review_accuracy',
+    Question.document_id,
+    text(f'({ACCURACY_EXPRESSION})'),
+    sqlite_where=text(SEEN_CONDITION)
+)
+
+# Full-text search over question wording, explanations, key terms and citations.
+# External-content FTS5 table: the text is stored only in questions and triggers
+# keep the index in sync. The update trigger only fires when an indexed column
+# changes, so answer counters never touch it. remove_diacritics folds accents and
+# ñ on both indexed text and queries ("prescripcion" matches "prescripción").
+QUESTION_SEARCH_TABLE = 'questions_fts'
+QUESTION_SEARCH_COLUMNS = ('question_text', 'explanation', 'key_terms_json', 'regulatory_context')
+# While this table has a row, the insert trigger is skipped (see bulk_search_indexing)
+QUESTION_SEARCH_PAUSE_TABLE = 'questions_fts_paused'
+
+_search_columns = ', '.join(QUESTION_SEARCH_COLUMNS)
+_new_values = ', '.join(f'new.{column}' for column in QUESTION_SEARCH_COLUMNS)
+_old_values = ', '.join(f'old.{column}' for column in QUESTION_SEARCH_COLUMNS)
+QUESTION_SEARCH_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {QUESTION_SEARCH_TABLE} USING fts5("
+    f"{_search_columns}, content='questions', content_rowid='id', "
+    f"tokenize='unicode61 remove_diacritics 2')",
+    f"CREATE TABLE IF NOT EXISTS {QUESTION_SEARCH_PAUSE_TABLE} (paused INTEGER)",
+    f"CREATE TRIGGER IF NOT EXISTS {QUESTION_SEARCH_TABLE}_insert AFTER INSERT ON questions "
+    f"WHEN NOT EXISTS (SELECT 1 FROM {QUESTION_SEARCH_PAUSE_TABLE}) BEGIN "
+    f"INSERT INTO {QUESTION_SEARCH_TABLE}(rowid, {_search_columns}) VALUES (new.id, {_new_values}); END",
+    f"CREATE TRIGGER IF NOT EXISTS {QUESTION_SEARCH_TABLE}_delete AFTER DELETE ON questions BEGIN "
+    f"INSERT INTO {QUESTION_SEARCH_TABLE}({QUESTION_SEARCH_TABLE}, rowid, {_search_columns}) "
+    f"VALUES ('delete', old.id, {_old_values}); END",
+    f"CREATE TRIGGER IF NOT EXISTS {QUESTION_SEARCH_TABLE}_update AFTER UPDATE OF {_search_columns} ON questions BEGIN "
+    f"INSERT INTO {QUESTION_SEARCH_TABLE}({QUESTION_SEARCH_TABLE}, rowid, {_search_columns}) "
+    f"VALUES ('delete', old.id, {_old_values}); "
+    f"INSERT INTO {QUESTION_SEARCH_TABLE}(rowid, {_search_columns}) VALUES (new.id, {_new_values}); END"
+)
+
+
+def create_question_search(connection) -> None:
+    """
+    Create the question search table and its triggers if missing.
+
+    A newly created table is filled from the existing questions, so this also
+    migrates databases that predate search.
+
+    Args:
+        connection: SQLAlchemy connection (inside a transaction)
+    """
+    exists = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (QUESTION_SEARCH_TABLE,)
+    ).first()
+    for ddl in QUESTION_SEARCH_DDL:
+        connection.exec_driver_sql(ddl)
+    if not exists:
+        connection.exec_driver_sql(f"INSERT INTO {QUESTION_SEARCH_TABLE}({QUESTION_SEARCH_TABLE}) VALUES ('rebuild')")
+
+
+@contextmanager
+def bulk_search_indexing(connection) -> Iterator[None]:
+    """
+    Index the questions inserted inside the block with one statement on exit.
+
+    Feeding FTS5 row by row from the insert trigger makes bulk inserts several
+    times slower than a single INSERT ... SELECT. The pause row is written and
+    removed in the caller's transaction, so other connections never see it.
+
+    Does nothing on databases without search (created before it, not yet migrated).
+
+    Args:
+        connection: SQLAlchemy connection (inside a transaction)
+    """
+    if not connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (QUESTION_SEARCH_PAUSE_TABLE,)
+    ).first():
+        yield
+        return
+
+    # Write first: pysqlite only opens the transaction (and takes the write lock)
+    # at the first DML statement, so a max(id) read before it could miss a
+    # concurrent writer's rows, leaving them out of the index
+    connection.exec_driver_sql(f"INSERT INTO {QUESTION_SEARCH_PAUSE_TABLE} VALUES (1)")
+    last_id = connection.exec_driver_sql("SELECT max(id) FROM questions").scalar() or 0
+    yield
+    connection.exec_driver_sql(f"DELETE FROM {QUESTION_SEARCH_PAUSE_TABLE}")
+    connection.exec_driver_sql(
+        f"INSERT INTO {QUESTION_SEARCH_TABLE}(rowid, {_search_columns}) "
+        f"SELECT id, {_search_columns} FROM questions WHERE id > ?",
+        (last_id,)
+    )
+
+
+# Per-document change counter of the question set, for caches of a document's
+# questions in any process (see question_sampler). Triggers bump it on every insert,
+# delete and change of a bucket column, whoever runs the statement, while answer
+# counter updates don't touch it. A document's first version is random, so a reset
+# database that reuses the document ID can't reproduce a version cached before.
+QUESTION_VERSION_TABLE = 'question_versions'
+QUESTION_VERSION_COLUMNS = ('document_id', 'topic_name', 'difficulty', 'question_type')
+
+
+def _bump_version(document_id: str) -> str:
+    return (
+        f"INSERT INTO {QUESTION_VERSION_TABLE} (document_id, version) "
+        f"VALUES ({document_id}, abs(random() % 1000000000000)) "
+        f"ON CONFLICT (document_id) DO UPDATE SET version = version + 1;"
+    )
+
+
+QUESTION_VERSION_DDL = (
+    f"CREATE TABLE IF NOT EXISTS {QUESTION_VERSION_TABLE} "
+    f"(document_id INTEGER PRIMARY KEY, version INTEGER NOT NULL)",
+    f"CREATE TRIGGER IF NOT EXISTS {QUESTION_VERSION_TABLE}_insert AFTER INSERT ON questions BEGIN "
+    f"{_bump_version('new.document_id')} END",
+    f"CREATE TRIGGER IF NOT EXISTS {QUESTION_VERSION_TABLE}_delete AFTER DELETE ON questions BEGIN "
+    f"{_bump_version('old.document_id')} END",
+    f"CREATE TRIGGER IF NOT EXISTS {QUESTION_VERSION_TABLE}_update "
+    f"AFTER UPDATE OF {', '.join(QUESTION_VERSION_COLUMNS)} ON questions BEGIN "
+    f"{_bump_version('old.document_id')} {_bump_version('new.document_id')} END"
+)
+
+
+def create_question_versions(connection) -> None:
+    """
+    Create the question version table and its triggers if missing.
+
+    Args:
+        connection: SQLAlchemy connection (inside a transaction)
+    """
+    for ddl in QUESTION_VERSION_DDL:
+        connection.exec_driver_sql(ddl)
+
+
+def question_version(connection, document_id: int) -> Optional[int]:
+    """
+    Current version of a document's question set (a primary key lookup).
+
+    Args:
+        connection: SQLAlchemy connection or session
+        document_id: Document to look up
+
+    Returns:
+        Version, or None if the document's questions haven't changed since the
+        table was added
+    """
+    return connection.execute(
+        text(f"SELECT version FROM {QUESTION_VERSION_TABLE} WHERE document_id = :document_id"),
+        {'document_id': document_id}
+    ).scalar()
+
+
+def _create_question_companions(target, connection, **kw) -> None:
+    create_question_search(connection)
+    create_question_versions(connection)
+
+
+# Created and dropped together with the questions table (create_all/drop_all)
+event.listen(Question.__table__, 'after_create', _create_question_companions)
+event.listen(Question.__table__, 'before_drop', DDL(f'DROP TABLE IF EXISTS {QUESTION_SEARCH_TABLE}'))
+event.listen(Question.__table__, 'before_drop', DDL(f'DROP TABLE IF EXISTS {QUESTION_SEARCH_PAUSE_TABLE}'))
+event.listen(Question.__table__, 'before_drop', DDL(f'DROP TABLE IF EXISTS {QUESTION_VERSION_TABLE}'))
+
+
+class SessionQuestion(Base):
+    """One planned question of a study session, in session order."""
+    __tablename__ = 'session_questions'
+    __table_args__ = (
+        # Finds the graded question's position when an answer comes in
+        Index('ix_session_questions_session_question', 'session_id', 'question_id', unique=True),
+    )
+
+    session_id = Column(Integer, ForeignKey('study_sessions.id', ondelete='CASCADE'), primary_key=True)
+    position = Column(Integer, primary_key=True)  # 0-based
+    question_id = Column(Integer, ForeignKey('questions.id', ondelete='CASCADE'), nullable=False)
+    payload_json = Column(Text, nullable=False)  # Question as served to the client (no answer)
+
+    def __repr__(self) -> str:
+        return f"<SessionQuestion(session_id={self.session_id}, position={self.position}, question_id={self.question_id})>"
+
+
 class UserAttempt(Base):
     """Individual answer attempts."""
     __tablename__ = 'user_attempts'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     question_id = Column(Integer, ForeignKey('questions.id', ondelete='CASCADE'), nullable=False, index=True)
-    session_id = Column(Integer, ForeignKey('study_sessions.id', ondelete='SET NULL'), index=True)
+    session_id = Column(Integer, ForeignKey('study_sessions.id', ondelete='SET NULL'))
 
     # Answer details
     selected_answer = Column(String(50), nullable=False)
-    is_correct = Column(Boolean, nullable=False, index=True)
+    is_correct = Column(Boolean, nullable=False)
     time_spent_seconds = Column(Integer)
 
     # Timestamp
@@ -122,6 +389,14 @@ class UserAttempt(Base):
         return f"<UserAttempt(id={self.id}, question_id={self.question_id}, correct={self.is_correct})>"
 
 
+# A session's attempts joined to their questions: covering for the results topic
+# breakdown; leads with session_id, so it also serves lookups by session alone
+attempt_session_index = Index(
+    'ix_user_attempts_session_question',
+    UserAttempt.session_id, UserAttempt.question_id, UserAttempt.is_correct
+)
+
+
 class StudySession(Base):
     """Exam and study sessions."""
     __tablename__ = 'study_sessions'
@@ -130,7 +405,7 @@ class StudySession(Base):
     document_id = Column(Integer, ForeignKey('documents.id', ondelete='CASCADE'), nullable=False, index=True)
 
     # Session configuration
-    session_type = Column(String(50), nullable=False, index=True)  # "study", "practice", "mock"
+    session_type = Column(String(50), nullable=False)  # "study", "practice", "mock", "review"
     topic_filter = Column(Text)  # NULL = all topics
     difficulty_filter = Column(String(50))  # NULL = all
     total_questions = Column(Integer, nullable=False)
@@ -150,6 +425,7 @@ class StudySession(Base):
     # Relationships
     document = relationship('Document', back_populates='study_sessions')
     user_attempts = relationship('UserAttempt', back_populates='study_session')
+    planned_questions = relationship('SessionQuestion', order_by='SessionQuestion.position', cascade='all, delete-orphan')
 
     def __repr__(self) -> str:
         return f"<StudySession(id={self.id}, type='{self.session_type}', score={self.score_percentage})>"
@@ -169,12 +445,18 @@ class StudySession(Base):
         return int((end - start).total_seconds() / 60)
 
 
+# Session history filtered by type, newest first, without sorting
+session_history_index = Index('ix_study_sessions_type_start', StudySession.session_type, StudySession.start_time)
+
+
 class SpacedRepetition(Base):
     """Spaced repetition data for SM-2 algorithm."""
     __tablename__ = 'spaced_repetition'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     question_id = Column(Integer, ForeignKey('questions.id', ondelete='CASCADE'), unique=True, nullable=False, index=True)
+    # Copied from the question, so a document's due queue is one index range (see review_due_index)
+    document_id = Column(Integer, ForeignKey('documents.id', ondelete='CASCADE'), nullable=False)
 
     # SM-2 Algorithm parameters
     ease_factor = Column(Float, default=2.5)  # Range: 1.3 - 2.5
@@ -195,7 +477,7 @@ class SpacedRepetition(Base):
     def __repr__(self) -> str:
         return f"<SpacedRepetition(question_id={self.question_id}, next_review={self.next_review_date})>"
 
-    def update_after_review(self, quality: int) -> None:
+    def update_after_review(self, quality: int, today: Optional[date] = None) -> None:
         """
         Update spaced repetition parameters after a review using SM-2 algorithm.
 
@@ -207,6 +489,7 @@ class SpacedRepetition(Base):
                 3: Correct but difficult
                 4: Correct with hesitation
                 5: Perfect recall
+            today: Date of the review (default: the server's local date)
         """
         self.total_reviews += 1
         self.last_reviewed = to_iso_string()
@@ -232,8 +515,7 @@ class SpacedRepetition(Base):
         self.ease_factor = max(1.3, self.ease_factor + (0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)))
 
         # Calculate next review date
-        from datetime import date, timedelta
-        self.next_review_date = date.today() + timedelta(days=self.interval_days)
+        self.next_review_date = (today or date.today()) + timedelta(days=self.interval_days)
 
     @property
     def accuracy_rate(self) -> float:
@@ -241,3 +523,28 @@ class SpacedRepetition(Base):
         if self.total_reviews == 0:
             return 0.0
         return (self.correct_reviews / self.total_reviews) * 100
+
+
+# Review due queue: a document's cards in next_review_date order, so "next N due"
+# reads N index entries however many cards the document has
+review_due_index = Index('ix_spaced_repetition_document_due', SpacedRepetition.document_id, SpacedRepetition.next_review_date)
+
+
+def add_review_document_column(connection) -> None:
+    """
+    Add spaced_repetition.document_id to databases created before the review
+    queue, filled in from each card's question.
+
+    Args:
+        connection: SQLAlchemy connection (inside a transaction)
+    """
+    columns = {row[1] for row in connection.exec_driver_sql('PRAGMA table_info(spaced_repetition)')}
+    if not columns or 'document_id' in columns:
+        return
+    connection.exec_driver_sql(
+        'ALTER TABLE spaced_repetition ADD COLUMN document_id INTEGER REFERENCES documents (id) ON DELETE CASCADE'
+    )
+    connection.exec_driver_sql(
+        'UPDATE spaced_repetition SET document_id = '
+        '(SELECT questions.document_id FROM questions WHERE questions.id = spaced_repetition.question_id)'
+    )
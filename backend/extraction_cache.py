@@ -0,0 +1,207 @@
+"""
+Content-addressed cache of processed documents.
+
+Entries are keyed by the SHA-256 of the uploaded PDF, so re-uploading the same
+file reuses its extracted pages, topics, analyses and formatted markdown instead
+of re-extracting and re-calling the LLM. Each entry is a directory:
+
+    <cache_dir>/<sha256>/
+        meta.json         # size, filename, page/topic counts
+        topics.json       # topic groupings from TextProcessor
+        analyses.json     # per-topic analysis from PharmacyContentAnalyzer
+        formatted.json    # per-topic markdown from ClaudeFormatter
+        pages/raw/*.md    # copies of the extracted page files
+        pages/cleaned/*.md
+
+The directory mtime is bumped on every hit and the least recently used entries
+are evicted once the cache grows past its size limit.
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from typing import IO, Dict, List, Optional
+
+from config import Config
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+logger = logging.getLogger(__name__)
+
+
+def save_and_hash(stream: IO[bytes], dest_path: str) -> str:
+    """
+    Copy an upload stream to disk, hashing it on the way through.
+
+    Returns:
+        Hex SHA-256 digest of the written bytes
+    """
+    sha = hashlib.sha256()
+    with open(dest_path, 'wb') as f:
+        while True:
+            chunk = stream.read(HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            sha.update(chunk)
+            f.write(chunk)
+    return sha.hexdigest()
+
+
+def hash_file(path: str) -> str:
+    """Hex SHA-256 digest of a file on disk."""
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+class ExtractionCache:
+    """Size-bounded, LRU-evicted on-disk cache of processed documents."""
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = None):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Cache root (default: Config.EXTRACTION_CACHE_FOLDER)
+            max_bytes: Total size limit (default: Config.EXTRACTION_CACHE_MAX_BYTES)
+        """
+        self.cache_dir = cache_dir or Config.EXTRACTION_CACHE_FOLDER
+        self.max_bytes = max_bytes if max_bytes is not None else Config.EXTRACTION_CACHE_MAX_BYTES
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _entry_dir(self, content_hash: str) -> str:
+        return os.path.join(self.cache_dir, content_hash)
+
+    def contains(self, content_hash: str) -> bool:
+        """Check for an entry without counting it as a use."""
+        return os.path.exists(os.path.join(self._entry_dir(content_hash), 'meta.json'))
+
+    def get(self, content_hash: str) -> Optional[Dict]:
+        """
+        Load a cached document and mark it as recently used.
+
+        Returns:
+            Dictionary with meta, topics, analyses, formatted and pages_dir keys,
+            or None on a miss
+        """
+        entry_dir = self._entry_dir(content_hash)
+        try:
+            with open(os.path.join(entry_dir, 'meta.json'), encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(os.path.join(entry_dir, 'topics.json'), encoding='utf-8') as f:
+                topics = json.load(f)
+            with open(os.path.join(entry_dir, 'analyses.json'), encoding='utf-8') as f:
+                analyses = json.load(f)
+            with open(os.path.join(entry_dir, 'formatted.json'), encoding='utf-8') as f:
+                formatted = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        try:
+            os.utime(entry_dir)
+        except OSError:
+            # Evicted by another process since the read (pages included): a miss
+            return None
+        return {
+            'meta': meta,
+            'topics': topics,
+            'analyses': analyses,
+            'formatted': formatted,
+            'pages_dir': os.path.join(entry_dir, 'pages')
+        }
+
+    def put(
+        self,
+        content_hash: str,
+        pages_dir: str,
+        topics: List[Dict],
+        analyses: List[Dict],
+        formatted: List[str],
+        filename: str = ''
+    ) -> None:
+        """
+        Store a processed document, then evict old entries if over the size limit.
+
+        Args:
+            content_hash: SHA-256 of the source PDF
+            pages_dir: Output directory holding pages/raw and pages/cleaned
+            topics: Topic groupings
+            analyses: Per-topic analyses, in topic order
+            formatted: Per-topic formatted markdown, in topic order
+            filename: Original upload filename (informational)
+        """
+        # Build the entry in a scratch directory and rename it into place, so a
+        # concurrent reader never sees a half-written entry
+        staging_dir = tempfile.mkdtemp(prefix='.staging_', dir=self.cache_dir)
+        try:
+            shutil.copytree(pages_dir, os.path.join(staging_dir, 'pages'))
+            for name, data in (('topics.json', topics), ('analyses.json', analyses), ('formatted.json', formatted)):
+                with open(os.path.join(staging_dir, name), 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False)
+
+            meta = {
+                'content_hash': content_hash,
+                'filename': filename,
+                'total_topics': len(topics),
+                'size_bytes': self._dir_size(staging_dir)
+            }
+            with open(os.path.join(staging_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+
+            with self._lock:
+                entry_dir = self._entry_dir(content_hash)
+                if os.path.exists(entry_dir):
+                    shutil.rmtree(entry_dir, ignore_errors=True)
+                os.replace(staging_dir, entry_dir)
+        finally:
+            if os.path.exists(staging_dir):
+                shutil.rmtree(staging_dir, ignore_errors=True)
+
+        self.evict()
+
+    def evict(self) -> int:
+        """
+        Remove least recently used entries until the cache fits in max_bytes.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            entries = []
+            for name in os.listdir(self.cache_dir):
+                entry_dir = self._entry_dir(name)
+                if name.startswith('.') or not os.path.isdir(entry_dir):
+                    continue
+                try:
+                    with open(os.path.join(entry_dir, 'meta.json'), encoding='utf-8') as f:
+                        size = json.load(f).get('size_bytes', 0)
+                except (OSError, ValueError):
+                    size = self._dir_size(entry_dir)
+                entries.append((os.path.getmtime(entry_dir), size, entry_dir))
+
+            total = sum(size for _, size, _ in entries)
+            removed = 0
+            for _, size, entry_dir in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                total -= size
+                removed += 1
+
+        if removed:
+            logger.info(f"Evicted {removed} extraction cache entries (now {total:,} bytes)")
+        return removed
+
+    @staticmethod
+    def _dir_size(path: str) -> int:
+        total = 0
+        for root, _, files in os.walk(path):
+            for name in files:
+                total += os.path.getsize(os.path.join(root, name))
+        return total
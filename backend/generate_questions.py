@@ -6,6 +6,7 @@ Usage:
     python generate_questions.py <file_id>              # Generate with defaults
     python generate_questions.py <file_id> --count 30   # Generate 30 per topic
     python generate_questions.py <file_id> --test       # Test with 1 topic only
+    python generate_questions.py <file_id> --concurrency 8 --seed 42
 """
 import argparse
 import logging
@@ -41,6 +42,24 @@ def main():
         default=None,
         help='Number of questions per topic (default: 25)'
     )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=None,
+        help='Parallel API calls (default: QUESTION_GENERATION_CONCURRENCY, 4)'
+    )
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=None,
+        help='Questions per API call (default: QUESTION_BATCH_SIZE, 5; 1 disables batching)'
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=None,
+        help='Seed for the type/difficulty plan (reproducible runs)'
+    )
     parser.add_argument(
         '--test',
         action='store_true',
@@ -72,7 +91,10 @@ def main():
 
     # Generate questions
     try:
-        stats = generator.generate_all_questions(args.file_id, args.count)
+        stats = generator.generate_all_questions(
+            args.file_id, args.count, concurrency=args.concurrency, seed=args.seed,
+            batch_size=args.batch_size
+        )
 
         if stats.get('success'):
             logger.info(f"\n✅ SUCCESS! Generated {stats['total_questions_generated']} questions")
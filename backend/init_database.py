@@ -83,6 +83,7 @@ def add_sample_data(db):
         # Sample spaced repetition entry
         sr = SpacedRepetition(
             question_id=question.id,
+            document_id=doc.id,
             ease_factor=2.6,
             interval_days=4,
             repetitions=2,
@@ -0,0 +1,272 @@
+"""
+Background runner for document processing jobs.
+
+/api/process used to run the whole pipeline inside the SSE response generator,
+so a browser disconnect lost the work and a Flask worker was tied up for the
+entire run. Jobs are now submitted here and run on a small thread pool; their
+state, progress and per-stage timings are persisted to the processing_jobs
+table, and the HTTP endpoints only tail that row.
+
+The same table is the store for uploaded files (status "uploaded", content
+hash) and processing results (output files), so downloads keep working after a
+restart and from any process of a multi-process server.
+
+A job's work is any callable returning an iterator of progress events:
+
+    {'progress': 40, 'message': 'Identifying topics...', 'stage': 'topics'}
+
+The final event may also carry 'output_file', 'analysis_file' and 'cached'.
+Raising marks the job failed with the exception message.
+"""
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, List, Optional
+
+from config import Config
+from database import get_database
+from database_models import ProcessingJob
+from timezone_utils import to_iso_string
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ('queued', 'running')
+
+
+class JobRunner:
+    """Runs processing jobs on a thread pool and persists their progress."""
+
+    def __init__(self, max_workers: int = None):
+        """
+        Initialize the runner.
+
+        Jobs that stopped reporting progress more than Config.JOB_STALE_SECONDS ago
+        can't be resumed (their worker is gone), so they are marked failed. Recently
+        updated jobs may belong to another server process and are left alone.
+
+        Args:
+            max_workers: Documents processed at once (default: Config.JOB_WORKERS)
+        """
+        self.db = get_database(Config.DATABASE_PATH)
+        self.max_workers = max_workers or Config.JOB_WORKERS
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='job')
+        self._lock = threading.Lock()
+
+        # Existing databases predate the jobs table
+        with self.db.engine.begin() as conn:
+            ProcessingJob.__table__.create(conn, checkfirst=True)
+
+        self.fail_stale_jobs()
+
+    def fail_stale_jobs(self) -> int:
+        """
+        Mark queued/running jobs with no progress for Config.JOB_STALE_SECONDS as failed.
+
+        Returns:
+            Number of jobs marked failed
+        """
+        now = datetime.now(timezone.utc)
+        interrupted = 0
+
+        with self.db.session() as session:
+            jobs = session.query(ProcessingJob).filter(ProcessingJob.status.in_(ACTIVE_STATUSES)).all()
+            for job in jobs:
+                try:
+                    idle = (now - datetime.fromisoformat(job.updated_at)).total_seconds()
+                except (TypeError, ValueError):
+                    idle = float('inf')
+                if idle > Config.JOB_STALE_SECONDS:
+                    job.status = 'failed'
+                    job.error = 'Interrupted (server restarted or worker died)'
+                    job.finished_at = to_iso_string()
+                    interrupted += 1
+
+        if interrupted:
+            logger.warning(f"Marked {interrupted} interrupted processing jobs as failed")
+        return interrupted
+
+    def register_upload(self, file_id: str, filepath: str, content_hash: Optional[str] = None) -> None:
+        """Record a newly uploaded file (status "uploaded") so later requests can find it."""
+        with self.db.session() as session:
+            job = session.query(ProcessingJob).filter_by(file_id=file_id).first()
+            if job is None:
+                job = ProcessingJob(file_id=file_id, filepath=filepath)
+                session.add(job)
+            elif job.status in ACTIVE_STATUSES:
+                return
+            job.filepath = filepath
+            job.content_hash = content_hash
+            job.status = 'uploaded'
+            job.progress = 0
+            job.message = None
+            job.error = None
+            job.output_file = None
+            job.analysis_file = None
+            job.updated_at = to_iso_string()
+
+    def submit(
+        self,
+        file_id: str,
+        filepath: str,
+        work: Callable[[], Iterator[Dict]],
+        content_hash: Optional[str] = None
+    ) -> Dict:
+        """
+        Queue a processing job unless one is already queued or running for the file.
+
+        Args:
+            file_id: Uploaded file identifier (one job per file)
+            filepath: Path of the uploaded PDF
+            work: Callable returning an iterator of progress events
+            content_hash: SHA-256 of the PDF, if known
+
+        Returns:
+            Job state dictionary
+        """
+        with self._lock:
+            with self.db.session() as session:
+                job = session.query(ProcessingJob).filter_by(file_id=file_id).first()
+                if job and job.status in ACTIVE_STATUSES:
+                    logger.info(f"Job for {file_id} already {job.status}, not resubmitting")
+                    return job.to_dict()
+
+                if job is None:
+                    job = ProcessingJob(file_id=file_id, filepath=filepath)
+                    session.add(job)
+
+                # (Re)start from a clean slate
+                job.filepath = filepath
+                job.content_hash = content_hash or job.content_hash
+                job.status = 'queued'
+                job.progress = 0
+                job.message = 'Queued...'
+                job.stage = None
+                job.stage_timings_json = None
+                job.error = None
+                job.output_file = None
+                job.analysis_file = None
+                job.cached = False
+                job.created_at = to_iso_string()
+                job.started_at = None
+                job.finished_at = None
+                job.updated_at = job.created_at
+                session.flush()
+                state = job.to_dict()
+
+            self._pool.submit(self._run, file_id, work)
+
+        logger.info(f"Queued processing job for {file_id}")
+        return state
+
+    def get(self, file_id: str) -> Optional[Dict]:
+        """Return the job state for a file, or None if it was never submitted."""
+        with self.db.session() as session:
+            job = session.query(ProcessingJob).filter_by(file_id=file_id).first()
+            return job.to_dict() if job else None
+
+    def list_jobs(self, limit: int = 50) -> List[Dict]:
+        """Most recently created jobs first."""
+        with self.db.session() as session:
+            jobs = session.query(ProcessingJob).order_by(ProcessingJob.id.desc()).limit(limit).all()
+            return [job.to_dict() for job in jobs]
+
+    def _update(self, file_id: str, **fields) -> None:
+        fields['updated_at'] = to_iso_string()
+        with self.db.session() as session:
+            session.query(ProcessingJob).filter_by(file_id=file_id).update(fields, synchronize_session=False)
+
+    def _run(self, file_id: str, work: Callable[[], Iterator[Dict]]) -> None:
+        """Worker thread: drive the job's event iterator, persisting every event."""
+        self._update(file_id, status='running', started_at=to_iso_string(), message='Starting...')
+
+        timings: Dict[str, float] = {}
+        stage = None
+        stage_start = time.perf_counter()
+
+        def close_stage() -> None:
+            if stage:
+                timings[stage] = round(timings.get(stage, 0.0) + time.perf_counter() - stage_start, 3)
+
+        try:
+            for event in work():
+                fields = {}
+                if event.get('stage') and event['stage'] != stage:
+                    close_stage()
+                    stage = event['stage']
+                    stage_start = time.perf_counter()
+                    fields['stage'] = stage
+                    fields['stage_timings_json'] = json.dumps(timings)
+                if 'progress' in event:
+                    fields['progress'] = event['progress']
+                if 'message' in event:
+                    fields['message'] = event['message']
+                for key in ('output_file', 'analysis_file', 'cached'):
+                    if key in event:
+                        fields[key] = event[key]
+                self._update(file_id, **fields)
+
+            close_stage()
+            self._update(
+                file_id, status='complete', progress=100, stage_timings_json=json.dumps(timings),
+                finished_at=to_iso_string()
+            )
+            logger.info(f"Processing job for {file_id} complete: {timings}")
+
+        except Exception as e:
+            close_stage()
+            logger.error(f"Processing job for {file_id} failed: {e}", exc_info=True)
+            self._update(
+                file_id, status='failed', error=str(e), stage_timings_json=json.dumps(timings),
+                finished_at=to_iso_string()
+            )
+
+    def tail(self, file_id: str, poll_interval: float = None) -> Iterator[Dict]:
+        """
+        Yield the job state each time its progress or message changes, ending once it
+        is no longer queued or running. Closing the iterator (client disconnect) does not affect the job.
+
+        Args:
+            file_id: Job to follow
+            poll_interval: Seconds between checks (default: Config.JOB_POLL_INTERVAL)
+        """
+        poll_interval = poll_interval or Config.JOB_POLL_INTERVAL
+        last_seen = None
+
+        while True:
+            state = self.get(file_id)
+            if state is None:
+                return
+
+            key = (state['status'], state['progress'], state['message'])
+            if key != last_seen:
+                last_seen = key
+                yield state
+
+            if state['status'] not in ACTIVE_STATUSES:
+                return
+            time.sleep(poll_interval)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+
+
+# Global runner instance
+_runner_instance = None
+_runner_lock = threading.Lock()
+
+
+def get_job_runner() -> JobRunner:
+    """
+    Get or create the process-wide job runner.
+
+    Returns:
+        JobRunner instance
+    """
+    global _runner_instance
+    with _runner_lock:
+        if _runner_instance is None:
+            _runner_instance = JobRunner()
+    return _runner_instance
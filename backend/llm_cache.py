@@ -0,0 +1,225 @@
+"""
+Persistent cache of LLM responses.
+
+Responses are stored in a small SQLite database keyed by model, the SHA-256 of
+the prompt and the sampling parameters, so a byte-identical request (re-running
+a document after a crash or a config tweak) is answered locally. Entries expire
+after a TTL and the least recently used ones are evicted past a size limit.
+
+Only deterministic, low-temperature calls should go through the cache - question
+generation relies on sampling variety and deliberately bypasses it.
+"""
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from config import Config
+from llm_client import using_fake_backend
+from rate_limiter import create_message
+
+logger = logging.getLogger(__name__)
+
+
+class LLMResponseCache:
+    """SQLite-backed LLM response cache with TTL and max-size eviction."""
+
+    # Check the size limit every N writes rather than on every insert
+    EVICT_EVERY = 50
+
+    def __init__(self, db_path: str = None, ttl_seconds: int = None, max_entries: int = None):
+        """
+        Initialize the cache.
+
+        Args:
+            db_path: SQLite file (default: Config.LLM_CACHE_PATH)
+            ttl_seconds: Entry lifetime (default: Config.LLM_CACHE_TTL_SECONDS)
+            max_entries: Size limit (default: Config.LLM_CACHE_MAX_ENTRIES)
+        """
+        self.db_path = db_path or Config.LLM_CACHE_PATH
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else Config.LLM_CACHE_TTL_SECONDS
+        self.max_entries = max_entries if max_entries is not None else Config.LLM_CACHE_MAX_ENTRIES
+
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_responses (
+                model TEXT NOT NULL,
+                prompt_hash TEXT NOT NULL,
+                params TEXT NOT NULL,
+                response_text TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_accessed REAL NOT NULL,
+                PRIMARY KEY (model, prompt_hash, params)
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_llm_responses_last_accessed ON llm_responses (last_accessed)"
+        )
+
+    @staticmethod
+    def _key(model: str, prompt: str, params: Dict) -> tuple:
+        prompt_hash = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+        return model, prompt_hash, json.dumps(params, sort_keys=True)
+
+    def get(self, model: str, prompt: str, params: Dict) -> Optional[str]:
+        """Return the cached response text, or None on a miss or expired entry."""
+        key = self._key(model, prompt, params)
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response_text, created_at FROM llm_responses "
+                "WHERE model = ? AND prompt_hash = ? AND params = ?",
+                key
+            ).fetchone()
+
+            if row is None or now - row[1] > self.ttl_seconds:
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE llm_responses SET last_accessed = ? WHERE model = ? AND prompt_hash = ? AND params = ?",
+                (now, *key)
+            )
+            self.hits += 1
+            return row[0]
+
+    def set(self, model: str, prompt: str, params: Dict, response_text: str) -> None:
+        """Store a response, replacing any previous entry for the same request."""
+        key = self._key(model, prompt, params)
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses "
+                "(model, prompt_hash, params, response_text, created_at, last_accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (*key, response_text, now, now)
+            )
+            self._writes += 1
+            should_evict = self._writes % self.EVICT_EVERY == 0
+
+        if should_evict:
+            self.evict()
+
+    def evict(self) -> int:
+        """
+        Delete expired entries, then the least recently used ones beyond max_entries.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            expired = self._conn.execute(
+                "DELETE FROM llm_responses WHERE created_at < ?",
+                (time.time() - self.ttl_seconds,)
+            ).rowcount
+
+            overflow = self._conn.execute(
+                "DELETE FROM llm_responses WHERE rowid IN ("
+                "  SELECT rowid FROM llm_responses ORDER BY last_accessed DESC LIMIT -1 OFFSET ?"
+                ")",
+                (self.max_entries,)
+            ).rowcount
+
+        if expired or overflow:
+            logger.info(f"LLM cache evicted {expired} expired and {overflow} least recently used entries")
+        return expired + overflow
+
+    def clear(self) -> None:
+        """Delete every entry and reset the counters."""
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_responses")
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process plus the current entry count."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            'enabled': Config.LLM_CACHE_ENABLED,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'entries': entries,
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl_seconds
+        }
+
+
+# Global cache instance
+_cache_instance = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """
+    Get or create the global LLM response cache.
+
+    Returns:
+        LLMResponseCache instance
+    """
+    global _cache_instance
+    with _cache_lock:
+        if _cache_instance is None:
+            _cache_instance = LLMResponseCache()
+    return _cache_instance
+
+
+def cached_completion(
+    client,
+    model: str,
+    prompt: str,
+    max_tokens: int,
+    temperature: float,
+    validate: Optional[Callable[[str], Any]] = None
+) -> str:
+    """
+    Send a single-turn prompt through the response cache.
+
+    Args:
+        client: Anthropic client used on a cache miss (rate limited)
+        model: Model name
+        prompt: User message content
+        max_tokens: Sampling parameter (part of the cache key)
+        temperature: Sampling parameter (part of the cache key)
+        validate: Optional parser; if it raises, the response is not cached and
+                  the exception propagates to the caller
+
+    Returns:
+        Response text
+    """
+    # Fake-backend responses must never be served to real runs later
+    cache = get_llm_cache() if Config.LLM_CACHE_ENABLED and not using_fake_backend() else None
+    params = {'max_tokens': max_tokens, 'temperature': temperature}
+
+    if cache:
+        cached = cache.get(model, prompt, params)
+        if cached is not None:
+            return cached
+
+    response = create_message(
+        client,
+        model=model,
+        max_tokens=max_tokens,
+        temperature=temperature,
+        messages=[{"role": "user", "content": prompt}]
+    )
+    text = response.content[0].text
+
+    if validate:
+        validate(text)
+    if cache:
+        cache.set(model, prompt, params, text)
+    return text
@@ -0,0 +1,275 @@
+"""
+LLM client backends.
+
+Every LLM-touching class gets its client from create_client(), which returns
+either a real Anthropic client or, with Config.LLM_BACKEND = 'fake', an offline
+FakeLLMClient. The fake recognizes each of the pipeline's prompts (topic
+identification, context summary, analysis, formatting, single and batched
+question generation) and answers with schema-valid JSON or markdown built from
+the prompt itself, after a configurable latency. A configurable fraction of
+calls fails with a 429/529 or returns malformed JSON, so retry paths are
+exercised too.
+
+This lets benchmarks and load tests measure orchestration throughput end to end
+with no network access and no API spend.
+"""
+import hashlib
+import json
+import logging
+import random
+import re
+import threading
+import time
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
+
+from anthropic import Anthropic
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def using_fake_backend() -> bool:
+    """True when LLM calls are answered by the offline fake."""
+    return Config.LLM_BACKEND == 'fake'
+
+
+def llm_available() -> bool:
+    """True when LLM calls can be made (API key configured or fake backend)."""
+    return using_fake_backend() or bool(Config.ANTHROPIC_API_KEY)
+
+
+def create_client():
+    """
+    Build the LLM client for the configured backend.
+
+    Returns:
+        Anthropic client, or FakeLLMClient when Config.LLM_BACKEND is 'fake'
+    """
+    if using_fake_backend():
+        return FakeLLMClient()
+    # 429/529 retries are handled by rate_limiter.create_message
+    return Anthropic(api_key=Config.ANTHROPIC_API_KEY, max_retries=0)
+
+
+class FakeAPIStatusError(Exception):
+    """Stand-in for anthropic.APIStatusError raised by the fake backend."""
+
+    def __init__(self, status_code: int):
+        super().__init__(f"Fake API error {status_code}")
+        self.status_code = status_code
+        self.response = None
+
+
+class _FakeMessages:
+    def __init__(self, client: 'FakeLLMClient'):
+        self._client = client
+
+    def create(self, **kwargs):
+        return self._client.create_message(**kwargs)
+
+
+class FakeLLMClient:
+    """
+    Offline drop-in for anthropic.Anthropic (client.messages.create only).
+
+    Response content is a deterministic function of the prompt; latency and
+    failures are drawn from a random source (seed it for reproducible runs).
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = None,
+        latency_jitter_ms: float = None,
+        ms_per_output_token: float = None,
+        overload_rate: float = None,
+        malformed_rate: float = None,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize the fake client.
+
+        Args:
+            latency_ms: Mean per-call latency (default: Config.FAKE_LLM_LATENCY_MS)
+            latency_jitter_ms: Latency standard deviation (default: Config.FAKE_LLM_LATENCY_JITTER_MS)
+            ms_per_output_token: Extra latency per generated token (default: Config.FAKE_LLM_MS_PER_OUTPUT_TOKEN)
+            overload_rate: Fraction of calls failing with 429/529 (default: Config.FAKE_LLM_OVERLOAD_RATE)
+            malformed_rate: Fraction of JSON responses truncated (default: Config.FAKE_LLM_MALFORMED_RATE)
+            seed: Random seed (default: Config.FAKE_LLM_SEED)
+        """
+        self.latency_ms = latency_ms if latency_ms is not None else Config.FAKE_LLM_LATENCY_MS
+        self.latency_jitter_ms = (
+            latency_jitter_ms if latency_jitter_ms is not None else Config.FAKE_LLM_LATENCY_JITTER_MS
+        )
+        self.ms_per_output_token = (
+            ms_per_output_token if ms_per_output_token is not None else Config.FAKE_LLM_MS_PER_OUTPUT_TOKEN
+        )
+        self.overload_rate = overload_rate if overload_rate is not None else Config.FAKE_LLM_OVERLOAD_RATE
+        self.malformed_rate = malformed_rate if malformed_rate is not None else Config.FAKE_LLM_MALFORMED_RATE
+        if seed is None and Config.FAKE_LLM_SEED is not None:
+            seed = int(Config.FAKE_LLM_SEED)
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.messages = _FakeMessages(self)
+
+        # Metrics
+        self.calls = 0
+        self.overloaded = 0
+        self.malformed = 0
+
+    def create_message(self, model: str, max_tokens: int, messages: List[Dict], **kwargs):
+        """Answer one messages.create call, sleeping for the simulated latency first."""
+        prompt = messages[-1]['content'] if messages else ''
+
+        with self._lock:
+            self.calls += 1
+            latency = max(0.0, self._rng.gauss(self.latency_ms, self.latency_jitter_ms))
+            failure = self._rng.random()
+            overload_status = self._rng.choice((429, 529))
+
+        if failure < self.overload_rate:
+            # Overloaded calls fail fast, like the real API
+            time.sleep(min(latency, self.latency_ms) / 1000 / 4)
+            with self._lock:
+                self.overloaded += 1
+            raise FakeAPIStatusError(overload_status)
+
+        text, is_json = self._respond(prompt)
+        if is_json and failure < self.overload_rate + self.malformed_rate:
+            with self._lock:
+                self.malformed += 1
+            text = text[:len(text) // 2]
+
+        output_tokens = min(max_tokens, len(text) // 4 + 1)
+        time.sleep((latency + output_tokens * self.ms_per_output_token) / 1000)
+
+        return SimpleNamespace(
+            id=f"msg_fake_{self.calls}",
+            model=model,
+            content=[SimpleNamespace(type='text', text=text)],
+            stop_reason='end_turn',
+            usage=SimpleNamespace(input_tokens=len(prompt) // 4 + 1, output_tokens=output_tokens)
+        )
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'calls': self.calls, 'overloaded': self.overloaded, 'malformed': self.malformed}
+
+    # ------------------------------------------------------------------ #
+    # Prompt-specific responses
+
+    def _respond(self, prompt: str) -> Tuple[str, bool]:
+        """Return (response text, whether it is JSON) for a pipeline prompt."""
+        if 'identify distinct topics' in prompt:
+            return json.dumps(self._topics(prompt), ensure_ascii=False), True
+        if prompt.startswith('Briefly summarize'):
+            pages = re.findall(r'"page": (\d+)', prompt)
+            span = f"{pages[0]}-{pages[-1]}" if pages else ''
+            return f"Las páginas {span} tratan sobre la reglamentación de farmacia.", False
+        if prompt.startswith('Analyze this pharmacy law content'):
+            return json.dumps(self._analysis(prompt), ensure_ascii=False), True
+        if prompt.startswith('Format this pharmacy content'):
+            return self._markdown(prompt), False
+        batch = re.match(r'Genera (\d+) preguntas', prompt)
+        if batch:
+            slots = re.findall(r'^(\d+)\. TIPO: (.+?) \| DIFICULTAD: (\w+)', prompt, re.MULTILINE)
+            questions = [
+                dict(slot=int(number), **self._question(prompt, 'única' not in type_label, int(number)))
+                for number, type_label, _ in slots
+            ]
+            return json.dumps({'questions': questions}, ensure_ascii=False), True
+        if prompt.startswith('Genera una pregunta'):
+            choose_all = 'TIPO DE PREGUNTA: Seleccionar todas' in prompt
+            return json.dumps(self._question(prompt, choose_all, 0), ensure_ascii=False), True
+        return "OK", False
+
+    @staticmethod
+    def _digest(prompt: str, salt: int = 0) -> int:
+        return int(hashlib.sha256(f"{salt}:{prompt}".encode()).hexdigest()[:8], 16)
+
+    @staticmethod
+    def _first_header(text: str, default: str) -> str:
+        match = re.search(r'HEADERS: ([^|\n"]+)', text)
+        return match.group(1).strip()[:80] if match else default
+
+    def _topics(self, prompt: str) -> Dict:
+        """Group the chunk's pages into topics of 1-4 consecutive pages."""
+        section = prompt.split('CURRENT PAGES TO ANALYZE:', 1)[-1].split('Return ONLY valid JSON', 1)[0]
+        try:
+            pages = json.loads(section)
+        except ValueError:
+            pages = [{'page': int(p), 'content': ''} for p in re.findall(r'"page": (\d+)', section)]
+
+        topics = []
+        i = 0
+        while i < len(pages):
+            length = 1 + self._digest(prompt, i) % 4
+            group = pages[i:i + length]
+            topics.append({
+                'topic_name': self._first_header(group[0]['content'], f"Tema de la página {group[0]['page']}"),
+                'start_page': group[0]['page'],
+                'end_page': group[-1]['page'],
+                'reasoning': 'Páginas consecutivas sobre el mismo tema'
+            })
+            i += length
+        return {'topics': topics}
+
+    def _analysis(self, prompt: str) -> Dict:
+        content = prompt.split('Return this exact structure:', 1)[0]
+        main_topic = self._first_header(content, 'Reglamentación de farmacia')
+        lines = [line.strip(' •') for line in content.splitlines() if line.startswith('  ')]
+        lines = [line for line in lines if len(line) > 10] or [main_topic]
+
+        return {
+            'main_topic': main_topic,
+            'subtopics': [line[:60] for line in lines[:3]],
+            'content_type': 'regulation',
+            'key_terms': [
+                {'term': line.split()[0], 'definition': line[:150], 'importance': 'high'}
+                for line in lines[:4]
+            ],
+            'exam_critical_points': [
+                {'point': line[:200], 'category': 'requirement'}
+                for line in lines[:5]
+            ],
+            'question_potential': {
+                'multiple_choice': 'high', 'true_false': 'medium', 'scenario_based': 'high', 'calculation': 'low'
+            },
+            'difficulty_level': ('basic', 'intermediate', 'advanced')[self._digest(prompt) % 3],
+            'regulatory_context': 'Ley 247 de 2004'
+        }
+
+    def _markdown(self, prompt: str) -> str:
+        structure = prompt.split('Use this structure:\n', 1)[-1].split('\n\n[Format', 1)[0]
+        bullets = [
+            f"- **{line.strip(' •')[:60]}**"
+            for line in prompt.splitlines() if line.startswith('  • ')
+        ]
+        body = "\n".join(bullets[:10]) or "- ⚖️ Contenido regulatorio del tema"
+        return f"{structure}\n\n## Puntos clave\n\n{body}\n\n⚠️ Revise los requisitos de la Ley 247.\n"
+
+    def _question(self, prompt: str, choose_all: bool, slot: int) -> Dict:
+        topic = re.search(r'^TEMA: (.+)$', prompt, re.MULTILINE)
+        topic_name = topic.group(1) if topic else 'farmacia'
+        n = self._digest(prompt, slot)
+        letters = 'ABCDE' if choose_all else 'ABCD'
+
+        if choose_all:
+            correct = sorted(self._rng_for(n).sample(letters, 2 + n % 2))
+            question_text = f"Sobre {topic_name}, ¿cuáles son correctas? (Seleccione todas las correctas)"
+        else:
+            correct = [letters[n % 4]]
+            question_text = f"Sobre {topic_name}, ¿cuál de las siguientes es correcta? ({slot or 1})"
+
+        return {
+            'question_text': question_text,
+            'options': [f"{letter}. Opción {letter} sobre {topic_name[:40]}" for letter in letters],
+            'correct_answer': ",".join(correct),
+            'explanation': f"Según la Ley 247 de 2004, la opción {', '.join(correct)} es la correcta.",
+            'key_terms': [{'term': topic_name[:40], 'definition': 'Término del tema'}]
+        }
+
+    @staticmethod
+    def _rng_for(n: int) -> random.Random:
+        return random.Random(n)
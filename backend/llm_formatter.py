@@ -1,16 +1,19 @@
 import logging
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
-from anthropic import Anthropic
 from config import Config
+from llm_cache import cached_completion
+from llm_client import create_client
 
 
 class ClaudeFormatter:
     def __init__(self, logger: Optional[logging.Logger] = None):
-        self.client = Anthropic(api_key=Config.ANTHROPIC_API_KEY)
+        self.client = create_client()
         self.model = Config.ANTHROPIC_MODEL
         # Use provided logger or create default
         self.logger = logger or logging.getLogger(__name__)
+        # Topics that got _basic_format instead of a model response
+        self.fallback_topics: List[str] = []
 
     def format_topic(self, topic_data: Dict, analysis: Dict) -> str:
         content_text = self._prepare_input(topic_data)
@@ -34,15 +37,15 @@ exam_focus: high
 [Format with proper headers, bold key terms, use ⚠️ for critical points, 💊 for drugs, ⚖️ for laws. Keep original language!]"""
 
         try:
-            response = self.client.messages.create(
-                model=self.model,
+            formatted = cached_completion(
+                self.client, self.model, prompt,
                 max_tokens=3000,
-                temperature=0.3,
-                messages=[{"role": "user", "content": prompt}]
+                temperature=0.3
             )
-            return response.content[0].text.strip()  # type: ignore
+            return formatted.strip()
         except Exception as e:
             self.logger.error(f"Format error: {e}")
+            self.fallback_topics.append(topic_data['topic'])
             return self._basic_format(topic_data, analysis)
 
     def _prepare_input(self, topic_data: Dict) -> str:
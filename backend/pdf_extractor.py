@@ -1,6 +1,20 @@
-from typing import Dict, List
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
 
 import fitz
+from config import Config
+
+
+def _extract_page_range(args: Tuple[str, int, int]) -> List[Dict]:
+    """Worker entry point: open a private copy of the PDF and extract pages [start, end)."""
+    pdf_path, start, end = args
+    extractor = PDFExtractor(pdf_path)
+    try:
+        return [extractor.extract_page(page_num) for page_num in range(start, end)]
+    finally:
+        extractor.close()
 
 
 class PDFExtractor:
@@ -9,46 +23,110 @@ class PDFExtractor:
         self.doc = fitz.open(pdf_path)
         self.total_pages = len(self.doc)
 
-    def extract_all(self) -> List[Dict]:
-        pages_data = []
+    def extract_all(self, workers: Optional[int] = None) -> List[Dict]:
+        """
+        Extract every page in page order.
+
+        Args:
+            workers: Number of worker processes (default: Config.EXTRACTION_WORKERS).
+                     Documents shorter than Config.PARALLEL_EXTRACTION_MIN_PAGES are
+                     always extracted in-process.
+        """
+        return list(self.iter_pages(workers))
+
+    def iter_pages(self, workers: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Lazily yield extracted pages in page order, so downstream stages can start
+        before the whole document has been extracted.
+
+        Args:
+            workers: Same as extract_all
+        """
+        if workers is None:
+            workers = Config.EXTRACTION_WORKERS
+
+        if workers > 1 and self.total_pages >= Config.PARALLEL_EXTRACTION_MIN_PAGES:
+            yield from self.iter_pages_parallel(workers)
+            return
+
         for page_num in range(self.total_pages):
-            page_data = self.extract_page(page_num)
-            pages_data.append(page_data)
-        return pages_data
+            yield self.extract_page(page_num)
+
+    def iter_pages_parallel(self, workers: int) -> Iterator[Dict]:
+        """
+        Extract pages across a process pool. Each worker opens its own fitz document
+        (fitz documents can't be shared between processes) and handles a contiguous
+        page range of at most Config.BATCH_SIZE pages. Ranges are yielded back in
+        page order as soon as each one (and every range before it) is done.
+
+        Only about one range per worker is in flight at a time: the next range is
+        submitted as each finished one is handed to the consumer, so a slow consumer
+        (e.g. LLM topic identification) holds back extraction instead of letting the
+        whole document pile up in memory. Ranges not yet started are cancelled if
+        the consumer stops early.
+        """
+        workers = max(1, min(workers, self.total_pages))
+        range_size = min(-(-self.total_pages // workers), Config.BATCH_SIZE)  # Ceiling division
+        ranges = [
+            (self.pdf_path, start, min(start + range_size, self.total_pages))
+            for start in range(0, self.total_pages, range_size)
+        ]
+
+        remaining = iter(ranges)
+        pool = ProcessPoolExecutor(max_workers=workers)
+        in_flight: Deque[Future] = deque(pool.submit(_extract_page_range, args) for args in islice(remaining, workers))
+        try:
+            while in_flight:
+                chunk = in_flight.popleft().result()
+                for args in islice(remaining, 1):
+                    in_flight.append(pool.submit(_extract_page_range, args))
+                yield from chunk
+        finally:
+            # Not via cancel_futures: that needs Python 3.9
+            for future in in_flight:
+                future.cancel()
+            pool.shutdown(wait=False)
 
     def extract_page(self, page_num: int) -> Dict:
+        """
+        Extract one page from a single layout pass.
+
+        The text page is built once with TEXTFLAGS_TEXT (no image blocks, so no image
+        bytes are copied into the dict) and full_text is rebuilt from the same lines,
+        matching what page.get_text() would return without laying the page out again.
+        """
         page = self.doc[page_num]
-        blocks = page.get_text("dict")["blocks"]
+        blocks = page.get_textpage(flags=fitz.TEXTFLAGS_TEXT).extractDICT()["blocks"]
 
         text_content = []
         headers = []
+        full_text_lines = []
 
         for block in blocks:
-            if block.get("type") == 0:
-                for line in block.get("lines", []):
-                    line_text = ""
-                    max_size = 0
-
-                    for span in line.get("spans", []):
-                        line_text += span.get("text", "")
-                        max_size = max(max_size, span.get("size", 0))
-
-                    line_text = line_text.strip()
-                    if line_text:
-                        is_header = max_size > 14 or (line_text.isupper() and len(line_text) > 3)
-                        if is_header:
-                            headers.append(line_text)
-                        text_content.append({
-                            "text": line_text,
-                            "size": max_size,
-                            "is_header": is_header
-                        })
+            if block["type"] != 0:
+                continue
+            for line in block["lines"]:
+                spans = line["spans"]
+                raw_text = "".join(span["text"] for span in spans)
+                full_text_lines.append(raw_text)
+
+                line_text = raw_text.strip()
+                if line_text:
+                    max_size = max((span["size"] for span in spans), default=0)
+                    is_header = max_size > 14 or (line_text.isupper() and len(line_text) > 3)
+                    if is_header:
+                        headers.append(line_text)
+                    text_content.append({
+                        "text": line_text,
+                        "size": max_size,
+                        "is_header": is_header
+                    })
 
         return {
             "page": page_num + 1,
             "content": text_content,
             "headers": headers,
-            "full_text": page.get_text()
+            "full_text": "".join(f"{line}\n" for line in full_text_lines)
         }
 
     def close(self):
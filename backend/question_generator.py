@@ -9,14 +9,16 @@ import logging
 import os
 import random
 import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Dict, List, Optional
-
-import anthropic
+from typing import Dict, List, Optional, Tuple
 
 from config import Config
 from database import get_database
 from database_models import Document, Question
+from llm_client import create_client
+from rate_limiter import create_message
 
 
 class QuestionGenerator:
@@ -29,7 +31,7 @@ class QuestionGenerator:
         Args:
             logger: Optional logger instance for progress tracking
         """
-        self.client = anthropic.Anthropic(api_key=Config.ANTHROPIC_API_KEY)
+        self.client = create_client()
         self.logger = logger or logging.getLogger(__name__)
         self.db = get_database(Config.DATABASE_PATH)
 
@@ -135,7 +137,8 @@ IMPORTANTE: Responde SOLO con el JSON, sin texto adicional."""
         # Call Claude API with retries
         for attempt in range(Config.MAX_RETRIES):
             try:
-                response = self.client.messages.create(
+                response = create_message(
+                    self.client,
                     model=Config.ANTHROPIC_MODEL,
                     max_tokens=2000,
                     temperature=0.7,
@@ -143,20 +146,11 @@ IMPORTANTE: Responde SOLO con el JSON, sin texto adicional."""
                 )
 
                 # Extract JSON from response
-                content = response.content[0].text.strip()
-
-                # Remove markdown code blocks if present
-                if content.startswith('```'):
-                    content = content.split('```')[1]
-                    if content.startswith('json'):
-                        content = content[4:].strip()
-
-                question_data = json.loads(content)
+                question_data = self._parse_json_response(response.content[0].text)
 
-                # Validate required fields
-                required = ['question_text', 'options', 'correct_answer', 'explanation']
-                if not all(field in question_data for field in required):
-                    self.logger.warning(f"Missing required fields in generated question (attempt {attempt + 1})")
+                # Same checks as batched questions
+                if not self._validate_question(question_data, question_type):
+                    self.logger.warning(f"Invalid generated question (attempt {attempt + 1})")
                     if attempt < Config.MAX_RETRIES - 1:
                         time.sleep(Config.RETRY_DELAY)
                         continue
@@ -180,31 +174,185 @@ IMPORTANTE: Responde SOLO con el JSON, sin texto adicional."""
 
         return None
 
-    def generate_questions_for_topic(
+    def _parse_json_response(self, content: str):
+        """Parse a JSON response, removing markdown code blocks if present."""
+        content = content.strip()
+        if content.startswith('```'):
+            content = content.split('```')[1]
+            if content.startswith('json'):
+                content = content[4:].strip()
+        return json.loads(content)
+
+    def _validate_question(self, question_data: Dict, question_type: str) -> bool:
+        """
+        Check one generated question on its own.
+
+        Required fields must be present, and the correct answer must name options
+        that exist: exactly one for single_answer, two or more for choose_all.
+        """
+        required = ['question_text', 'options', 'correct_answer', 'explanation']
+        if not isinstance(question_data, dict) or not all(question_data.get(field) for field in required):
+            return False
+
+        options = question_data['options']
+        if not isinstance(options, list) or len(options) < 4:
+            return False
+
+        letters = {str(option)[0] for option in options if str(option)}
+        answers = [a.strip() for a in str(question_data['correct_answer']).split(',') if a.strip()]
+        if not answers or not all(a in letters for a in answers):
+            return False
+
+        return len(answers) == 1 if question_type == 'single_answer' else len(answers) >= 2
+
+    def _build_batch_prompt(self, topic: Dict, slots: List[Tuple[str, str]]) -> str:
+        """Prompt for several questions that share one copy of the topic context."""
+        slot_lines = "\n".join(
+            f"{i}. TIPO: "
+            f"{'Respuesta única (4 opciones)' if question_type == 'single_answer' else 'Seleccionar todas las correctas (4-5 opciones, 2-3 correctas)'}"
+            f" | DIFICULTAD: {difficulty}"
+            for i, (question_type, difficulty) in enumerate(slots, 1)
+        )
+
+        return f"""Genera {len(slots)} preguntas de selección múltiple para el examen de reválida de farmacia de Puerto Rico.
+
+TEMA: {topic['main_topic']}
+SUBTEMAS: {', '.join(topic.get('subtopics', []))}
+CONTEXTO REGULATORIO: {topic.get('regulatory_context', 'Ley 247 de 2004')}
+
+TÉRMINOS CLAVE DISPONIBLES:
+{json.dumps(topic.get('key_terms', []), indent=2, ensure_ascii=False)}
+
+PUNTOS CRÍTICOS PARA EL EXAMEN:
+{json.dumps(topic.get('exam_critical_points', []), indent=2, ensure_ascii=False)}
+
+PREGUNTAS A GENERAR (respeta el tipo y la dificultad de cada una):
+{slot_lines}
+
+INSTRUCCIONES:
+1. Todas las preguntas DEBEN estar completamente en ESPAÑOL
+2. Usa términos y conceptos específicos del tema, sin repetir la misma pregunta
+3. Respuesta única: una sola respuesta correcta. Seleccionar todas: 2-3 respuestas correctas (indica 'Seleccione todas las correctas')
+4. Distractores plausibles basados en:
+   - Conceptos erróneos comunes
+   - Términos similares del mismo tema
+   - Variaciones numéricas (ej: 1000 vs 1500 horas)
+5. Explicación DEBE citar la ley específica (Ley 247, artículos, etc.)
+6. Dificultad:
+   - basic: Recuerdo directo de hechos
+   - intermediate: Aplicación de conceptos
+   - advanced: Análisis de escenarios complejos
+
+Format your response as JSON, with one entry per requested question and "slot" set to its number above:
+{{
+  "questions": [
+    {{
+      "slot": 1,
+      "question_text": "The question text in Spanish",
+      "options": ["A. Option 1", "B. Option 2", "C. Option 3", "D. Option 4"],
+      "correct_answer": "A (or A,C,D for choose-all)",
+      "explanation": "Detailed explanation with law citation",
+      "key_terms": [{{"term": "Term", "definition": "Definition"}}]
+    }}
+  ]
+}}
+
+IMPORTANTE: Responde SOLO con el JSON, sin texto adicional."""
+
+    def generate_question_batch(
         self,
         topic: Dict,
-        topic_id: int,
-        document_id: int,
-        doc_filename: str,
-        num_questions: int = None
-    ) -> List[Question]:
+        slots: List[Tuple[str, str]],
+        doc_context: str
+    ) -> List[Optional[Dict]]:
         """
-        Generate multiple questions for a single topic.
+        Generate several questions for one topic in a single API call.
+
+        Each returned item is validated on its own; only the slots that failed are
+        sent again on the next attempt.
 
         Args:
             topic: Topic data from analysis
-            topic_id: Topic number (1-indexed)
-            document_id: Database document ID
-            doc_filename: Document filename for context
-            num_questions: Number of questions to generate (default from config)
+            slots: (question_type, difficulty) for each question
+            doc_context: Document filename for context
 
         Returns:
-            List of Question model instances
+            Question dictionaries aligned with slots (None where generation failed)
         """
-        if num_questions is None:
-            num_questions = Config.QUESTIONS_PER_TOPIC
+        results: List[Optional[Dict]] = [None] * len(slots)
+        pending = list(range(len(slots)))
+
+        for attempt in range(Config.MAX_RETRIES):
+            batch = [slots[i] for i in pending]
+            items = []
+
+            try:
+                response = create_message(
+                    self.client,
+                    model=Config.ANTHROPIC_MODEL,
+                    max_tokens=min(8000, 1500 * len(batch)),
+                    temperature=0.7,
+                    messages=[{"role": "user", "content": self._build_batch_prompt(topic, batch)}]
+                )
+                data = self._parse_json_response(response.content[0].text)
+                items = data.get('questions', []) if isinstance(data, dict) else data
+
+            except json.JSONDecodeError as e:
+                self.logger.warning(f"JSON parse error in batch of {len(batch)} (attempt {attempt + 1}): {e}")
+
+            except Exception as e:
+                self.logger.error(f"API error in batch of {len(batch)} (attempt {attempt + 1}): {e}")
+
+            # Match items back to slots by their slot number, or by position if the model dropped it
+            by_slot = {
+                item['slot']: item for item in items
+                if isinstance(item, dict) and isinstance(item.get('slot'), int)
+            }
+            if not by_slot:
+                by_slot = dict(enumerate(items, 1))
+
+            still_pending = []
+            for position, slot_idx in enumerate(pending, 1):
+                question_type, _ = slots[slot_idx]
+                item = by_slot.get(position)
+                if item is not None and self._validate_question(item, question_type):
+                    item.pop('slot', None)
+                    results[slot_idx] = item
+                else:
+                    still_pending.append(slot_idx)
+
+            if not still_pending:
+                break
+
+            self.logger.warning(
+                f"{len(still_pending)}/{len(pending)} questions in batch failed validation (attempt {attempt + 1})"
+            )
+            pending = still_pending
+            if attempt < Config.MAX_RETRIES - 1:
+                time.sleep(Config.RETRY_DELAY)
+
+        return results
+
+    def plan_topic_slots(
+        self,
+        num_questions: int,
+        rng: Optional[random.Random] = None
+    ) -> List[Tuple[str, str]]:
+        """
+        Decide the (question_type, difficulty) of every question for one topic.
+
+        Type split follows Config.SINGLE_ANSWER_RATIO and difficulty split follows
+        Config.DIFFICULTY_DISTRIBUTION; difficulties are shuffled across types.
+
+        Args:
+            num_questions: Number of questions for the topic
+            rng: Random source (pass a seeded Random for a reproducible plan)
+
+        Returns:
+            List of (question_type, difficulty) tuples, single-answer slots first
+        """
+        rng = rng or random.Random()
 
-        questions = []
         single_answer_count = int(num_questions * Config.SINGLE_ANSWER_RATIO)
         choose_all_count = num_questions - single_answer_count
 
@@ -219,97 +367,197 @@ IMPORTANTE: Responde SOLO con el JSON, sin texto adicional."""
             ['intermediate'] * intermediate_count +
             ['advanced'] * advanced_count
         )
-        random.shuffle(difficulties)
-
-        # Generate single-answer questions
-        for i in range(single_answer_count):
-            difficulty = difficulties[i]
-            self.logger.info(
-                f"  Generating question {i + 1}/{num_questions} "
-                f"(type: single_answer, difficulty: {difficulty})"
-            )
+        rng.shuffle(difficulties)
 
-            question_data = self.generate_question(
-                topic, 'single_answer', difficulty, doc_filename
-            )
+        types = ['single_answer'] * single_answer_count + ['choose_all'] * choose_all_count
+        return list(zip(types, difficulties))
 
-            if question_data:
-                question = Question(
-                    document_id=document_id,
-                    topic_id=topic_id,
-                    topic_name=topic['main_topic'],
-                    question_type='single_answer',
-                    difficulty=difficulty,
-                    question_text=question_data['question_text'],
-                    options_json=json.dumps(question_data['options'], ensure_ascii=False),
-                    correct_answer=question_data['correct_answer'],
-                    explanation=question_data['explanation'],
-                    key_terms_json=json.dumps(
-                        question_data.get('key_terms', []),
-                        ensure_ascii=False
-                    ),
-                    regulatory_context=topic.get('regulatory_context', ''),
-                    pages=topic.get('pages', ''),
-                    times_seen=0,
-                    times_correct=0
-                )
-                questions.append(question)
-            else:
-                self.logger.warning(f"  Failed to generate question {i + 1}")
-
-        # Generate choose-all questions
-        for i in range(choose_all_count):
-            idx = single_answer_count + i
-            difficulty = difficulties[idx]
-            self.logger.info(
-                f"  Generating question {idx + 1}/{num_questions} "
-                f"(type: choose_all, difficulty: {difficulty})"
-            )
+    def _build_question(
+        self,
+        topic: Dict,
+        topic_id: int,
+        document_id: int,
+        question_type: str,
+        difficulty: str,
+        question_data: Dict
+    ) -> Question:
+        """Turn a validated API response into a Question model instance."""
+        return Question(
+            document_id=document_id,
+            topic_id=topic_id,
+            topic_name=topic['main_topic'],
+            question_type=question_type,
+            difficulty=difficulty,
+            question_text=question_data['question_text'],
+            options_json=json.dumps(question_data['options'], ensure_ascii=False),
+            correct_answer=question_data['correct_answer'],
+            explanation=question_data['explanation'],
+            key_terms_json=json.dumps(
+                question_data.get('key_terms', []),
+                ensure_ascii=False
+            ),
+            regulatory_context=topic.get('regulatory_context', ''),
+            pages=topic.get('pages', ''),
+            times_seen=0,
+            times_correct=0
+        )
 
-            question_data = self.generate_question(
-                topic, 'choose_all', difficulty, doc_filename
-            )
+    def _generate_slots(
+        self,
+        topic: Dict,
+        topic_id: int,
+        document_id: int,
+        doc_filename: str,
+        slot_indices: List[int],
+        slots: List[Tuple[str, str]]
+    ) -> List[Optional[Question]]:
+        """
+        Generate the questions for a group of planned slots (runs on a worker thread).
+
+        A single slot uses generate_question; larger groups share one API call
+        through generate_question_batch.
 
+        Returns:
+            Question instances aligned with slot_indices (None where generation failed)
+        """
+        group = [slots[i] for i in slot_indices]
+        self.logger.info(
+            f"  [Topic {topic_id}] Generating questions {slot_indices[0] + 1}-{slot_indices[-1] + 1}/{len(slots)} "
+            f"({', '.join(f'{question_type}/{difficulty}' for question_type, difficulty in group)})"
+        )
+
+        if len(group) == 1:
+            results = [self.generate_question(topic, group[0][0], group[0][1], doc_filename)]
+        else:
+            results = self.generate_question_batch(topic, group, doc_filename)
+
+        questions: List[Optional[Question]] = []
+        for slot_idx, (question_type, difficulty), question_data in zip(slot_indices, group, results):
             if question_data:
-                question = Question(
-                    document_id=document_id,
-                    topic_id=topic_id,
-                    topic_name=topic['main_topic'],
-                    question_type='choose_all',
-                    difficulty=difficulty,
-                    question_text=question_data['question_text'],
-                    options_json=json.dumps(question_data['options'], ensure_ascii=False),
-                    correct_answer=question_data['correct_answer'],
-                    explanation=question_data['explanation'],
-                    key_terms_json=json.dumps(
-                        question_data.get('key_terms', []),
-                        ensure_ascii=False
-                    ),
-                    regulatory_context=topic.get('regulatory_context', ''),
-                    pages=topic.get('pages', ''),
-                    times_seen=0,
-                    times_correct=0
+                questions.append(
+                    self._build_question(topic, topic_id, document_id, question_type, difficulty, question_data)
                 )
-                questions.append(question)
             else:
-                self.logger.warning(f"  Failed to generate question {idx + 1}")
-
+                self.logger.warning(f"  [Topic {topic_id}] Failed to generate question {slot_idx + 1}")
+                questions.append(None)
         return questions
 
+    def _slot_batches(self, num_slots: int, batch_size: int) -> List[List[int]]:
+        """Split slot indices into consecutive groups of at most batch_size."""
+        batch_size = max(1, batch_size)
+        return [list(range(i, min(i + batch_size, num_slots))) for i in range(0, num_slots, batch_size)]
+
+    def generate_questions_for_topic(
+        self,
+        topic: Dict,
+        topic_id: int,
+        document_id: int,
+        doc_filename: str,
+        num_questions: int = None,
+        concurrency: int = None,
+        rng: Optional[random.Random] = None,
+        batch_size: int = None
+    ) -> List[Question]:
+        """
+        Generate multiple questions for a single topic.
+
+        Args:
+            topic: Topic data from analysis
+            topic_id: Topic number (1-indexed)
+            document_id: Database document ID
+            doc_filename: Document filename for context
+            num_questions: Number of questions to generate (default from config)
+            concurrency: Parallel API calls (default: Config.QUESTION_GENERATION_CONCURRENCY)
+            rng: Random source for the type/difficulty plan
+            batch_size: Questions per API call (default: Config.QUESTION_BATCH_SIZE)
+
+        Returns:
+            List of Question model instances, in plan order
+        """
+        if num_questions is None:
+            num_questions = Config.QUESTIONS_PER_TOPIC
+        if concurrency is None:
+            concurrency = Config.QUESTION_GENERATION_CONCURRENCY
+
+        if batch_size is None:
+            batch_size = Config.QUESTION_BATCH_SIZE
+
+        slots = self.plan_topic_slots(num_questions, rng)
+
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            futures = [
+                pool.submit(self._generate_slots, topic, topic_id, document_id, doc_filename, slot_indices, slots)
+                for slot_indices in self._slot_batches(len(slots), batch_size)
+            ]
+            results = [question for future in futures for question in future.result()]
+
+        return [question for question in results if question is not None]
+
+    def _save_topic_questions(
+        self,
+        topic: Dict,
+        topic_idx: int,
+        questions: List[Question],
+        planned: int,
+        stats: Dict
+    ) -> None:
+        """Persist one topic's questions and fold them into the running stats."""
+        self.logger.info(f"\n📚 Topic {topic_idx}/{stats['total_topics']}: {topic['main_topic']}")
+        self.logger.info(f"   Pages: {topic.get('pages', 'N/A')}")
+
+        stats['failed_generations'] += planned - len(questions)
+
+        if questions:
+            # Type and difficulty counts in one pass
+            by_type: Counter = Counter()
+            by_difficulty: Counter = Counter()
+            for q in questions:
+                by_type[q.question_type] += 1
+                by_difficulty[q.difficulty] += 1
+
+            self.db.insert_questions(questions)
+
+            topic_stats = {'total': len(questions)}
+            for question_type in stats['questions_by_type']:
+                topic_stats[question_type] = by_type[question_type]
+                stats['questions_by_type'][question_type] += by_type[question_type]
+            for difficulty in stats['questions_by_difficulty']:
+                topic_stats[difficulty] = by_difficulty[difficulty]
+                stats['questions_by_difficulty'][difficulty] += by_difficulty[difficulty]
+
+            stats['questions_by_topic'][topic['main_topic']] = topic_stats
+            stats['total_questions_generated'] += len(questions)
+
+            self.logger.info(f"   ✅ Generated {len(questions)} questions")
+        else:
+            self.logger.warning(f"   ⚠️  No questions generated for this topic")
+
     def generate_all_questions(
         self,
         file_id: str,
-        questions_per_topic: int = None
+        questions_per_topic: int = None,
+        concurrency: int = None,
+        seed: Optional[int] = None,
+        batch_size: int = None
     ) -> Dict[str, any]:
         """
         Generate questions for all topics in a document.
 
+        Every (topic, type, difficulty) slot is planned up front, grouped into
+        batches that share one API call, and spread over a shared worker pool. Topics are saved in topic order as
+        soon as all of their slots have finished.
+
         Args:
             file_id: Document file identifier
             questions_per_topic: Override default questions per topic
+            concurrency: Parallel API calls (default: Config.QUESTION_GENERATION_CONCURRENCY)
+            seed: Seed for the type/difficulty plan; the same seed always produces
+                  the same plan and insertion order
+            batch_size: Questions per API call (default: Config.QUESTION_BATCH_SIZE)
 
         Returns:
-            Dictionary with generation statistics
+            Dictionary with generation statistics (topic_errors maps each topic
+            whose generation raised to the error; its questions count as failed)
         """
         self.logger.info(f"\n{'='*60}")
         self.logger.info(f"Question Generation Started: {file_id}")
@@ -348,46 +596,65 @@ IMPORTANTE: Responde SOLO con el JSON, sin texto adicional."""
             'questions_by_topic': {},
             'questions_by_difficulty': {'basic': 0, 'intermediate': 0, 'advanced': 0},
             'questions_by_type': {'single_answer': 0, 'choose_all': 0},
-            'failed_generations': 0
+            'failed_generations': 0,
+            'topic_errors': {}
         }
 
-        for topic_idx, topic in enumerate(analysis['topics'], 1):
-            self.logger.info(f"\n📚 Topic {topic_idx}/{stats['total_topics']}: {topic['main_topic']}")
-            self.logger.info(f"   Pages: {topic.get('pages', 'N/A')}")
-
-            # Generate questions
-            questions = self.generate_questions_for_topic(
-                topic, topic_idx, document_id, doc_filename, questions_per_topic
-            )
+        if questions_per_topic is None:
+            questions_per_topic = Config.QUESTIONS_PER_TOPIC
+        if concurrency is None:
+            concurrency = Config.QUESTION_GENERATION_CONCURRENCY
+        if batch_size is None:
+            batch_size = Config.QUESTION_BATCH_SIZE
+
+        # Plan every slot before any work starts, so a seed fully determines the plan
+        rng = random.Random(seed)
+        topics = analysis['topics']
+        topic_slots = [self.plan_topic_slots(questions_per_topic, rng) for _ in topics]
+        self.logger.info(
+            f"Planned {sum(len(slots) for slots in topic_slots)} questions across {len(topics)} topics "
+            f"({concurrency} parallel API calls, up to {batch_size} questions per call)"
+        )
 
-            # Calculate statistics before saving (while objects still have attributes)
-            if questions:
-                topic_stats = {
-                    'total': len(questions),
-                    'single_answer': sum(1 for q in questions if q.question_type == 'single_answer'),
-                    'choose_all': sum(1 for q in questions if q.question_type == 'choose_all'),
-                    'basic': sum(1 for q in questions if q.difficulty == 'basic'),
-                    'intermediate': sum(1 for q in questions if q.difficulty == 'intermediate'),
-                    'advanced': sum(1 for q in questions if q.difficulty == 'advanced')
-                }
-
-                # Save questions to database
-                with self.db.session() as session:
-                    for question in questions:
-                        session.add(question)
-                    session.commit()
-
-                stats['questions_by_topic'][topic['main_topic']] = topic_stats
-                stats['total_questions_generated'] += len(questions)
-                stats['questions_by_type']['single_answer'] += topic_stats['single_answer']
-                stats['questions_by_type']['choose_all'] += topic_stats['choose_all']
-                stats['questions_by_difficulty']['basic'] += topic_stats['basic']
-                stats['questions_by_difficulty']['intermediate'] += topic_stats['intermediate']
-                stats['questions_by_difficulty']['advanced'] += topic_stats['advanced']
-
-                self.logger.info(f"   ✅ Generated {len(questions)} questions")
-            else:
-                self.logger.warning(f"   ⚠️  No questions generated for this topic")
+        results: List[List[Optional[Question]]] = [[None] * len(slots) for slots in topic_slots]
+        remaining = [len(slots) for slots in topic_slots]
+        next_to_save = 0
+
+        def save_finished_topics() -> None:
+            # Save in topic order (not completion order) so IDs follow the plan
+            nonlocal next_to_save
+            while next_to_save < len(topics) and remaining[next_to_save] == 0:
+                questions = [q for q in results[next_to_save] if q is not None]
+                self._save_topic_questions(
+                    topics[next_to_save], next_to_save + 1, questions, len(topic_slots[next_to_save]), stats
+                )
+                next_to_save += 1
+
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            futures = {}
+            for topic_idx, (topic, slots) in enumerate(zip(topics, topic_slots)):
+                for slot_indices in self._slot_batches(len(slots), batch_size):
+                    future = pool.submit(
+                        self._generate_slots, topic, topic_idx + 1, document_id, doc_filename, slot_indices, slots
+                    )
+                    futures[future] = (topic_idx, slot_indices)
+
+            for future in as_completed(futures):
+                topic_idx, slot_indices = futures[future]
+                try:
+                    generated = future.result()
+                except Exception as e:
+                    # Counted as failed generations; the other topics carry on
+                    topic_name = topics[topic_idx]['main_topic']
+                    self.logger.error(f"  [Topic {topic_idx + 1}] Generation failed: {e}", exc_info=True)
+                    stats['topic_errors'][topic_name] = str(e)
+                    generated = [None] * len(slot_indices)
+                for slot_idx, question in zip(slot_indices, generated):
+                    results[topic_idx][slot_idx] = question
+                remaining[topic_idx] -= len(slot_indices)
+                save_finished_topics()
+
+        save_finished_topics()
 
         # Final summary
         self.logger.info(f"\n{'='*60}")
@@ -399,6 +666,8 @@ IMPORTANTE: Responde SOLO con el JSON, sin texto adicional."""
         self.logger.info(f"By Difficulty: Basic: {stats['questions_by_difficulty']['basic']}, "
                         f"Intermediate: {stats['questions_by_difficulty']['intermediate']}, "
                         f"Advanced: {stats['questions_by_difficulty']['advanced']}")
+        if stats['topic_errors']:
+            self.logger.warning(f"Topics with errors: {', '.join(stats['topic_errors'])}")
         self.logger.info(f"{'='*60}\n")
 
         stats['success'] = True
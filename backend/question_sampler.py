@@ -0,0 +1,279 @@
+"""
+Indexed question sampling for study sessions.
+
+start_session used to pick questions with ORDER BY random() LIMIT n (and, in
+review mode, ORDER BY an accuracy expression), which scans and sorts every
+matching question on each session start. Instead:
+
+- Candidate question IDs are cached per document as compact arrays, one per
+  (topic, difficulty, question type) bucket. A random sample is drawn in
+  memory by picking positions across the matching buckets, so the cost
+  depends on the sample size rather than the size of the question bank. The
+  cache is reloaded when the document's question version changes (a primary
+  key lookup; triggers bump it on any insert, delete or bucket column change,
+  from any process or connection), or when a sampled question turns out to
+  have been deleted. The same buckets answer filtered question counts without
+  COUNT(*) and the per-document stats breakdown.
+- Review mode reads the weakest questions from a partial expression index on
+  (document_id, times_correct * 1.0 / times_seen) WHERE times_seen > 0, so it
+  is an index range scan with no sort and never divides by zero. Remaining
+  slots are filled with a random sample of the other questions.
+"""
+import bisect
+import hashlib
+import logging
+import random
+import threading
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from database_models import ACCURACY_EXPRESSION, SEEN_CONDITION, Question, question_version
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+BucketKey = Tuple[str, str, str]  # (topic_name, difficulty, question_type)
+
+
+class _DocumentBuckets:
+    """Question IDs of one document, grouped by (topic, difficulty, question type)."""
+
+    def __init__(self, version: Optional[int], buckets: Dict[BucketKey, array]):
+        self.version = version
+        self.buckets = buckets
+        self.stats: Optional[Tuple[Dict, str]] = None  # Built on first request
+
+
+class QuestionSampler:
+    """Draws random and review-ordered question samples without sorting the question bank."""
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        """
+        Initialize the sampler.
+
+        Args:
+            rng: Random source (pass a seeded Random for reproducible samples)
+        """
+        self.rng = rng or random.Random()
+        self._cache: Dict[int, _DocumentBuckets] = {}
+        self._lock = threading.Lock()
+
+    def invalidate(self, document_id: Optional[int] = None) -> None:
+        """Drop cached buckets for one document (or all of them)."""
+        with self._lock:
+            if document_id is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(document_id, None)
+
+    def _buckets(self, session: Session, document_id: int) -> _DocumentBuckets:
+        """Cached buckets for the document, reloaded if its questions changed since."""
+        version = question_version(session, document_id)
+
+        with self._lock:
+            cached = self._cache.get(document_id)
+            if cached is not None and cached.version == version:
+                return cached
+
+        buckets: Dict[BucketKey, array] = {}
+        rows = (
+            session.query(Question.id, Question.topic_name, Question.difficulty, Question.question_type)
+            .filter(Question.document_id == document_id)
+            .yield_per(5000)
+        )
+        for question_id, *key in rows:
+            bucket = buckets.get(tuple(key))
+            if bucket is None:
+                bucket = buckets[tuple(key)] = array('q')
+            bucket.append(question_id)
+
+        loaded = _DocumentBuckets(version, buckets)
+        with self._lock:
+            self._cache[document_id] = loaded
+        logger.debug(f"Loaded {sum(len(b) for b in buckets.values())} question IDs for document {document_id}")
+        return loaded
+
+    @staticmethod
+    def _matching(
+        buckets: _DocumentBuckets,
+        topics: Optional[Sequence[str]],
+        difficulty: Optional[str],
+        question_type: Optional[str] = None
+    ) -> List[array]:
+        """ID arrays of the buckets passing the filters."""
+        topic_set = set(topics) if topics else None
+        return [
+            ids for (topic_name, bucket_difficulty, bucket_type), ids in buckets.buckets.items()
+            if (topic_set is None or topic_name in topic_set)
+            and (difficulty is None or bucket_difficulty == difficulty)
+            and (question_type is None or bucket_type == question_type)
+        ]
+
+    def count(
+        self,
+        session: Session,
+        document_id: int,
+        topics: Optional[Sequence[str]] = None,
+        difficulty: Optional[str] = None,
+        question_type: Optional[str] = None
+    ) -> int:
+        """
+        Number of questions of a document matching the filters, from the cached buckets.
+
+        Args:
+            session: Database session
+            document_id: Document to count
+            topics: Restrict to these topic names (None = all)
+            difficulty: Restrict to this difficulty (None = all)
+            question_type: Restrict to this question type (None = all)
+
+        Returns:
+            Question count
+        """
+        buckets = self._buckets(session, document_id)
+        return sum(len(ids) for ids in self._matching(buckets, topics, difficulty, question_type))
+
+    def stats(self, session: Session, document_id: int) -> Tuple[Dict, str]:
+        """
+        Question counts of a document by topic, difficulty and type.
+
+        Built once per bucket load, so repeated calls cost one version lookup.
+
+        Args:
+            session: Database session
+            document_id: Document to summarize
+
+        Returns:
+            (stats dict with total, by_topic, by_difficulty and by_type lists,
+            ETag derived from the document's question version in the database,
+            so every process tags the same question set alike)
+        """
+        buckets = self._buckets(session, document_id)
+        if buckets.stats is None:
+            by_topic: Dict[str, int] = {}
+            by_difficulty: Dict[str, int] = {}
+            by_type: Dict[str, int] = {}
+            for (topic_name, difficulty, question_type), ids in buckets.buckets.items():
+                by_topic[topic_name] = by_topic.get(topic_name, 0) + len(ids)
+                by_difficulty[difficulty] = by_difficulty.get(difficulty, 0) + len(ids)
+                by_type[question_type] = by_type.get(question_type, 0) + len(ids)
+
+            stats = {
+                'total': sum(by_topic.values()),
+                'by_topic': [{'topic': k, 'count': by_topic[k]} for k in sorted(by_topic)],
+                'by_difficulty': [{'difficulty': k, 'count': by_difficulty[k]} for k in sorted(by_difficulty)],
+                'by_type': [{'type': k, 'count': by_type[k]} for k in sorted(by_type)]
+            }
+            etag = hashlib.sha1(f'{document_id}:{buckets.version}'.encode()).hexdigest()
+            buckets.stats = (stats, etag)
+        return buckets.stats
+
+    def _random_ids(
+        self,
+        buckets: _DocumentBuckets,
+        count: int,
+        topics: Optional[Sequence[str]],
+        difficulty: Optional[str],
+        exclude: frozenset = frozenset()
+    ) -> List[int]:
+        """Sample up to count distinct IDs across the matching buckets."""
+        selected = self._matching(buckets, topics, difficulty)
+
+        # Positions over the concatenation of the selected buckets
+        offsets = []
+        total = 0
+        for ids in selected:
+            offsets.append(total)
+            total += len(ids)
+
+        wanted = min(total, count + len(exclude))
+        picked = []
+        for position in self.rng.sample(range(total), wanted):
+            i = bisect.bisect_right(offsets, position) - 1
+            question_id = selected[i][position - offsets[i]]
+            if question_id not in exclude:
+                picked.append(question_id)
+                if len(picked) == count:
+                    break
+        return picked
+
+    def _review_ids(
+        self,
+        session: Session,
+        document_id: int,
+        count: int,
+        topics: Optional[Sequence[str]],
+        difficulty: Optional[str]
+    ) -> List[int]:
+        """Lowest-accuracy previously seen questions, read in index order."""
+        query = (
+            session.query(Question.id)
+            .filter(Question.document_id == document_id, text(SEEN_CONDITION))
+            .filter(text(f'{ACCURACY_EXPRESSION} < 1.0'))
+        )
+        if topics:
+            query = query.filter(Question.topic_name.in_(topics))
+        if difficulty:
+            query = query.filter(Question.difficulty == difficulty)
+        rows = query.order_by(text(ACCURACY_EXPRESSION)).limit(count).all()
+        return [row[0] for row in rows]
+
+    def sample(
+        self,
+        session: Session,
+        document_id: int,
+        count: int,
+        topics: Optional[Sequence[str]] = None,
+        difficulty: Optional[str] = None,
+        include_review: bool = False
+    ) -> List[Question]:
+        """
+        Pick questions for a new session.
+
+        Args:
+            session: Database session
+            document_id: Document to draw from
+            count: Number of questions wanted
+            topics: Restrict to these topic names (None = all)
+            difficulty: Restrict to this difficulty (None = all)
+            include_review: Put missed questions first, lowest accuracy first
+
+        Returns:
+            Up to count Question objects, in session order
+        """
+        for attempt in range(2):
+            buckets = self._buckets(session, document_id)
+
+            ids = self._review_ids(session, document_id, count, topics, difficulty) if include_review else []
+            if len(ids) < count:
+                ids += self._random_ids(buckets, count - len(ids), topics, difficulty, exclude=frozenset(ids))
+            if not ids:
+                return []
+
+            by_id = {q.id: q for q in session.query(Question).filter(Question.id.in_(ids)).all()}
+            if len(by_id) == len(ids) or attempt == 1:
+                return [by_id[question_id] for question_id in ids if question_id in by_id]
+
+            # Some sampled questions were deleted since the buckets were loaded
+            self.invalidate(document_id)
+        return []
+
+
+# Global sampler instance
+_sampler_instance = None
+_sampler_lock = threading.Lock()
+
+
+def get_question_sampler() -> QuestionSampler:
+    """
+    Get or create the process-wide question sampler.
+
+    Returns:
+        QuestionSampler instance
+    """
+    global _sampler_instance
+    with _sampler_lock:
+        if _sampler_instance is None:
+            _sampler_instance = QuestionSampler()
+    return _sampler_instance
@@ -0,0 +1,144 @@
+"""
+Full-text search over the question bank.
+
+Backed by the questions_fts FTS5 table (see database_models), which indexes
+question_text, explanation, key_terms_json and regulatory_context with accent
+and case folding, so "prescripcion" finds "Prescripción" and "Ley 247" finds
+the citation anywhere in the bank. Results are ranked by BM25 with matches in
+the question wording, key terms and citations weighted above the explanation.
+
+User input is never passed to MATCH as-is: it is split into words, each word
+is quoted (so FTS5 operators and punctuation can't cause syntax errors), common
+Spanish stopwords are dropped, and the last word is matched as a prefix so
+partially typed words already find results.
+"""
+import re
+from typing import Dict, List, Optional
+
+from config import Config
+from database_models import QUESTION_SEARCH_TABLE
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+
+# BM25 weights, in QUESTION_SEARCH_COLUMNS order
+COLUMN_WEIGHTS = (4.0, 1.0, 3.0, 3.0)
+
+HIGHLIGHT_OPEN = '<mark>'
+HIGHLIGHT_CLOSE = '</mark>'
+
+SPANISH_STOPWORDS = frozenset({
+    'a', 'al', 'como', 'con', 'de', 'del', 'el', 'en', 'es', 'la', 'las', 'le', 'lo', 'los',
+    'o', 'para', 'por', 'que', 'se', 'si', 'su', 'sus', 'un', 'una', 'y'
+})
+
+MIN_PREFIX_LENGTH = 3  # Shorter trailing words match exactly (a 1-2 letter prefix matches most of the bank)
+
+_WORD = re.compile(r'\w+')
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """
+    Turn free-text user input into a safe FTS5 MATCH expression.
+
+    Args:
+        query: Search text as typed by the user
+
+    Returns:
+        MATCH expression requiring every word, or None if the input has no words
+    """
+    words = _WORD.findall(query.lower())
+    terms = [word for word in words if word not in SPANISH_STOPWORDS] or words
+    if not terms:
+        return None
+
+    quoted = [f'"{term}"' for term in terms]
+    if len(terms[-1]) >= MIN_PREFIX_LENGTH:
+        quoted[-1] += '*'
+    return ' '.join(quoted)
+
+
+def search_questions(
+    session: Session,
+    query: str,
+    document_id: Optional[int] = None,
+    topic: Optional[str] = None,
+    limit: int = Config.SEARCH_DEFAULT_LIMIT
+) -> List[Dict]:
+    """
+    Best-matching questions for the query, best first.
+
+    Args:
+        session: Database session
+        query: Search text as typed by the user
+        document_id: Only search this document's questions
+        topic: Only search questions of this topic
+        limit: Maximum number of results
+
+    Returns:
+        List of dicts with the question's id, document_id, topic_name, difficulty,
+        question_type and question_text, a highlighted snippet of the best-matching
+        field, and its score (lower is better)
+    """
+    match = build_match_query(query)
+    if match is None:
+        return []
+
+    join = filters = ''
+    params = {'match': match, 'limit': limit}
+    if document_id is not None or topic:
+        join = f' JOIN questions AS q ON q.id = {QUESTION_SEARCH_TABLE}.rowid'
+    if document_id is not None:
+        filters += ' AND q.document_id = :document_id'
+        params['document_id'] = document_id
+    if topic:
+        filters += ' AND q.topic_name = :topic'
+        params['topic'] = topic
+
+    # Rank on the FTS index alone and only then read the winning questions:
+    # joining first would carry every match's columns through the sort
+    weights = ', '.join(str(weight) for weight in COLUMN_WEIGHTS)
+    rows = session.execute(text(f"""
+        WITH ranked AS (
+            SELECT {QUESTION_SEARCH_TABLE}.rowid AS id, bm25({QUESTION_SEARCH_TABLE}, {weights}) AS score
+            FROM {QUESTION_SEARCH_TABLE}{join}
+            WHERE {QUESTION_SEARCH_TABLE} MATCH :match{filters}
+            ORDER BY score
+            LIMIT :limit
+        )
+        SELECT q.id, q.document_id, q.topic_name, q.difficulty, q.question_type, q.question_text, ranked.score
+        FROM ranked
+        JOIN questions AS q ON q.id = ranked.id
+        ORDER BY ranked.score
+    """), params).all()
+    if not rows:
+        return []
+
+    # Snippets of just those rows (a rowid lookup per result)
+    snippets = dict(session.execute(
+        text(f"""
+            SELECT rowid, snippet({QUESTION_SEARCH_TABLE}, -1, :open, :close, '…', :tokens)
+            FROM {QUESTION_SEARCH_TABLE}
+            WHERE {QUESTION_SEARCH_TABLE} MATCH :match AND rowid IN :ids
+        """).bindparams(bindparam('ids', expanding=True)),
+        {
+            'match': match,
+            'open': HIGHLIGHT_OPEN,
+            'close': HIGHLIGHT_CLOSE,
+            'tokens': Config.SEARCH_SNIPPET_TOKENS,
+            'ids': [row.id for row in rows]
+        }
+    ).all())
+
+    return [
+        {
+            'id': row.id,
+            'document_id': row.document_id,
+            'topic_name': row.topic_name,
+            'difficulty': row.difficulty,
+            'question_type': row.question_type,
+            'question_text': row.question_text,
+            'snippet': snippets.get(row.id),
+            'score': round(row.score, 4)
+        }
+        for row in rows
+    ]
@@ -0,0 +1,209 @@
+"""
+Client-side rate limiting for Anthropic API calls.
+
+Every call goes through create_message(), which waits on a process-wide pair of
+token buckets (requests/minute and tokens/minute) before sending, and retries
+429 (rate limited) and 529 (overloaded) responses with exponential backoff plus
+jitter. Token usage is reserved up front from a rough estimate and settled
+against the real usage reported in the response.
+"""
+import logging
+import random
+import threading
+import time
+from typing import Any, Dict
+
+import anthropic
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = {429, 529}
+
+
+class RateLimiter:
+    """Token-bucket limiter on requests per minute and tokens per minute."""
+
+    def __init__(self, requests_per_minute: int = None, tokens_per_minute: int = None):
+        """
+        Initialize the limiter with full buckets.
+
+        Args:
+            requests_per_minute: Request budget (default: Config.ANTHROPIC_REQUESTS_PER_MINUTE)
+            tokens_per_minute: Token budget (default: Config.ANTHROPIC_TOKENS_PER_MINUTE)
+        """
+        self.requests_per_minute = requests_per_minute or Config.ANTHROPIC_REQUESTS_PER_MINUTE
+        self.tokens_per_minute = tokens_per_minute or Config.ANTHROPIC_TOKENS_PER_MINUTE
+
+        self._requests = float(self.requests_per_minute)
+        self._tokens = float(self.tokens_per_minute)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.acquired = 0
+        self.waiting = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.throttled_responses = 0
+        self.retries = 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._requests = min(self.requests_per_minute, self._requests + elapsed * self.requests_per_minute / 60)
+        self._tokens = min(self.tokens_per_minute, self._tokens + elapsed * self.tokens_per_minute / 60)
+
+    def acquire(self, tokens: int) -> float:
+        """
+        Block until one request and `tokens` tokens are available, then take them.
+
+        A single request larger than the whole token budget waits for a full
+        bucket rather than forever.
+
+        Returns:
+            Seconds spent waiting
+        """
+        needed = min(tokens, self.tokens_per_minute)
+        start = time.monotonic()
+
+        with self._lock:
+            self.waiting += 1
+        try:
+            while True:
+                with self._lock:
+                    self._refill()
+                    if self._requests >= 1 and self._tokens >= needed:
+                        self._requests -= 1
+                        self._tokens -= needed
+                        break
+                    wait = max(
+                        (1 - self._requests) * 60 / self.requests_per_minute,
+                        (needed - self._tokens) * 60 / self.tokens_per_minute
+                    )
+                time.sleep(min(max(wait, 0.01), 1.0))
+        finally:
+            waited = time.monotonic() - start
+            with self._lock:
+                self.waiting -= 1
+                self.acquired += 1
+                self.total_wait_seconds += waited
+                self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+        return waited
+
+    def settle(self, reserved: int, used: int) -> None:
+        """Return over-reserved tokens (or take the shortfall) once real usage is known."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.tokens_per_minute, self._tokens + min(reserved, self.tokens_per_minute) - used)
+
+    def record_throttle(self) -> None:
+        with self._lock:
+            self.throttled_responses += 1
+            self.retries += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue-wait and throttling metrics for this process."""
+        with self._lock:
+            self._refill()
+            return {
+                'requests_per_minute': self.requests_per_minute,
+                'tokens_per_minute': self.tokens_per_minute,
+                'available_requests': round(self._requests, 2),
+                'available_tokens': int(self._tokens),
+                'acquired': self.acquired,
+                'waiting': self.waiting,
+                'total_wait_seconds': round(self.total_wait_seconds, 3),
+                'avg_wait_seconds': round(self.total_wait_seconds / self.acquired, 3) if self.acquired else 0.0,
+                'max_wait_seconds': round(self.max_wait_seconds, 3),
+                'throttled_responses': self.throttled_responses,
+                'retries': self.retries
+            }
+
+
+# Global limiter instance
+_limiter_instance = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    Get or create the process-wide rate limiter.
+
+    Returns:
+        RateLimiter instance
+    """
+    global _limiter_instance
+    with _limiter_lock:
+        if _limiter_instance is None:
+            _limiter_instance = RateLimiter()
+    return _limiter_instance
+
+
+def estimate_tokens(messages: list, max_tokens: int) -> int:
+    """Rough token reservation: ~4 characters per input token plus the full output budget."""
+    input_chars = sum(len(m.get('content', '')) for m in messages if isinstance(m.get('content'), str))
+    return input_chars // 4 + max_tokens
+
+
+def _is_retryable(error: Exception) -> bool:
+    # Duck-typed so the offline fake backend's errors are retried the same way
+    if not isinstance(error, anthropic.APIStatusError) and not hasattr(error, 'status_code'):
+        return False
+    return error.status_code in RETRYABLE_STATUS_CODES
+
+
+def _backoff_delay(attempt: int, error: Exception) -> float:
+    """Exponential backoff with full jitter, honoring a retry-after header when given."""
+    retry_after = None
+    response = getattr(error, 'response', None)
+    if response is not None:
+        try:
+            retry_after = float(response.headers.get('retry-after', ''))
+        except (TypeError, ValueError):
+            retry_after = None
+
+    delay = min(Config.RATE_LIMIT_BACKOFF_MAX, Config.RATE_LIMIT_BACKOFF_BASE * (2 ** attempt))
+    delay = random.uniform(0, delay)
+    return max(delay, retry_after or 0.0)
+
+
+def create_message(client, **kwargs):
+    """
+    Rate-limited client.messages.create.
+
+    Waits on the global limiter, sends the request and retries 429/529 responses
+    up to Config.RATE_LIMIT_MAX_RETRIES times. Any other error propagates.
+
+    Args:
+        client: Anthropic (or fake) client
+        **kwargs: Passed through to client.messages.create
+
+    Returns:
+        The API response
+    """
+    limiter = get_rate_limiter()
+    reserved = estimate_tokens(kwargs.get('messages', []), kwargs.get('max_tokens', 0))
+
+    for attempt in range(Config.RATE_LIMIT_MAX_RETRIES + 1):
+        waited = limiter.acquire(reserved)
+        if waited > 1:
+            logger.info(f"Rate limiter queued request for {waited:.1f}s")
+
+        try:
+            response = client.messages.create(**kwargs)
+        except Exception as e:
+            if not _is_retryable(e) or attempt == Config.RATE_LIMIT_MAX_RETRIES:
+                raise
+            limiter.record_throttle()
+            delay = _backoff_delay(attempt, e)
+            logger.warning(f"API returned {e.status_code}, retrying in {delay:.1f}s (attempt {attempt + 1})")
+            time.sleep(delay)
+            continue
+
+        usage = getattr(response, 'usage', None)
+        if usage is not None:
+            limiter.settle(reserved, usage.input_tokens + usage.output_tokens)
+        return response
@@ -0,0 +1,220 @@
+"""
+Spaced-repetition review queue (SM-2).
+
+Each question reviewed in a review session gets a spaced_repetition card whose
+next_review_date is moved by SpacedRepetition.update_after_review. The due queue
+is read in next_review_date order from review_due_index with a LIMIT, so asking
+for the next N due cards reads about N index entries no matter how many cards a
+document has. Review sessions top the due cards up with questions that have no
+card yet, so a new document can be studied from the first day.
+
+Dates are days in the configured timezone (see timezone_utils), matching what
+the user sees as "today".
+"""
+from datetime import date
+from typing import Dict, List, Optional
+
+from config import Config
+from database_models import Question, SpacedRepetition
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from timezone_utils import now_in_timezone
+
+REVIEW_SESSION_TYPE = 'review'
+
+
+def review_today() -> date:
+    """Today's date in the configured timezone."""
+    return now_in_timezone().date()
+
+
+def _due_filter(statement, today: date, document_id: Optional[int]):
+    statement = statement.where(SpacedRepetition.next_review_date <= today)
+    if document_id is not None:
+        statement = statement.where(SpacedRepetition.document_id == document_id)
+    return statement
+
+
+def due_cards(
+    session: Session,
+    today: date,
+    document_id: Optional[int] = None,
+    limit: int = Config.REVIEW_DUE_DEFAULT_LIMIT
+) -> List[Dict]:
+    """
+    The next due cards, most overdue first.
+
+    Args:
+        session: Database session
+        today: Cards scheduled on or before this date are due
+        document_id: Only this document's cards (default: all documents)
+        limit: Maximum number of cards
+
+    Returns:
+        List of dicts with the card's question_id, document_id, topic_name,
+        difficulty, question_type, question_text, next_review_date (ISO date),
+        days_overdue, interval_days, repetitions, ease_factor and accuracy_rate
+    """
+    rows = session.execute(
+        _due_filter(
+            select(
+                SpacedRepetition.question_id,
+                SpacedRepetition.document_id,
+                SpacedRepetition.next_review_date,
+                SpacedRepetition.interval_days,
+                SpacedRepetition.repetitions,
+                SpacedRepetition.ease_factor,
+                SpacedRepetition.total_reviews,
+                SpacedRepetition.correct_reviews,
+                Question.topic_name,
+                Question.difficulty,
+                Question.question_type,
+                Question.question_text
+            ).join(Question, Question.id == SpacedRepetition.question_id),
+            today, document_id
+        )
+        .order_by(SpacedRepetition.next_review_date, SpacedRepetition.id)
+        .limit(limit)
+    ).all()
+
+    return [
+        {
+            'question_id': row.question_id,
+            'document_id': row.document_id,
+            'topic_name': row.topic_name,
+            'difficulty': row.difficulty,
+            'question_type': row.question_type,
+            'question_text': row.question_text,
+            'next_review_date': row.next_review_date.isoformat(),
+            'days_overdue': (today - row.next_review_date).days,
+            'interval_days': row.interval_days,
+            'repetitions': row.repetitions,
+            'ease_factor': round(row.ease_factor, 2),
+            'accuracy_rate': round(row.correct_reviews / row.total_reviews * 100, 1) if row.total_reviews else 0.0
+        }
+        for row in rows
+    ]
+
+
+def count_due(session: Session, today: date, document_id: Optional[int] = None) -> int:
+    """
+    Number of due cards (counted on the index, without reading the cards).
+
+    Joined to questions like due_cards and plan_review, so cards whose question
+    is gone aren't counted.
+
+    Args:
+        session: Database session
+        today: Cards scheduled on or before this date are due
+        document_id: Only this document's cards (default: all documents)
+
+    Returns:
+        Count of cards with next_review_date on or before today
+    """
+    return session.execute(
+        _due_filter(
+            select(func.count())
+            .select_from(SpacedRepetition)
+            .join(Question, Question.id == SpacedRepetition.question_id),
+            today, document_id
+        )
+    ).scalar()
+
+
+def plan_review(session: Session, document_id: int, num_questions: int, today: date) -> List[int]:
+    """
+    Question IDs for a review session: due cards first (most overdue first),
+    then questions never reviewed, in document order.
+
+    Args:
+        session: Database session
+        document_id: Document being reviewed
+        num_questions: Session length
+        today: Cards scheduled on or before this date are due
+
+    Returns:
+        Up to num_questions question IDs
+    """
+    # Joined to questions: foreign keys aren't enforced, so a card can outlive its question
+    question_ids = list(session.execute(
+        _due_filter(
+            select(SpacedRepetition.question_id).join(Question, Question.id == SpacedRepetition.question_id),
+            today, document_id
+        )
+        .order_by(SpacedRepetition.next_review_date, SpacedRepetition.id)
+        .limit(num_questions)
+    ).scalars())
+
+    if len(question_ids) < num_questions:
+        question_ids += session.execute(
+            select(Question.id)
+            .outerjoin(SpacedRepetition, SpacedRepetition.question_id == Question.id)
+            .where(Question.document_id == document_id, SpacedRepetition.id.is_(None))
+            .order_by(Question.id)
+            .limit(num_questions - len(question_ids))
+        ).scalars().all()
+
+    return question_ids
+
+
+def answer_quality(is_correct: bool) -> int:
+    """SM-2 recall quality (0-5) of an answer, when the client doesn't grade itself."""
+    return Config.REVIEW_QUALITY_CORRECT if is_correct else Config.REVIEW_QUALITY_INCORRECT
+
+
+def record_review(
+    session: Session,
+    question_id: int,
+    document_id: int,
+    quality: int,
+    today: date
+) -> SpacedRepetition:
+    """
+    Apply one review to the question's card, creating the card on its first review.
+
+    Args:
+        session: Database session (the answer's transaction)
+        question_id: Reviewed question
+        document_id: The question's document
+        quality: Quality of recall (0-5), see SpacedRepetition.update_after_review
+        today: Date of the review
+
+    Returns:
+        The updated card (flushed with the session)
+    """
+    # Create-if-missing in one statement, so two first reviews can't collide on question_id
+    session.execute(
+        sqlite_insert(SpacedRepetition.__table__)
+        .values(
+            question_id=question_id, document_id=document_id, ease_factor=2.5, interval_days=1,
+            repetitions=0, next_review_date=today, total_reviews=0, correct_reviews=0
+        )
+        .on_conflict_do_nothing(index_elements=['question_id'])
+    )
+    card = session.execute(
+        select(SpacedRepetition).where(SpacedRepetition.question_id == question_id)
+    ).scalar_one()
+    card.update_after_review(quality, today)
+    return card
+
+
+def parse_quality(value) -> Optional[int]:
+    """
+    Validate a client-supplied recall quality.
+
+    Args:
+        value: Request value (None when not given)
+
+    Returns:
+        The quality, or None if not given
+
+    Raises:
+        ValueError: If the value isn't an integer from 0 to 5
+    """
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, int) or not 0 <= value <= 5:
+        raise ValueError(f"quality must be an integer from 0 to 5, got {value!r}")
+    return value
+
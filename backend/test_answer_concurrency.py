@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Concurrency test for POST /api/sessions/<id>/answer.
+
+Several threads answer the same questions of one session at once. Every
+submission must be counted: times_seen, times_correct and the session's
+correct_answers have to match the recorded attempts exactly (no lost updates).
+
+Usage:
+    python test_answer_concurrency.py
+    python -m pytest test_answer_concurrency.py
+"""
+import sys
+import threading
+
+from app_testing import app_database
+from database import Database
+from database_models import Document, Question, SessionQuestion, StudySession, UserAttempt
+from timezone_utils import to_iso_string
+
+NUM_THREADS = 8
+ANSWERS_PER_THREAD = 25
+NUM_QUESTIONS = 3
+
+
+def seed_session(db: Database) -> tuple:
+    """A session planning NUM_QUESTIONS questions; returns (session_id, question_ids)."""
+    with db.session() as session:
+        doc = Document(file_id='answers', filename='answers.pdf', total_topics=1,
+                       total_pages=10, analysis_path='unused')
+        session.add(doc)
+        session.flush()
+
+        questions = [
+            Question(document_id=doc.id, topic_id=1, topic_name='Recetas', question_type='single_answer',
+                     difficulty='basic', question_text=f'Pregunta {i}', options_json='["A. Uno", "B. Dos"]',
+                     correct_answer='A', explanation='Ley 247', key_terms_json='["receta"]')
+            for i in range(NUM_QUESTIONS)
+        ]
+        session.add_all(questions)
+        study_session = StudySession(document_id=doc.id, session_type='practice', start_time=to_iso_string(),
+                                     total_questions=NUM_QUESTIONS, correct_answers=0)
+        session.add(study_session)
+        session.flush()
+
+        session.add_all([
+            SessionQuestion(session_id=study_session.id, position=i, question_id=q.id,
+                            payload_json=f'{{"id": {q.id}}}')
+            for i, q in enumerate(questions)
+        ])
+        return study_session.id, [q.id for q in questions]
+
+
+def test_concurrent_answers():
+    """Concurrent submissions are all counted."""
+    print("=" * 60)
+    print("Testing Concurrent Answer Submissions")
+    print("=" * 60)
+
+    with app_database('answers.db') as (app_module, db):
+        session_id, question_ids = seed_session(db)
+
+        failures = []
+        barrier = threading.Barrier(NUM_THREADS)
+
+        def answer(thread_idx: int):
+            client = app_module.app.test_client()
+            barrier.wait()
+            for i in range(ANSWERS_PER_THREAD):
+                question_id = question_ids[(thread_idx + i) % NUM_QUESTIONS]
+                selected = 'A' if (thread_idx + i) % 3 else 'B'
+                response = client.post(f'/api/sessions/{session_id}/answer', json={
+                    'question_id': question_id, 'selected_answer': selected, 'time_spent_seconds': 5
+                })
+                body = response.get_json()
+                if response.status_code != 200 or body['is_correct'] != (selected == 'A'):
+                    failures.append((response.status_code, body))
+
+        threads = [threading.Thread(target=answer, args=(i,)) for i in range(NUM_THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert not failures, f"Failed submissions: {failures[:3]}"
+        total = NUM_THREADS * ANSWERS_PER_THREAD
+        print(f"✓ {total} answers from {NUM_THREADS} threads accepted")
+
+        with db.session() as session:
+            attempts = session.query(UserAttempt).all()
+            correct = sum(1 for a in attempts if a.is_correct)
+            assert len(attempts) == total
+
+            questions = session.query(Question).all()
+            assert sum(q.times_seen for q in questions) == total
+            assert sum(q.times_correct for q in questions) == correct
+            for q in questions:
+                q_attempts = [a for a in attempts if a.question_id == q.id]
+                assert q.times_seen == len(q_attempts)
+                assert q.times_correct == sum(1 for a in q_attempts if a.is_correct)
+
+            study_session = session.get(StudySession, session_id)
+            assert study_session.correct_answers == correct
+            first_question_attempts = sum(1 for a in attempts if a.question_id == question_ids[0])
+        print(f"✓ No lost updates: times_seen={total}, times_correct=correct_answers={correct}")
+
+        # Answer payload and next question come back as before
+        client = app_module.app.test_client()
+        body = client.post(f'/api/sessions/{session_id}/answer', json={
+            'question_id': question_ids[0], 'selected_answer': 'A'
+        }).get_json()
+        assert body['key_terms'] == ['receta'] and body['next_question'] == {'id': question_ids[1]}
+        assert client.post(f'/api/sessions/{session_id}/answer', json={
+            'question_id': 999999, 'selected_answer': 'A'
+        }).status_code == 404
+        assert client.post('/api/sessions/999999/answer', json={
+            'question_id': question_ids[0], 'selected_answer': 'A'
+        }).status_code == 404
+        with db.session() as session:
+            assert session.get(Question, question_ids[0]).times_seen == first_question_attempts + 1
+        print("✓ Response payload, 404s, and no counting for unknown sessions")
+    print()
+
+
+if __name__ == '__main__':
+    try:
+        test_concurrent_answers()
+    except AssertionError as e:
+        print(f"❌ FAILED: {e}")
+        sys.exit(1)
+    print("✅ ALL TESTS PASSED")
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests for POST /api/maintenance/clear-user-data.
+
+Seeds two documents with sessions, plans and attempts, clears one document's
+data and then everything, and checks the reported row counts against what
+is left in the database.
+
+Usage:
+    python test_clear_user_data.py
+    python -m pytest test_clear_user_data.py
+"""
+import sys
+
+from app_testing import app_database
+from database import Database
+from database_models import Document, Question, SessionQuestion, StudySession, UserAttempt
+from timezone_utils import to_iso_string
+
+QUESTIONS_PER_DOCUMENT = 4
+
+
+def seed_document(db: Database, file_id: str, answered: int) -> int:
+    """A document with one session that answered its first `answered` questions; returns the document ID."""
+    with db.session() as session:
+        doc = Document(file_id=file_id, filename=f'{file_id}.pdf', total_topics=1,
+                       total_pages=10, analysis_path='unused')
+        session.add(doc)
+        session.flush()
+
+        questions = [
+            Question(document_id=doc.id, topic_id=1, topic_name='Recetas', question_type='single_answer',
+                     difficulty='basic', question_text=f'Pregunta {i}', options_json='["A. Uno", "B. Dos"]',
+                     correct_answer='A', explanation='Ley 247', times_seen=1 if i < answered else 0,
+                     times_correct=1 if i < answered else 0)
+            for i in range(QUESTIONS_PER_DOCUMENT)
+        ]
+        session.add_all(questions)
+        study_session = StudySession(document_id=doc.id, session_type='practice', start_time=to_iso_string(),
+                                     total_questions=QUESTIONS_PER_DOCUMENT, correct_answers=answered)
+        session.add(study_session)
+        session.flush()
+
+        session.add_all([
+            SessionQuestion(session_id=study_session.id, position=i, question_id=q.id, payload_json='{}')
+            for i, q in enumerate(questions)
+        ])
+        session.add_all([
+            UserAttempt(question_id=q.id, session_id=study_session.id, selected_answer='A', is_correct=True)
+            for q in questions[:answered]
+        ])
+        return doc.id
+
+
+def table_counts(db: Database, document_id: int) -> dict:
+    """Rows left for one document."""
+    with db.session() as session:
+        question_ids = [row[0] for row in session.query(Question.id).filter_by(document_id=document_id)]
+        session_ids = [row[0] for row in session.query(StudySession.id).filter_by(document_id=document_id)]
+        return {
+            'questions': len(question_ids),
+            'seen': sum(row[0] for row in session.query(Question.times_seen).filter_by(document_id=document_id)),
+            'attempts': session.query(UserAttempt).filter(UserAttempt.question_id.in_(question_ids)).count(),
+            'session_questions': session.query(SessionQuestion).filter(SessionQuestion.session_id.in_(session_ids)).count(),
+            'sessions': len(session_ids)
+        }
+
+
+def test_clear_user_data():
+    """Scoped and global clears delete the right rows and report them."""
+    print("=" * 60)
+    print("Testing Clear User Data")
+    print("=" * 60)
+
+    with app_database('clear.db') as (app_module, db):
+        first = seed_document(db, 'first', answered=3)
+        second = seed_document(db, 'second', answered=2)
+
+        client = app_module.app.test_client()
+        url = '/api/maintenance/clear-user-data'
+        assert client.post(url, json={}).status_code == 400
+        assert client.post(url, json={'confirm': True, 'file_id': 'missing'}).status_code == 404
+        print("✓ Confirmation required; unknown file_id is a 404")
+
+        body = client.post(url, json={'confirm': True, 'file_id': 'first'}).get_json()
+        assert body['scope'] == 'first'
+        assert body['deleted'] == {'attempts': 3, 'session_questions': QUESTIONS_PER_DOCUMENT, 'sessions': 1, 'review_cards': 0}
+        assert body['questions_reset'] == 3 and body['elapsed_ms'] >= 0
+        assert table_counts(db, first) == {
+            'questions': QUESTIONS_PER_DOCUMENT, 'seen': 0, 'attempts': 0, 'session_questions': 0, 'sessions': 0
+        }
+        assert table_counts(db, second) == {
+            'questions': QUESTIONS_PER_DOCUMENT, 'seen': 2, 'attempts': 2,
+            'session_questions': QUESTIONS_PER_DOCUMENT, 'sessions': 1
+        }
+        print(f"✓ Scoped clear: {body['deleted']}, {body['questions_reset']} questions reset, other document intact")
+
+        body = client.post(url, json={'confirm': True}).get_json()
+        assert body['scope'] == 'all'
+        assert body['deleted'] == {'attempts': 2, 'session_questions': QUESTIONS_PER_DOCUMENT, 'sessions': 1, 'review_cards': 0}
+        assert body['questions_reset'] == 2
+        assert table_counts(db, second)['seen'] == 0
+        print(f"✓ Global clear: {body['deleted']}, only questions with stats rewritten")
+    print()
+
+
+if __name__ == '__main__':
+    try:
+        test_clear_user_data()
+    except AssertionError as e:
+        print(f"❌ FAILED: {e}")
+        sys.exit(1)
+    print("✅ ALL TESTS PASSED")
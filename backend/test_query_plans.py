@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Query-plan regression tests for the hot endpoints.
+
+Exercises each endpoint against a seeded throwaway database while recording
+every SQL statement it sends, then runs EXPLAIN QUERY PLAN on each recorded
+statement (with its actual parameters). A statement whose plan reads a table
+without an index (a bare "SCAN <table>") fails the test, so dropping an index
+or rewriting a query into an unindexable shape is caught here.
+
+Usage:
+    python test_query_plans.py              # Also prints every plan
+    python -m pytest test_query_plans.py
+"""
+import sys
+from typing import Dict, List, Tuple
+
+from app_testing import app_database
+from database import Database
+from database_models import (
+    Document,
+    SessionQuestion,
+    StudySession,
+    UserAttempt,
+    attempt_session_index,
+    question_bucket_index,
+    question_listing_index,
+    review_accuracy_index,
+    review_due_index,
+    session_history_index,
+)
+from sqlalchemy import event
+from timezone_utils import to_iso_string
+
+TOPICS = ['Recetas', 'Controlados', 'Etiquetado']
+DIFFICULTIES = ['basic', 'intermediate', 'advanced']
+QUESTIONS_PER_DOCUMENT = 60
+
+# Indexes designed for specific endpoint queries; each must be chosen by at least one of them
+QUERY_INDEXES = (
+    question_listing_index, question_bucket_index, review_accuracy_index,
+    attempt_session_index, session_history_index, review_due_index
+)
+
+
+def seed(db: Database) -> None:
+    """Two documents with questions, and a finished session with attempts on the first."""
+    for file_id in ('plans', 'other'):
+        with db.session() as session:
+            doc = Document(file_id=file_id, filename=f'{file_id}.pdf', total_topics=len(TOPICS),
+                           total_pages=10, analysis_path='unused')
+            session.add(doc)
+            session.flush()
+            document_id = doc.id
+        db.insert_questions(
+            {
+                'document_id': document_id,
+                'topic_id': i % len(TOPICS),
+                'topic_name': TOPICS[i % len(TOPICS)],
+                'question_type': 'single_answer' if i % 4 else 'choose_all',
+                'difficulty': DIFFICULTIES[i % len(DIFFICULTIES)],
+                'question_text': f'Pregunta {i}',
+                'options_json': '["A. Uno", "B. Dos"]',
+                'correct_answer': 'A',
+                'explanation': 'Ley 247',
+                'times_seen': i % 5,
+                'times_correct': i % 3 if i % 5 else 0
+            }
+            for i in range(QUESTIONS_PER_DOCUMENT)
+        )
+
+    with db.session() as session:
+        study_session = StudySession(document_id=1, session_type='practice', start_time=to_iso_string(),
+                                     end_time=to_iso_string(), total_questions=5, correct_answers=3,
+                                     score_percentage=60.0)
+        session.add(study_session)
+        session.flush()
+        session.add_all([
+            SessionQuestion(session_id=study_session.id, position=i, question_id=i + 1, payload_json='{}')
+            for i in range(5)
+        ])
+        session.add_all([
+            UserAttempt(question_id=i + 1, session_id=study_session.id, selected_answer='A', is_correct=i < 3)
+            for i in range(5)
+        ])
+
+
+def exercise_endpoints(client) -> None:
+    """Hit every hot endpoint the way the frontend does."""
+    page = client.get('/api/questions/plans?limit=10').get_json()
+    client.get(f"/api/questions/plans?limit=10&cursor={page['next_cursor']}&fields=id,question_text")
+    client.get('/api/questions/plans?limit=10&offset=20')
+    client.get('/api/questions/plans?topic=Recetas&difficulty=basic&type=single_answer')
+    client.get('/api/questions/plans/stats')
+    client.get('/api/questions/single/7')
+    client.get('/api/questions/search?q=pregunta')
+    client.get('/api/questions/search?q=pregunta&file_id=plans&topic=Recetas')
+
+    for body in (
+        {'file_id': 'plans', 'session_type': 'practice', 'num_questions': 10},
+        {'file_id': 'plans', 'session_type': 'study', 'num_questions': 5, 'topics': ['Recetas'], 'difficulty': 'basic'},
+        {'file_id': 'plans', 'session_type': 'practice', 'num_questions': 8, 'include_review': True},
+        {'file_id': 'plans', 'session_type': 'review', 'num_questions': 6}
+    ):
+        started = client.post('/api/sessions/start', json=body).get_json()
+        session_id = started['session_id']
+        question = started['first_question']
+        for _ in range(3):
+            answered = client.post(f'/api/sessions/{session_id}/answer', json={
+                'question_id': question['id'], 'selected_answer': 'A', 'time_spent_seconds': 5
+            }).get_json()
+            question = answered['next_question']
+
+    client.get('/api/review/due?file_id=plans&limit=5')
+    client.get('/api/review/due')
+    client.get(f'/api/sessions/{session_id}/results')
+    client.get('/api/sessions/1/results')
+    client.get('/api/sessions/history')
+    client.get('/api/sessions/history?type=practice&limit=5')
+    client.post('/api/maintenance/clear-user-data', json={'confirm': True, 'file_id': 'other'})
+
+
+def full_scans(plan: List[Tuple]) -> List[str]:
+    """Plan steps that read a whole table without an index (scans of materialized CTEs/subqueries don't count)."""
+    materialized = {
+        detail.split(' ', 1)[1] for *_, detail in plan
+        if detail.startswith(('MATERIALIZE ', 'CO-ROUTINE '))
+    }
+    return [
+        detail for *_, detail in plan
+        if detail.startswith('SCAN ') and 'INDEX' not in detail and 'CONSTANT ROW' not in detail
+        and detail[len('SCAN '):] not in materialized
+    ]
+
+
+def record_plans(db: Database, client) -> Dict[str, List[Tuple]]:
+    """EXPLAIN QUERY PLAN of every statement the endpoints run, keyed by SQL."""
+    statements: Dict[str, tuple] = {}
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(('SELECT', 'UPDATE', 'DELETE', 'WITH')) and not executemany:
+            statements.setdefault(statement, parameters)
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        exercise_endpoints(client)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+
+    with db.engine.connect() as conn:
+        return {
+            statement: conn.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters).fetchall()
+            for statement, parameters in statements.items()
+        }
+
+
+def test_query_plans():
+    """No endpoint query falls back to a full table scan."""
+    print("=" * 60)
+    print("Testing Query Plans of Endpoint Queries")
+    print("=" * 60)
+
+    with app_database('plans.db') as (app_module, db):
+        seed(db)
+
+        plans = record_plans(db, app_module.app.test_client())
+
+    assert len(plans) >= 15, f"Only {len(plans)} statements recorded"
+    regressions = {}
+    for statement, plan in plans.items():
+        if __name__ == '__main__':
+            print(' '.join(statement.split())[:150])
+            for *_, detail in plan:
+                print(f"    {detail}")
+        scans = full_scans(plan)
+        if scans:
+            regressions[' '.join(statement.split())] = scans
+
+    assert not regressions, "Full table scans:\n" + "\n".join(
+        f"  {scans} <- {statement}" for statement, scans in regressions.items()
+    )
+    print(f"✓ {len(plans)} distinct statements, none scans a whole table")
+
+    used = {detail for plan in plans.values() for *_, detail in plan}
+    unused = [index.name for index in QUERY_INDEXES if not any(f' {index.name} ' in f'{d} ' for d in used)]
+    assert not unused, f"Indexes no query uses: {unused}"
+    print(f"✓ Each of the {len(QUERY_INDEXES)} query indexes is used")
+    print()
+
+
+if __name__ == '__main__':
+    try:
+        test_query_plans()
+    except AssertionError as e:
+        print(f"❌ FAILED: {e}")
+        sys.exit(1)
+    print("✅ ALL TESTS PASSED")
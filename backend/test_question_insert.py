@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for Database.insert_questions, the bulk persistence path for generated questions.
+
+Checks that the returned IDs line up with the input order across batch
+boundaries, that Question instances and plain dicts can be mixed, and that
+unset columns get their model defaults.
+
+Usage:
+    python test_question_insert.py
+    python -m pytest test_question_insert.py
+"""
+import os
+import sys
+import tempfile
+
+from database import Database
+from database_models import Base, Document, Question
+
+NUM_QUESTIONS = 1234
+BATCH_SIZE = 500
+
+
+def make_row(document_id: int, i: int) -> dict:
+    """Minimal question columns; everything else is left to the defaults."""
+    return {
+        'document_id': document_id,
+        'topic_id': i % 7,
+        'topic_name': f'Tema {i % 7}',
+        'question_type': 'single_answer',
+        'difficulty': 'basic',
+        'question_text': f'Pregunta {i}',
+        'options_json': '["A. Uno", "B. Dos"]',
+        'correct_answer': 'A',
+        'explanation': 'Ley 247'
+    }
+
+
+def test_insert_questions():
+    """IDs come back in input order and defaults are filled in."""
+    print("=" * 60)
+    print("Testing Bulk Question Insert")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = Database(os.path.join(tmp_dir, 'insert.db'))
+        Base.metadata.create_all(bind=db.engine)
+        try:
+            with db.session() as session:
+                doc = Document(file_id='insert', filename='insert.pdf', total_topics=7,
+                               total_pages=10, analysis_path='unused')
+                session.add(doc)
+                session.flush()
+                document_id = doc.id
+
+            # Odd positions as ORM instances, even positions as dicts
+            questions = [
+                Question(**make_row(document_id, i), key_terms_json='["receta"]') if i % 2 else make_row(document_id, i)
+                for i in range(NUM_QUESTIONS)
+            ]
+            ids = db.insert_questions(questions, batch_size=BATCH_SIZE)
+            assert len(ids) == NUM_QUESTIONS == len(set(ids))
+
+            with db.session() as session:
+                stored = {q.id: q for q in session.query(Question)}
+                assert len(stored) == NUM_QUESTIONS
+                for i, question_id in enumerate(ids):
+                    assert stored[question_id].question_text == f'Pregunta {i}'
+            print(f"✓ {NUM_QUESTIONS} IDs returned in input order across {-(-NUM_QUESTIONS // BATCH_SIZE)} batches")
+
+            with db.session() as session:
+                question = session.get(Question, ids[0])
+                assert question.times_seen == 0 and question.times_correct == 0
+                assert question.created_at and question.key_terms_json is None
+                assert session.get(Question, ids[1]).key_terms_json == '["receta"]'
+            print("✓ Model defaults applied; instance attributes preserved")
+
+            # A second call continues after the first
+            more = db.insert_questions([make_row(document_id, i) for i in range(3)])
+            assert more == list(range(max(ids) + 1, max(ids) + 4))
+            print("✓ Follow-up insert returns the next IDs")
+        finally:
+            db.close()
+    print()
+
+
+if __name__ == '__main__':
+    try:
+        test_insert_questions()
+    except AssertionError as e:
+        print(f"❌ FAILED: {e}")
+        sys.exit(1)
+    print("✅ ALL TESTS PASSED")
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Tests for GET /api/questions/<file_id> and /api/questions/<file_id>/stats.
+
+Seeds a throwaway database, walks every page with next_cursor and checks that
+the pages cover each matching question exactly once in (topic_id, id) order,
+that fields= only selects the requested columns, and that the total matches
+COUNT(*) without issuing it. The stats endpoint must agree with GROUP BY
+queries, answer If-None-Match with 304, and change its ETag when questions are
+added, deleted or edited - also by another connection, or after a reset.
+
+Usage:
+    python test_question_listing.py
+    python -m pytest test_question_listing.py
+"""
+import sqlite3
+import sys
+
+from app_testing import app_database
+from database import Database
+from database_models import Document, Question
+from question_sampler import QuestionSampler
+from sqlalchemy import event, func
+
+NUM_QUESTIONS = 250
+PAGE_SIZE = 40
+TOPICS = ('Licencias', 'Recetas', 'Sustancias controladas', 'Farmacia institucional')
+DIFFICULTIES = ('basic', 'intermediate', 'advanced')
+
+
+def seed_document(db: Database, topics=TOPICS) -> None:
+    """Create a document whose questions are inserted with interleaved topics."""
+    with db.session() as session:
+        doc = Document(
+            file_id='listing',
+            filename='listing.pdf',
+            total_topics=len(topics),
+            total_pages=10,
+            analysis_path='unused'
+        )
+        session.add(doc)
+        session.flush()
+
+        session.add_all([
+            Question(
+                document_id=doc.id,
+                topic_id=i % len(topics),
+                topic_name=topics[i % len(topics)],
+                question_type='single_answer' if i % 3 else 'choose_all',
+                difficulty=DIFFICULTIES[i % len(DIFFICULTIES)],
+                question_text=f'Pregunta {i}',
+                options_json='["A. Uno", "B. Dos", "C. Tres", "D. Cuatro"]',
+                correct_answer='A',
+                explanation='Ley 247',
+                key_terms_json='["receta"]'
+            )
+            for i in range(NUM_QUESTIONS)
+        ])
+
+
+def fetch_all_pages(client, query: str):
+    """Follow next_cursor until the last page, returning (pages, questions)."""
+    pages = []
+    cursor = None
+    while True:
+        url = f'/api/questions/listing?limit={PAGE_SIZE}{query}' + (f'&cursor={cursor}' if cursor else '')
+        response = client.get(url)
+        assert response.status_code == 200, response.get_data(as_text=True)
+        page = response.get_json()
+        pages.append(page)
+        cursor = page['next_cursor']
+        if cursor is None:
+            return pages, [q for p in pages for q in p['questions']]
+
+
+def test_question_listing():
+    """Cursor pages, projections and totals match the database."""
+    print("=" * 60)
+    print("Testing Question Listing")
+    print("=" * 60)
+
+    with app_database('listing.db') as (app_module, db):
+        seed_document(db)
+
+        client = app_module.app.test_client()
+
+        with db.session() as session:
+            expected = [
+                (q.topic_id, q.id)
+                for q in session.query(Question).order_by(Question.topic_id, Question.id)
+            ]
+
+        # Every question exactly once, in (topic_id, id) order
+        pages, questions = fetch_all_pages(client, '')
+        assert [(q['topic_id'], q['id']) for q in questions] == expected
+        assert len(pages) == -(-NUM_QUESTIONS // PAGE_SIZE)
+        assert all(p['total'] == NUM_QUESTIONS for p in pages)
+        assert set(questions[0]) == set(app_module.QUESTION_FIELDS)
+        print(f"✓ {len(pages)} cursor pages cover all {NUM_QUESTIONS} questions in order")
+
+        # Filters apply to pages and total alike
+        pages, questions = fetch_all_pages(client, '&topic=Recetas&type=single_answer')
+        with db.session() as session:
+            count = session.query(Question).filter_by(topic_name='Recetas', question_type='single_answer').count()
+        assert len(questions) == count
+        assert pages[0]['total'] == count
+        assert all(q['topic_name'] == 'Recetas' and q['question_type'] == 'single_answer' for q in questions)
+        print(f"✓ Filtered listing returns {count} questions with matching total")
+
+        # Projection selects only the requested columns
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            response = client.get('/api/questions/listing?fields=question_text,accuracy_rate')
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+        page = response.get_json()
+        assert set(page['questions'][0]) == {'id', 'question_text', 'accuracy_rate'}
+        listing_sql = next(s for s in statements if 'questions.question_text' in s)
+        assert 'explanation' not in listing_sql and 'options_json' not in listing_sql
+        assert not any('count(' in s.lower() for s in statements), "total should come from the cached counter"
+        print("✓ fields= projection selects only the requested columns, no COUNT(*)")
+
+        # Offset pagination still works and agrees with the cursor order
+        page = client.get(f'/api/questions/listing?limit={PAGE_SIZE}&offset={PAGE_SIZE}').get_json()
+        assert [q['id'] for q in page['questions']] == [i for _, i in expected[PAGE_SIZE:2 * PAGE_SIZE]]
+        print("✓ Offset pagination matches cursor order")
+
+        # Bad input
+        assert client.get('/api/questions/listing?fields=nope').status_code == 400
+        assert client.get('/api/questions/listing?cursor=garbage').status_code == 400
+        assert client.get('/api/questions/listing?limit=ten').status_code == 400
+        print("✓ Unknown fields, malformed cursors and non-integer limits are rejected")
+
+        # Out-of-range limits are clamped rather than breaking the page
+        page = client.get('/api/questions/listing?limit=0').get_json()
+        assert page['limit'] == 1 and len(page['questions']) == 1 and page['next_cursor']
+        page = client.get('/api/questions/listing?limit=-5&offset=-3').get_json()
+        assert page['limit'] == 1 and page['offset'] == 0 and page['questions'][0]['id'] == expected[0][1]
+        print("✓ limit is clamped to at least one row and negative offsets to zero")
+    print()
+
+
+def expected_stats(db: Database) -> dict:
+    """The stats payload computed with plain GROUP BY queries."""
+    with db.session() as session:
+        def grouped(column):
+            return session.query(column, func.count(Question.id)).group_by(column).order_by(column).all()
+
+        return {
+            'total': session.query(Question).count(),
+            'by_topic': [{'topic': k, 'count': n} for k, n in grouped(Question.topic_name)],
+            'by_difficulty': [{'difficulty': k, 'count': n} for k, n in grouped(Question.difficulty)],
+            'by_type': [{'type': k, 'count': n} for k, n in grouped(Question.question_type)]
+        }
+
+
+def test_question_stats():
+    """Stats match the database; ETags revalidate until questions change."""
+    print("=" * 60)
+    print("Testing Question Stats Cache")
+    print("=" * 60)
+
+    with app_database('stats.db') as (app_module, db):
+        seed_document(db)
+
+        client = app_module.app.test_client()
+        url = '/api/questions/listing/stats'
+
+        response = client.get(url)
+        etag = response.headers['ETag']
+        assert response.status_code == 200 and etag
+        assert response.get_json() == expected_stats(db)
+        print("✓ Stats match GROUP BY queries")
+
+        response = client.get(url, headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        with db.session() as session:
+            assert f'"{QuestionSampler().stats(session, 1)[1]}"' == etag
+        print("✓ Unchanged stats revalidate with 304, with the same ETag in every process")
+
+        # Insert: bumps the document's question version
+        with db.session() as session:
+            session.add(Question(
+                document_id=1, topic_id=9, topic_name='Nuevo tema', question_type='choose_all',
+                difficulty='advanced', question_text='Nueva', options_json='[]',
+                correct_answer='A', explanation='Ley 247'
+            ))
+        response = client.get(url, headers={'If-None-Match': etag})
+        assert response.status_code == 200 and response.headers['ETag'] != etag
+        assert response.get_json() == expected_stats(db)
+        etag = response.headers['ETag']
+        print("✓ Insert changes the ETag")
+
+        # ORM delete of an older question (max ID unchanged)
+        with db.session() as session:
+            session.delete(session.query(Question).order_by(Question.id).first())
+        response = client.get(url, headers={'If-None-Match': etag})
+        assert response.status_code == 200 and response.get_json() == expected_stats(db)
+        etag = response.headers['ETag']
+        print("✓ ORM delete invalidates the cache")
+
+        # Bulk delete
+        with db.session() as session:
+            session.query(Question).filter(Question.topic_name == 'Recetas').delete()
+        response = client.get(url, headers={'If-None-Match': etag})
+        assert response.status_code == 200 and response.get_json() == expected_stats(db)
+        etag = response.headers['ETag']
+        print("✓ Bulk delete invalidates the cache")
+
+        # Another connection (another worker, the CLI) edits a question's topic
+        other = sqlite3.connect(db.db_path)
+        other.execute("UPDATE questions SET topic_name = 'Editado' WHERE id = (SELECT max(id) FROM questions)")
+        other.commit()
+        other.close()
+        response = client.get(url, headers={'If-None-Match': etag})
+        assert response.status_code == 200 and response.get_json() == expected_stats(db)
+        etag = response.headers['ETag']
+        print("✓ Changes made outside this process invalidate the cache")
+
+        # Reset, then the same document ID, question IDs and count with other topics
+        db.reset_database()
+        seed_document(db, topics=('Otro tema',))
+        response = client.get(url, headers={'If-None-Match': etag})
+        assert response.status_code == 200 and response.get_json() == expected_stats(db)
+        print("✓ A reset database isn't served from the old cache")
+    print()
+
+
+if __name__ == '__main__':
+    try:
+        test_question_listing()
+        test_question_stats()
+    except AssertionError as e:
+        print(f"❌ FAILED: {e}")
+        sys.exit(1)
+    print("✅ ALL TESTS PASSED")
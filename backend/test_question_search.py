@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Tests for full-text question search (questions_fts and GET /api/questions/search).
+
+Checks accent-insensitive matching, ranking and snippets, that the triggers
+keep the index in sync with inserts, edits, counter updates and deletes,
+scoping by document and topic, and that a database created before search
+gets its existing questions indexed.
+
+Usage:
+    python test_question_search.py
+    python -m pytest test_question_search.py
+"""
+import sys
+
+from app_testing import app_database
+from database import Database
+from database_models import (
+    QUESTION_SEARCH_PAUSE_TABLE,
+    QUESTION_SEARCH_TABLE,
+    Document,
+    Question,
+    create_question_search,
+)
+from question_search import build_match_query, search_questions
+from sqlalchemy import text, update
+
+
+def make_row(document_id: int, question_text: str, explanation: str = 'Ver reglamento.', **extra) -> dict:
+    """Question columns for insert_questions; extra overrides the defaults."""
+    row = {
+        'document_id': document_id,
+        'topic_id': 1,
+        'topic_name': 'Recetas',
+        'question_type': 'single_answer',
+        'difficulty': 'basic',
+        'question_text': question_text,
+        'options_json': '["A. Uno", "B. Dos"]',
+        'correct_answer': 'A',
+        'explanation': explanation
+    }
+    row.update(extra)
+    return row
+
+
+def seed(db: Database) -> dict:
+    """Two documents with a few questions; returns {label: question_id}."""
+    document_ids = []
+    with db.session() as session:
+        for file_id in ('search', 'other'):
+            doc = Document(file_id=file_id, filename=f'{file_id}.pdf', total_topics=2,
+                           total_pages=10, analysis_path='unused')
+            session.add(doc)
+            session.flush()
+            document_ids.append(doc.id)
+
+    first, other = document_ids
+    rows = {
+        'prescription': make_row(first, '¿Quién puede dispensar una prescripción médica?',
+                                 key_terms_json='["receta", "farmacéutico"]'),
+        'citation': make_row(first, '¿Qué regula la ley de farmacia?', regulatory_context='Ley 247 de 2004, Art. 12'),
+        'explained': make_row(first, '¿Cuánto dura una receta?', 'La prescripción vence a los 30 días.',
+                              topic_name='Vigencia'),
+        'controlled': make_row(first, 'Registro de sustancias controladas',
+                               'El farmacéutico regente firma el libro.'),
+        'other_document': make_row(other, 'Prescripción en el otro documento')
+    }
+    ids = db.insert_questions(rows.values())
+    # Unrelated questions, so the searched words are rare enough for BM25 to rank by
+    db.insert_questions(make_row(first, f'Pregunta de relleno {i}', 'Sin relación.') for i in range(40))
+    return dict(zip(rows, ids))
+
+
+def test_question_search():
+    """Search finds, ranks and scopes questions and stays in sync."""
+    print("=" * 60)
+    print("Testing Question Search")
+    print("=" * 60)
+
+    assert build_match_query('  ¿Qué es la "prescripción"? ') == '"qué" "prescripción"*'
+    assert build_match_query('de la') == '"de" "la"'
+    assert build_match_query('Ley 24') == '"ley" "24"'
+    assert build_match_query('?!') is None
+    print("✓ User input becomes a quoted MATCH expression (stopwords dropped, prefix on last word)")
+
+    with app_database('search.db') as (app_module, db):
+        ids = seed(db)
+
+        with db.session() as session:
+            results = search_questions(session, 'PRESCRIPCION')
+            assert {r['id'] for r in results[:2]} == {ids['prescription'], ids['other_document']}
+            assert results[2]['id'] == ids['explained']
+            assert '<mark>prescripción</mark>' in results[0]['snippet'].lower()
+
+            assert [r['id'] for r in search_questions(session, 'farmaceut')][0] == ids['prescription']
+            assert [r['id'] for r in search_questions(session, 'ley 247')] == [ids['citation']]
+        print("✓ Accent/case-insensitive, prefix and citation matches; wording ranks above explanation")
+
+        client = app_module.app.test_client()
+        body = client.get('/api/questions/search?q=prescripcion&file_id=search').get_json()
+        assert ids['other_document'] not in [r['id'] for r in body['results']]
+        assert len(body['results']) == 2 and body['elapsed_ms'] >= 0
+        body = client.get('/api/questions/search?q=prescripcion&topic=Vigencia').get_json()
+        assert [r['id'] for r in body['results']] == [ids['explained']]
+        assert len(client.get('/api/questions/search?q=prescripcion&limit=1').get_json()['results']) == 1
+        assert client.get('/api/questions/search?q=%20').status_code == 400
+        response = client.get('/api/questions/search?q=receta&limit=abc')
+        assert response.status_code == 400 and 'limit' in response.get_json()['error']
+        assert client.get('/api/questions/search?q=receta&file_id=missing').status_code == 404
+        print("✓ Endpoint scopes by file_id and topic, honors limit, rejects bad input")
+
+        with db.session() as session:
+            session.execute(
+                update(Question).where(Question.id == ids['controlled'])
+                .values(question_text='Libro de estupefacientes')
+            )
+            session.execute(
+                update(Question).where(Question.id == ids['citation'])
+                .values(times_seen=Question.times_seen + 1)
+            )
+            session.delete(session.get(Question, ids['other_document']))
+        more = db.insert_questions([make_row(1, 'Estupefacientes en farmacias rurales')])
+
+        with db.session() as session:
+            found = [r['id'] for r in search_questions(session, 'estupefacientes')]
+            assert sorted(found) == sorted([ids['controlled'], more[0]])
+            assert search_questions(session, 'sustancias controladas') == []
+            assert ids['other_document'] not in [r['id'] for r in search_questions(session, 'prescripcion')]
+            assert [r['id'] for r in search_questions(session, 'ley 247')] == [ids['citation']]
+            assert session.execute(text(f'SELECT count(*) FROM {QUESTION_SEARCH_PAUSE_TABLE}')).scalar() == 0
+        print("✓ Index follows inserts, text edits and deletes")
+
+        # A database from before search: drop the index, then migrate
+        with db.engine.begin() as conn:
+            conn.exec_driver_sql(f'DROP TABLE {QUESTION_SEARCH_TABLE}')
+            for trigger in ('insert', 'delete', 'update'):
+                conn.exec_driver_sql(f'DROP TRIGGER {QUESTION_SEARCH_TABLE}_{trigger}')
+        with db.engine.begin() as conn:
+            create_question_search(conn)
+        with db.session() as session:
+            assert [r['id'] for r in search_questions(session, 'ley 247')] == [ids['citation']]
+        print("✓ Existing questions indexed when search is added to an old database")
+    print()
+
+
+if __name__ == '__main__':
+    try:
+        test_question_search()
+    except AssertionError as e:
+        print(f"❌ FAILED: {e}")
+        sys.exit(1)
+    print("✅ ALL TESTS PASSED")
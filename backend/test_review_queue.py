@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Tests for the spaced-repetition review queue (GET /api/review/due and review sessions).
+
+Checks that the due queue is ordered, scoped and limited, that review sessions
+serve due cards before never-reviewed questions, that their answers update SM-2
+state (and other sessions' answers don't), and that cards get their document_id
+when an older database is migrated.
+
+Usage:
+    python test_review_queue.py
+    python -m pytest test_review_queue.py
+"""
+import sys
+from datetime import timedelta
+
+from app_testing import app_database
+from database import Database
+from database_models import Document, SpacedRepetition, add_review_document_column
+from review_queue import review_today
+from sqlalchemy import select
+
+QUESTIONS_PER_DOCUMENT = 20
+CARDS = 10  # First document's first questions have cards, due 5 days ago ... in 4 days
+
+
+def seed(db: Database) -> dict:
+    """Two documents with questions and review cards; returns {file_id: question_ids}."""
+    today = review_today()
+    question_ids = {}
+    for file_id in ('review', 'other'):
+        with db.session() as session:
+            doc = Document(file_id=file_id, filename=f'{file_id}.pdf', total_topics=1,
+                           total_pages=10, analysis_path='unused')
+            session.add(doc)
+            session.flush()
+            document_id = doc.id
+        question_ids[file_id] = db.insert_questions(
+            {
+                'document_id': document_id,
+                'topic_id': 1,
+                'topic_name': 'Recetas',
+                'question_type': 'single_answer',
+                'difficulty': 'basic',
+                'question_text': f'Pregunta {i}',
+                'options_json': '["A. Uno", "B. Dos"]',
+                'correct_answer': 'A',
+                'explanation': 'Ley 247'
+            }
+            for i in range(QUESTIONS_PER_DOCUMENT)
+        )
+
+    with db.session() as session:
+        session.add_all([
+            SpacedRepetition(question_id=question_id, document_id=1, ease_factor=2.5, interval_days=1,
+                             repetitions=0, total_reviews=0, correct_reviews=0,
+                             next_review_date=today + timedelta(days=i - 5))
+            for i, question_id in enumerate(question_ids['review'][:CARDS])
+        ])
+        session.add(SpacedRepetition(question_id=question_ids['other'][0], document_id=2, ease_factor=2.5,
+                                     interval_days=1, repetitions=0, total_reviews=0, correct_reviews=0,
+                                     next_review_date=today - timedelta(days=9)))
+    return question_ids
+
+
+def card_of(db: Database, question_id: int):
+    """The question's review card (detached), or None."""
+    with db.session() as session:
+        card = session.execute(select(SpacedRepetition).where(SpacedRepetition.question_id == question_id)).scalar()
+        if card is not None:
+            session.expunge(card)
+        return card
+
+
+def test_review_queue():
+    """Due queue, review sessions and SM-2 updates."""
+    print("=" * 60)
+    print("Testing Review Queue")
+    print("=" * 60)
+
+    today = review_today()
+    with app_database('review.db') as (app_module, db):
+        ids = seed(db)
+        review_ids = ids['review']
+
+        client = app_module.app.test_client()
+
+        body = client.get('/api/review/due?file_id=review').get_json()
+        assert body['today'] == today.isoformat() and body['total_due'] == 6
+        assert [c['question_id'] for c in body['cards']] == review_ids[:6]
+        assert [c['days_overdue'] for c in body['cards']] == [5, 4, 3, 2, 1, 0]
+        body = client.get('/api/review/due?limit=2').get_json()
+        assert body['total_due'] == 7 and [c['question_id'] for c in body['cards']] == [ids['other'][0], review_ids[0]]
+        assert client.get('/api/review/due?file_id=missing').status_code == 404
+        assert client.get('/api/review/due?limit=abc').status_code == 400
+        print("✓ Due queue is most-overdue first, scoped by file_id, limited, with the total due")
+
+        started = client.post('/api/sessions/start', json={
+            'file_id': 'review', 'session_type': 'review', 'num_questions': 8
+        }).get_json()
+        session_id = started['session_id']
+        plan = [started['first_question']['id']]
+        for _ in range(7):
+            answered = client.post(f'/api/sessions/{session_id}/answer', json={
+                'question_id': plan[-1], 'selected_answer': 'A'
+            }).get_json()
+            plan.append(answered['next_question']['id'])
+        assert plan == review_ids[:6] + review_ids[CARDS:CARDS + 2], plan
+        print("✓ Review session serves due cards first, then never-reviewed questions")
+
+        card = card_of(db, review_ids[0])
+        assert (card.repetitions, card.interval_days, card.total_reviews, card.correct_reviews) == (1, 1, 1, 1)
+        assert card.next_review_date == today + timedelta(days=1)
+        assert client.get('/api/review/due?file_id=review').get_json()['total_due'] == 0
+        assert card_of(db, review_ids[CARDS]).document_id == 1
+        assert card_of(db, review_ids[CARDS + 1]) is None  # Served last, not answered yet
+
+        answered = client.post(f'/api/sessions/{session_id}/answer', json={
+            'question_id': review_ids[CARDS + 1], 'selected_answer': 'B'
+        }).get_json()
+        assert answered['is_correct'] is False and answered['next_review_date'] == (today + timedelta(days=1)).isoformat()
+        new_card = card_of(db, review_ids[CARDS + 1])
+        assert new_card.document_id == 1 and (new_card.repetitions, new_card.correct_reviews) == (0, 0)
+        assert new_card.ease_factor < 2.5
+        print("✓ Answers update SM-2 state; first review of a new question creates its card")
+
+        answered = client.post(f'/api/sessions/{session_id}/answer', json={
+            'question_id': review_ids[0], 'selected_answer': 'A', 'quality': 5
+        }).get_json()
+        assert answered['interval_days'] == 6
+        assert card_of(db, review_ids[0]).ease_factor > 2.5
+        assert client.post(f'/api/sessions/{session_id}/answer', json={
+            'question_id': review_ids[0], 'selected_answer': 'A', 'quality': 7
+        }).status_code == 400
+        print("✓ Client-graded quality is honored and validated")
+
+        practice = client.post('/api/sessions/start', json={
+            'file_id': 'review', 'session_type': 'practice', 'num_questions': QUESTIONS_PER_DOCUMENT
+        }).get_json()
+        answered = client.post(f"/api/sessions/{practice['session_id']}/answer", json={
+            'question_id': review_ids[-1], 'selected_answer': 'A'
+        }).get_json()
+        assert 'next_review_date' not in answered and card_of(db, review_ids[-1]) is None
+        print("✓ Other session types leave review cards alone")
+
+        body = client.post('/api/maintenance/clear-user-data', json={'confirm': True, 'file_id': 'review'}).get_json()
+        assert body['deleted']['review_cards'] == CARDS + 2
+        assert client.get('/api/review/due').get_json()['total_due'] == 1
+        print("✓ Clearing a document's user data deletes its review cards")
+
+        # Foreign keys aren't enforced: a card can outlive its question
+        with db.session() as session:
+            session.add(SpacedRepetition(question_id=9999, document_id=2, ease_factor=2.5, interval_days=1,
+                                         repetitions=0, total_reviews=0, correct_reviews=0,
+                                         next_review_date=today - timedelta(days=30)))
+        body = client.get('/api/review/due?file_id=other').get_json()
+        assert body['total_due'] == 1 and [c['question_id'] for c in body['cards']] == [ids['other'][0]]
+        started = client.post('/api/sessions/start', json={
+            'file_id': 'other', 'session_type': 'review', 'num_questions': 3
+        }).get_json()
+        assert started['total_questions'] == 3 and started['first_question']['id'] == ids['other'][0]
+        print("✓ Due counts and review sessions skip cards whose question is gone")
+
+        # A database from before the review queue: spaced_repetition without document_id
+        with db.engine.begin() as conn:
+            conn.exec_driver_sql('DROP TABLE spaced_repetition')
+            conn.exec_driver_sql(
+                'CREATE TABLE spaced_repetition (id INTEGER PRIMARY KEY, question_id INTEGER NOT NULL UNIQUE, '
+                'ease_factor FLOAT, interval_days INTEGER, repetitions INTEGER, next_review_date DATE NOT NULL, '
+                'last_reviewed VARCHAR(50), total_reviews INTEGER, correct_reviews INTEGER)'
+            )
+            conn.exec_driver_sql(
+                "INSERT INTO spaced_repetition (question_id, next_review_date) VALUES (?, '2025-01-01')",
+                (ids['other'][3],)
+            )
+        with db.engine.begin() as conn:
+            add_review_document_column(conn)
+            add_review_document_column(conn)  # No-op once migrated
+        assert card_of(db, ids['other'][3]).document_id == 2
+        print("✓ Cards of an old database get their question's document_id")
+    print()
+
+
+if __name__ == '__main__':
+    try:
+        test_review_queue()
+    except AssertionError as e:
+        print(f"❌ FAILED: {e}")
+        sys.exit(1)
+    print("✅ ALL TESTS PASSED")
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Query-count regression test for GET /api/sessions/<id>/results.
+
+Seeds a throwaway database with sessions of increasing size and checks that the
+endpoint issues the same number of SQL statements for each (no N+1 per attempt),
+printing the query count and latency for every size.
+
+Usage:
+    python test_session_results.py
+    python -m pytest test_session_results.py
+"""
+import sys
+import time
+
+from app_testing import app_database
+from database import Database
+from database_models import Document, Question, StudySession, UserAttempt
+from sqlalchemy import event
+from timezone_utils import to_iso_string
+
+SESSION_SIZES = (1, 10, 100, 500)
+# Session lookup, attempts joined with questions, topic breakdown aggregate
+EXPECTED_QUERIES = 3
+TOPICS = ('Licencias', 'Recetas', 'Sustancias controladas', 'Farmacia institucional')
+
+
+def seed_session(db: Database, num_questions: int) -> int:
+    """Create a document with num_questions questions and a completed session answering all of them."""
+    with db.session() as session:
+        doc = Document(
+            file_id=f'results_{num_questions}',
+            filename='results.pdf',
+            total_topics=len(TOPICS),
+            total_pages=10,
+            analysis_path='unused'
+        )
+        session.add(doc)
+        session.flush()
+
+        questions = [
+            Question(
+                document_id=doc.id,
+                topic_id=i % len(TOPICS),
+                topic_name=TOPICS[i % len(TOPICS)],
+                question_type='single_answer',
+                difficulty='basic',
+                question_text=f'Pregunta {i}',
+                options_json='["A. Uno", "B. Dos", "C. Tres", "D. Cuatro"]',
+                correct_answer='A',
+                explanation='Ley 247'
+            )
+            for i in range(num_questions)
+        ]
+        session.add_all(questions)
+        session.flush()
+
+        study_session = StudySession(
+            document_id=doc.id,
+            session_type='mock',
+            start_time=to_iso_string(),
+            total_questions=num_questions,
+            correct_answers=num_questions // 2
+        )
+        session.add(study_session)
+        session.flush()
+
+        session.add_all([
+            UserAttempt(
+                question_id=q.id,
+                session_id=study_session.id,
+                selected_answer='A' if i % 2 == 0 else 'B',
+                is_correct=(i % 2 == 0),
+                time_spent_seconds=30
+            )
+            for i, q in enumerate(questions)
+        ])
+        return study_session.id
+
+
+def count_result_queries(client, db: Database, session_id: int):
+    """Call the results endpoint, returning (response JSON, SQL statements issued, seconds)."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        start = time.perf_counter()
+        response = client.get(f'/api/sessions/{session_id}/results')
+        elapsed = time.perf_counter() - start
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return response.get_json(), len(statements), elapsed
+
+
+def test_session_results_query_count():
+    """Query count must not grow with the number of attempts."""
+    print("=" * 60)
+    print("Testing Session Results Query Count")
+    print("=" * 60)
+
+    with app_database('results.db') as (app_module, db):
+        client = app_module.app.test_client()
+        counts = {}
+
+        for size in SESSION_SIZES:
+            session_id = seed_session(db, size)
+
+            # First call also marks the session complete; measure the steady state too
+            count_result_queries(client, db, session_id)
+            results, queries, elapsed = count_result_queries(client, db, session_id)
+            counts[size] = queries
+
+            assert len(results['attempts']) == size
+            assert sum(t['total'] for t in results['topic_breakdown']) == size
+            assert sum(t['correct'] for t in results['topic_breakdown']) == (size + 1) // 2
+            assert [t['topic'] for t in results['topic_breakdown']] == list(TOPICS[:min(size, len(TOPICS))])
+            print(f"✓ {size:>4} attempts: {queries} queries, {elapsed * 1000:.1f} ms")
+
+    assert set(counts.values()) == {EXPECTED_QUERIES}, f"Expected {EXPECTED_QUERIES} queries per call: {counts}"
+    print(f"✓ Query count constant at {EXPECTED_QUERIES}")
+    print()
+
+
+if __name__ == '__main__':
+    try:
+        test_session_results_query_count()
+    except AssertionError as e:
+        print(f"❌ FAILED: {e}")
+        sys.exit(1)
+    print("✅ ALL TESTS PASSED")
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests for where timezone_utils reads the timezone setting from.
+
+Checks that callers outside the Flask app (CLI scripts, question generation),
+which register no database, get the timezone saved in Config.DATABASE_PATH,
+and that a registered database takes precedence.
+
+Usage:
+    python test_timezone_utils.py
+    python -m pytest test_timezone_utils.py
+"""
+import os
+import sys
+import tempfile
+
+import timezone_utils
+from config import Config
+from database import Database, get_database
+from database_models import AppSettings, Base
+from timezone_utils import get_configured_timezone, now_in_timezone, set_timezone_database
+
+
+def save_timezone(db: Database, tz_name: str) -> None:
+    """Store the timezone setting the way the settings endpoint does."""
+    with db.session() as session:
+        session.add(AppSettings(setting_key='timezone', setting_value=tz_name))
+
+
+def test_timezone_setting_source():
+    """Unregistered callers read Config.DATABASE_PATH; a registered database wins."""
+    print("=" * 60)
+    print("Testing Timezone Setting Source")
+    print("=" * 60)
+
+    registered = timezone_utils._settings_database
+    database_path = Config.DATABASE_PATH
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        Config.DATABASE_PATH = os.path.join(tmp_dir, 'configured.db')
+        configured = get_database(Config.DATABASE_PATH)
+        other = Database(os.path.join(tmp_dir, 'other.db'))
+        try:
+            Base.metadata.create_all(bind=configured.engine)
+            Base.metadata.create_all(bind=other.engine)
+            save_timezone(configured, 'America/New_York')
+            save_timezone(other, 'Europe/Madrid')
+
+            set_timezone_database(None)
+            assert get_configured_timezone() == 'America/New_York'
+            assert now_in_timezone().tzinfo.zone == 'America/New_York'
+            print("✓ Without a registered database the saved setting comes from Config.DATABASE_PATH")
+
+            set_timezone_database(other)
+            assert get_configured_timezone() == 'Europe/Madrid'
+            print("✓ A registered database takes precedence")
+        finally:
+            Config.DATABASE_PATH = database_path
+            set_timezone_database(registered)
+            configured.close()
+            other.close()
+    print()
+
+
+if __name__ == '__main__':
+    try:
+        test_timezone_setting_source()
+    except AssertionError as e:
+        print(f"❌ FAILED: {e}")
+        sys.exit(1)
+    print("✅ ALL TESTS PASSED")
@@ -2,20 +2,23 @@ import json
 import logging
 import re
 from collections import Counter
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
-from anthropic import Anthropic
 from config import Config
+from llm_cache import cached_completion
+from llm_client import create_client, llm_available
 
 
 class TextProcessor:
     def __init__(self, logger: Optional[logging.Logger] = None):
-        self.client: Optional[Anthropic] = None
-        if Config.ANTHROPIC_API_KEY:
-            self.client = Anthropic(api_key=Config.ANTHROPIC_API_KEY)
+        self.client = None
+        if llm_available():
+            self.client = create_client()
             self.model = Config.ANTHROPIC_MODEL
         # Use provided logger or create default
         self.logger = logger or logging.getLogger(__name__)
+        # Page ranges grouped by group_by_topics after LLM topic identification failed
+        self.fallback_chunks: List[str] = []
     def clean_text(self, text: str) -> str:
         # Only remove flowchart artifacts if the text has the specific pattern
         # Pattern: repeated sequences of dash-bullet-dash between single characters
@@ -53,6 +56,53 @@ class TextProcessor:
             cleaned_pages.append(page)
         return cleaned_pages
 
+    def iter_cleaned_pages(self, pages: Iterable[Dict], window: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Streaming counterpart of detect_repeated_elements + remove_repeated_elements.
+
+        The first `window` pages are buffered so repeated headers/footers can be
+        detected before anything is emitted; after that each page is cleaned as it
+        arrives against the running frequencies. Documents that fit in the window
+        are cleaned exactly like process() would.
+
+        Args:
+            pages: Iterable of extracted page dictionaries
+            window: Pages to buffer before emitting (default: Config.BATCH_SIZE)
+        """
+        if window is None:
+            window = Config.BATCH_SIZE
+
+        text_frequency: Counter = Counter()
+        pages_seen = 0
+        buffered: List[Dict] = []
+
+        def clean(page: Dict) -> Dict:
+            threshold = pages_seen * 0.3
+            page["content"] = [
+                item for item in page.get("content", [])
+                if text_frequency[item.get("text", "").strip()] <= threshold
+            ]
+            return page
+
+        for page in pages:
+            pages_seen += 1
+            for item in page.get("content", []):
+                text = item.get("text", "").strip()
+                if len(text) > 5:
+                    text_frequency[text] += 1
+
+            if pages_seen < window:
+                buffered.append(page)
+                continue
+
+            for buffered_page in buffered:
+                yield clean(buffered_page)
+            buffered = []
+            yield clean(page)
+
+        for buffered_page in buffered:
+            yield clean(buffered_page)
+
     def structure_page(self, page_data: Dict) -> Dict:
         structured = {
             "page": page_data["page"],
@@ -75,12 +125,12 @@ class TextProcessor:
 
         return structured
 
-    def group_by_topics(self, pages_data: List[Dict], max_pages_per_topic: int = 3) -> List[Dict]:
+    def group_by_topics(self, pages_data: Iterable[Dict], max_pages_per_topic: int = 3) -> List[Dict]:
         """
         Group pages into topics with better control over topic size.
 
         Args:
-            pages_data: List of page dictionaries
+            pages_data: Page dictionaries (any iterable)
             max_pages_per_topic: Maximum pages to include in a single topic (default: 3)
         """
         topics = []
@@ -153,16 +203,22 @@ class TextProcessor:
         Dynamically create chunks based on token count, not fixed page count.
         Tries to pack as many pages as possible without exceeding max_tokens.
         """
-        chunks = []
-        current_chunk = []
+        return list(self.iter_dynamic_chunks(pages_data, max_tokens))
+
+    def iter_dynamic_chunks(self, pages: Iterable[Dict], max_tokens: int) -> Iterator[List[Dict]]:
+        """
+        Generator form of create_dynamic_chunks: each chunk is yielded as soon as
+        the next page would overflow it, without waiting for the rest of the pages.
+        """
+        current_chunk: List[Dict] = []
         current_tokens = 0
 
-        for page in pages_data:
+        for page in pages:
             page_tokens = self.estimate_tokens([page])
 
             # If adding this page would exceed limit, start new chunk
             if current_chunk and (current_tokens + page_tokens > max_tokens):
-                chunks.append(current_chunk)
+                yield current_chunk
                 current_chunk = [page]
                 current_tokens = page_tokens
             else:
@@ -171,9 +227,7 @@ class TextProcessor:
 
         # Don't forget last chunk
         if current_chunk:
-            chunks.append(current_chunk)
-
-        return chunks
+            yield current_chunk
 
     def identify_topics_with_llm(self, pages_data: List[Dict]) -> List[Dict]:
         """
@@ -197,39 +251,79 @@ class TextProcessor:
         previous_context = ""
 
         for chunk_idx, chunk in enumerate(chunks):
-            chunk_start = chunk[0]['page']
-            chunk_end = chunk[-1]['page']
-            self.logger.info(f"Processing chunk {chunk_idx+1}/{len(chunks)}: pages {chunk_start}-{chunk_end}")
-
-            # Prepare content summary for LLM
-            pages_summary = []
-            for page in chunk:
-                structured = self.structure_page(page)
-                page_text = []
-                if structured['headers']:
-                    page_text.append("HEADERS: " + " | ".join(structured['headers']))
-                if structured['bullets']:
-                    page_text.append("BULLETS: " + "; ".join(structured['bullets'][:5]))  # First 5 bullets
-                if structured['body']:
-                    page_text.append("CONTENT: " + " ".join(structured['body'][:3])[:200])  # First 3 body items, limited
-
-                pages_summary.append({
-                    "page": page['page'],
-                    "content": "\n".join(page_text)
-                })
-
-            # Build context section from previous chunk's topics
-            context_section = ""
-            if previous_context:
-                context_section = f"""
+            self.logger.info(f"Processing chunk {chunk_idx+1}/{len(chunks)}: pages {chunk[0]['page']}-{chunk[-1]['page']}")
+            chunk_topics, previous_context = self._identify_chunk_topics(chunk, previous_context)
+            all_topics.extend(chunk_topics)
+
+        return all_topics
+
+    def iter_topics_with_llm(self, pages: Iterable[Dict]) -> Iterator[Dict]:
+        """
+        Streaming form of identify_topics_with_llm: pages are chunked as they arrive
+        and each chunk goes to the LLM as soon as it is full, so topics are yielded
+        while later pages are still being extracted.
+        """
+        if not self.client:
+            # Basic grouping needs to see a page after a topic to close it, so just drain
+            yield from self.group_by_topics(pages)
+            return
+
+        max_tokens = Config.MAX_CHUNK_TOKENS
+        previous_context = ""
+
+        for chunk_idx, chunk in enumerate(self.iter_dynamic_chunks(pages, max_tokens)):
+            estimated = self.estimate_tokens(chunk)
+            self.logger.info(
+                f"Processing chunk {chunk_idx+1}: pages {chunk[0]['page']}-{chunk[-1]['page']} "
+                f"({len(chunk)} pages, ~{estimated:,} tokens)"
+            )
+            chunk_topics, previous_context = self._identify_chunk_topics(chunk, previous_context)
+            yield from chunk_topics
+
+    def _identify_chunk_topics(self, chunk: List[Dict], previous_context: str) -> Tuple[List[Dict], str]:
+        """
+        Identify topics in one chunk of pages.
+
+        Args:
+            chunk: Consecutive page dictionaries
+            previous_context: Context summary carried over from the previous chunk
+
+        Returns:
+            Tuple of (topics for this chunk, context to pass to the next chunk)
+        """
+        chunk_start = chunk[0]['page']
+        chunk_end = chunk[-1]['page']
+        topics: List[Dict] = []
+
+        # Prepare content summary for LLM
+        pages_summary = []
+        for page in chunk:
+            structured = self.structure_page(page)
+            page_text = []
+            if structured['headers']:
+                page_text.append("HEADERS: " + " | ".join(structured['headers']))
+            if structured['bullets']:
+                page_text.append("BULLETS: " + "; ".join(structured['bullets'][:5]))  # First 5 bullets
+            if structured['body']:
+                page_text.append("CONTENT: " + " ".join(structured['body'][:3])[:200])  # First 3 body items, limited
+
+            pages_summary.append({
+                "page": page['page'],
+                "content": "\n".join(page_text)
+            })
+
+        # Build context section from previous chunk's topics
+        context_section = ""
+        if previous_context:
+            context_section = f"""
 CONTEXT FROM PREVIOUS PAGES:
 {previous_context}
 
 NOTE: If the first page(s) in the current batch continue the last topic from the context, include them in a topic that starts from that earlier page number.
 """
 
-            # Ask LLM to identify topic boundaries
-            prompt = f"""Analyze these pharmacy law pages and identify distinct topics. Group consecutive pages that discuss the same subject.
+        # Ask LLM to identify topic boundaries
+        prompt = f"""Analyze these pharmacy law pages and identify distinct topics. Group consecutive pages that discuss the same subject.
 
 IMPORTANT: Keep all topic names in the ORIGINAL LANGUAGE (Spanish if the content is Spanish).
 {context_section}
@@ -248,84 +342,84 @@ Return ONLY valid JSON in this format:
   ]
 }}"""
 
-            try:
-                response = self.client.messages.create(
-                    model=self.model,
-                    max_tokens=2000,
-                    temperature=0.1,
-                    messages=[{"role": "user", "content": prompt}]
-                )
-
-                response_text = response.content[0].text
-                if "```json" in response_text:
-                    response_text = response_text.split("```json")[1].split("```")[0]
-
-                result = json.loads(response_text.strip())
-
-                # Convert LLM response to our topic format
-                chunk_topics = []
-                for topic_info in result.get('topics', []):
-                    topic_pages = [
-                        p for p in chunk
-                        if topic_info['start_page'] <= p['page'] <= topic_info['end_page']
-                    ]
-
-                    if topic_pages:
-                        topic = {
-                            "topic": topic_info['topic_name'],
-                            "start_page": topic_info['start_page'],
-                            "end_page": topic_info['end_page'],
-                            "content": [self.structure_page(p) for p in topic_pages]
-                        }
-                        all_topics.append(topic)
-                        chunk_topics.append(topic)
-
-                # Generate rich context for next chunk: both summary AND topic list
-                if chunk_topics:
-                    # Build topic list
-                    context_topics = chunk_topics[-2:] if len(chunk_topics) > 1 else chunk_topics
-                    topic_lines = [f"- Pages {t['start_page']}-{t['end_page']}: {t['topic']}" for t in context_topics]
-                    topic_list = "\n".join(topic_lines)
-
-                    # Get last 2-3 pages from this chunk for summary
-                    last_pages = chunk[-3:] if len(chunk) > 2 else chunk
-                    summary_prompt = f"""Briefly summarize what these pages discuss (1-2 sentences max). Keep the summary in the ORIGINAL LANGUAGE.
+        try:
+            response_text = cached_completion(
+                self.client, self.model, prompt,
+                max_tokens=2000,
+                temperature=0.1,
+                validate=self._parse_topics_response
+            )
+
+            result = self._parse_topics_response(response_text)
+
+            # Convert LLM response to our topic format
+            chunk_topics = []
+            for topic_info in result.get('topics', []):
+                topic_pages = [
+                    p for p in chunk
+                    if topic_info['start_page'] <= p['page'] <= topic_info['end_page']
+                ]
+
+                if topic_pages:
+                    topic = {
+                        "topic": topic_info['topic_name'],
+                        "start_page": topic_info['start_page'],
+                        "end_page": topic_info['end_page'],
+                        "content": [self.structure_page(p) for p in topic_pages]
+                    }
+                    topics.append(topic)
+                    chunk_topics.append(topic)
+
+            # Generate rich context for next chunk: both summary AND topic list
+            if chunk_topics:
+                # Build topic list
+                context_topics = chunk_topics[-2:] if len(chunk_topics) > 1 else chunk_topics
+                topic_lines = [f"- Pages {t['start_page']}-{t['end_page']}: {t['topic']}" for t in context_topics]
+                topic_list = "\n".join(topic_lines)
+
+                # Get last 2-3 pages from this chunk for summary
+                last_pages = chunk[-3:] if len(chunk) > 2 else chunk
+                summary_prompt = f"""Briefly summarize what these pages discuss (1-2 sentences max). Keep the summary in the ORIGINAL LANGUAGE.
 
 Pages:
 {json.dumps([pages_summary[i] for i in range(len(pages_summary)) if i >= len(pages_summary) - len(last_pages)], indent=2, ensure_ascii=False)}
 
 Summary:"""
 
-                    try:
-                        summary_response = self.client.messages.create(
-                            model=self.model,
-                            max_tokens=150,
-                            temperature=0.1,
-                            messages=[{"role": "user", "content": summary_prompt}]
-                        )
-                        summary = summary_response.content[0].text.strip()
-                        previous_context = f"""Topics identified in previous chunk:
+                try:
+                    summary = cached_completion(
+                        self.client, self.model, summary_prompt,
+                        max_tokens=150,
+                        temperature=0.1
+                    ).strip()
+                    previous_context = f"""Topics identified in previous chunk:
 {topic_list}
 
 Content summary (ending at page {chunk[-1]['page']}):
 {summary}"""
-                    except:
-                        # Fallback to just topic list if summary fails
-                        previous_context = f"""Topics identified in previous chunk:
+                except:
+                    # Fallback to just topic list if summary fails
+                    previous_context = f"""Topics identified in previous chunk:
 {topic_list}"""
 
-            except Exception as e:
-                self.logger.error(f"LLM topic identification error for chunk {chunk_start}-{chunk_end}: {e}")
-                # Fall back to basic grouping for this chunk
-                fallback_topics = self.group_by_topics(chunk, max_pages_per_topic=3)
-                all_topics.extend(fallback_topics)
+        except Exception as e:
+            self.logger.error(f"LLM topic identification error for chunk {chunk_start}-{chunk_end}: {e}")
+            # Fall back to basic grouping for this chunk
+            self.fallback_chunks.append(f"pages {chunk_start}-{chunk_end}")
+            fallback_topics = self.group_by_topics(chunk, max_pages_per_topic=3)
+            topics.extend(fallback_topics)
 
-                # Update context from fallback topics too
-                if fallback_topics:
-                    last_topic = fallback_topics[-1]
-                    previous_context = f"- Pages {last_topic['start_page']}-{last_topic['end_page']}: {last_topic['topic']}"
+            # Update context from fallback topics too
+            if fallback_topics:
+                last_topic = fallback_topics[-1]
+                previous_context = f"- Pages {last_topic['start_page']}-{last_topic['end_page']}: {last_topic['topic']}"
 
-        return all_topics
+        return topics, previous_context
+
+    def _parse_topics_response(self, response_text: str) -> Dict:
+        if "```json" in response_text:
+            response_text = response_text.split("```json")[1].split("```")[0]
+        return json.loads(response_text.strip())  # type: ignore
 
     def process(self, pages_data: List[Dict]) -> List[Dict]:
         repeated = self.detect_repeated_elements(pages_data)
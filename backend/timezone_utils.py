@@ -3,55 +3,118 @@ Timezone-aware datetime utilities.
 
 All timestamps in the application should use the configured timezone
 from the app_settings table, not the server's timezone.
+
+The setting is read from the database registered with set_timezone_database
+(the app's Database), or else from Config.DATABASE_PATH, and cached with
+its resolved pytz timezone (including the default when nothing is
+configured), so timestamps on hot paths such as model column defaults don't
+touch the database. The cache is refreshed when the setting is saved, and
+every TIMEZONE_CACHE_SECONDS to pick up changes made by other processes.
 """
+import threading
+import time
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Tuple
 import pytz
 import logging
 
 logger = logging.getLogger(__name__)
 
-_cached_timezone: Optional[str] = None
+DEFAULT_TIMEZONE = 'America/Puerto_Rico'  # AST
+TIMEZONE_CACHE_SECONDS = 300
 
+# (timezone name, pytz timezone, monotonic expiry time)
+_cached_timezone: Optional[Tuple[str, pytz.BaseTzInfo, float]] = None
+_cache_lock = threading.Lock()
 
-def get_configured_timezone() -> str:
+# Database the setting is read from (a database.Database; see set_timezone_database)
+_settings_database = None
+
+
+def set_timezone_database(database) -> None:
     """
-    Get the configured timezone from database settings.
+    Read the timezone setting from this database from now on.
 
-    Returns:
-        Timezone string (e.g., 'America/Puerto_Rico')
-        Defaults to 'America/Puerto_Rico' (AST) if not configured
+    Args:
+        database: database.Database holding the app_settings table
+            (None = the database at Config.DATABASE_PATH)
     """
-    global _cached_timezone
+    global _settings_database
+    _settings_database = database
+    clear_timezone_cache()
 
-    # Return cached value if available
-    if _cached_timezone:
-        return _cached_timezone
 
+def _load_timezone() -> str:
+    """Read the timezone setting from the registered database (default if unset or unreadable)."""
     try:
+        # Imported here: database_models imports this module for its column defaults
         from database_models import AppSettings
-        from database import Database
 
-        db = Database()
-        with db.session() as session:
+        database = _settings_database
+        if database is None:
+            # Not running in the app (CLI scripts, question generation): the configured database
+            from config import Config
+            from database import get_database
+            database = get_database(Config.DATABASE_PATH)
+
+        with database.session() as session:
             setting = session.query(AppSettings).filter_by(setting_key='timezone').first()
             if setting:
-                _cached_timezone = setting.setting_value
-                return _cached_timezone
-
+                return setting.setting_value
     except Exception as e:
         logger.warning(f"Failed to load timezone from database: {e}")
 
-    # Default to AST
-    default_tz = 'America/Puerto_Rico'
-    logger.info(f"Using default timezone: {default_tz}")
-    return default_tz
+    logger.info(f"Using default timezone: {DEFAULT_TIMEZONE}")
+    return DEFAULT_TIMEZONE
+
+
+def _configured_tz() -> Tuple[str, pytz.BaseTzInfo]:
+    """Cached (timezone name, pytz timezone), reloaded when expired or cleared."""
+    global _cached_timezone
+
+    cached = _cached_timezone
+    if cached is not None and time.monotonic() < cached[2]:
+        return cached[0], cached[1]
+
+    with _cache_lock:
+        cached = _cached_timezone
+        if cached is None or time.monotonic() >= cached[2]:
+            tz_name = _load_timezone()
+            try:
+                tz = pytz.timezone(tz_name)
+            except pytz.UnknownTimeZoneError:
+                logger.warning(f"Unknown timezone '{tz_name}' in settings, using {DEFAULT_TIMEZONE}")
+                tz_name, tz = DEFAULT_TIMEZONE, pytz.timezone(DEFAULT_TIMEZONE)
+            cached = _cached_timezone = (tz_name, tz, time.monotonic() + TIMEZONE_CACHE_SECONDS)
+    return cached[0], cached[1]
+
+
+def get_configured_timezone() -> str:
+    """
+    Get the configured timezone from database settings.
+
+    Returns:
+        Timezone string (e.g., 'America/Puerto_Rico')
+        Defaults to 'America/Puerto_Rico' (AST) if not configured
+    """
+    return _configured_tz()[0]
+
+
+def get_configured_tz() -> pytz.BaseTzInfo:
+    """
+    Get the configured timezone as a pytz timezone object.
+
+    Returns:
+        pytz timezone (America/Puerto_Rico if not configured)
+    """
+    return _configured_tz()[1]
 
 
 def clear_timezone_cache():
     """Clear the cached timezone value. Call this when timezone setting changes."""
     global _cached_timezone
-    _cached_timezone = None
+    with _cache_lock:
+        _cached_timezone = None
     logger.info("Timezone cache cleared")
 
 
@@ -62,9 +125,7 @@ def now_in_timezone() -> datetime:
     Returns:
         Timezone-aware datetime object in configured timezone
     """
-    tz_name = get_configured_timezone()
-    tz = pytz.timezone(tz_name)
-    return datetime.now(tz)
+    return datetime.now(get_configured_tz())
 
 
 def get_timezone_aware_datetime(dt: datetime) -> datetime:
@@ -77,8 +138,7 @@ def get_timezone_aware_datetime(dt: datetime) -> datetime:
     Returns:
         Timezone-aware datetime in configured timezone
     """
-    tz_name = get_configured_timezone()
-    tz = pytz.timezone(tz_name)
+    tz = get_configured_tz()
 
     if dt.tzinfo is None:
         # Naive datetime - localize it
@@ -103,7 +163,7 @@ def format_datetime(dt: datetime, format_type: str = 'full') -> str:
     if isinstance(dt, str):
         dt = datetime.fromisoformat(dt)
 
-    tz_dt = get_timezone_aware_datetime(dt) if dt.tzinfo is None else dt.astimezone(pytz.timezone(get_configured_timezone()))
+    tz_dt = get_timezone_aware_datetime(dt) if dt.tzinfo is None else dt.astimezone(get_configured_tz())
 
     if format_type == 'full':
         # "October 17, 2025 11:30 AM AST"